@@ -6,17 +6,54 @@
 """Defines interfaces for interacting with Azure Quantum"""
 
 
+import importlib
 import logging
+from typing import Any, List, TYPE_CHECKING
 from .version import __version__
 
-from .job.job import *
-from .job.session import *
-from .workspace import *
-
-from ._client.models._enums import JobStatus, SessionStatus, SessionJobFailurePolicy, ItemType, Priority
+if TYPE_CHECKING:
+    from .job.job import Job, JobDetails
+    from .job.session import Session, SessionHost, SessionDetails
+    from .workspace import Workspace
+    from ._client.models._enums import JobStatus, SessionStatus, SessionJobFailurePolicy, ItemType, Priority
 
 logger = logging.getLogger(__name__)
 logger.info(f"version: {__version__}")
 
 
-__all__ = [ "Workspace" ]
\ No newline at end of file
+__all__ = [ "Workspace" ]
+
+# Public names and the module they are imported from on first use, so that
+# importing the package does not load the Azure SDK clients it depends on
+_LAZY_ATTRIBUTES = {
+    "Job": ".job.job",
+    "JobDetails": ".job.job",
+    "Session": ".job.session",
+    "SessionHost": ".job.session",
+    "SessionDetails": ".job.session",
+    "Workspace": ".workspace",
+    "JobStatus": "._client.models._enums",
+    "SessionStatus": "._client.models._enums",
+    "SessionJobFailurePolicy": "._client.models._enums",
+    "ItemType": "._client.models._enums",
+    "Priority": "._client.models._enums",
+}
+
+# Subpackages that used to be imported with the package
+_LAZY_SUBMODULES = {"job", "storage", "workspace"}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+    elif name in _LAZY_SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _LAZY_SUBMODULES)
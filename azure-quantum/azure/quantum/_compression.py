@@ -0,0 +1,126 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""
+Internal helpers to compress job input payloads before they are uploaded.
+"""
+
+import logging
+import time
+import zlib
+from typing import Callable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+GZIP = "gzip"
+
+# Size of the slices a payload is fed to the compressor in
+_CHUNK_SIZE = 1024 * 1024
+
+# zlib window bits that produce a gzip header and trailer
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class CompressionStats:
+    """
+    Size and time of the compression of a payload.
+
+    :param encoding: "Content-Encoding" of the compressed payload.
+    :param original_size: Size of the payload before compression, in bytes.
+    :param compressed_size: Size of the compressed payload, in bytes.
+    :param duration_secs: Time spent compressing, in seconds.
+    """
+
+    def __init__(
+        self,
+        encoding: str,
+        original_size: int,
+        compressed_size: int,
+        duration_secs: float,
+    ):
+        self.encoding = encoding
+        self.original_size = original_size
+        self.compressed_size = compressed_size
+        self.duration_secs = duration_secs
+
+    @property
+    def ratio(self) -> float:
+        """Original size divided by compressed size."""
+        if self.compressed_size == 0:
+            return 1.0
+        return self.original_size / self.compressed_size
+
+    def __repr__(self) -> str:
+        return (
+            f"CompressionStats(encoding={self.encoding!r}, "
+            f"original_size={self.original_size}, "
+            f"compressed_size={self.compressed_size}, "
+            f"ratio={self.ratio:.2f}, duration_secs={self.duration_secs:.3f})"
+        )
+
+
+def _iter_chunks(data: bytes) -> Iterable[memoryview]:
+    view = memoryview(data)
+    for i in range(0, len(view), _CHUNK_SIZE):
+        yield view[i : i + _CHUNK_SIZE]
+
+
+def _gzip_compressor(level: Optional[int]) -> Tuple[Callable, Callable]:
+    compressor = zlib.compressobj(
+        level if level is not None else 6,
+        zlib.DEFLATED,
+        _GZIP_WBITS,
+    )
+    return compressor.compress, compressor.flush
+
+
+_COMPRESSORS = {
+    GZIP: _gzip_compressor,
+}
+
+
+def compress_payload(
+    data: bytes,
+    encoding: str,
+    level: Optional[int] = None,
+) -> Tuple[memoryview, CompressionStats]:
+    """
+    Compresses a payload, feeding it to the compressor one slice at a time.
+    The compressed payload is built in memory before it is uploaded, so
+    compressing takes as much memory as the payload, unless it is
+    memory-mapped, and its compressed copy.
+
+    :param data: Payload to compress.
+    :param encoding: "gzip".
+    :param level: Compression level, defaults to the default level of the encoding.
+    :return: A read-only view of the compressed payload, to upload with
+        a "Content-Encoding" of `encoding`, and the compression statistics.
+    :rtype: Tuple[memoryview, CompressionStats]
+    """
+    create_compressor = _COMPRESSORS.get(encoding)
+    if create_compressor is None:
+        raise ValueError(
+            f"Unsupported compression '{encoding}', "
+            f"expected one of {', '.join(_COMPRESSORS)}."
+        )
+
+    start_time = time.perf_counter()
+    compress, flush = create_compressor(level)
+    compressed = bytearray()
+    for chunk in _iter_chunks(data):
+        compressed += compress(chunk)
+    compressed += flush()
+    stats = CompressionStats(
+        encoding=encoding,
+        original_size=len(data),
+        compressed_size=len(compressed),
+        duration_secs=time.perf_counter() - start_time,
+    )
+    logger.info(
+        f"Compressed payload with {encoding} from {stats.original_size} "
+        f"to {stats.compressed_size} bytes (ratio {stats.ratio:.2f}) "
+        f"in {stats.duration_secs:.3f} seconds"
+    )
+    # A view, rather than a bytes copy of the compressed payload
+    return memoryview(compressed).toreadonly(), stats
@@ -3,9 +3,17 @@
 # Licensed under the MIT License.
 ##
 
+import os
 from enum import Enum
-from azure.identity._constants import EnvironmentVariables as SdkEnvironmentVariables
-from azure.identity import _internal as AzureIdentityInternals
+
+
+def _get_default_authority() -> str:
+    """
+    Returns the authority azure-identity defaults to, like its
+    `get_default_authority`, without importing azure-identity.
+    """
+    authority = os.environ.get("AZURE_AUTHORITY_HOST", "login.microsoftonline.com").rstrip(" /")
+    return authority if "://" in authority else f"https://{authority}"
 
 
 class EnvironmentVariables:
@@ -18,11 +26,12 @@ class EnvironmentVariables:
     SUBSCRIPTION_ID = "SUBSCRIPTION_ID"
     WORKSPACE_NAME = "AZURE_QUANTUM_WORKSPACE_NAME"
     QUANTUM_ENV = "AZURE_QUANTUM_ENV"
-    AZURE_CLIENT_ID = SdkEnvironmentVariables.AZURE_CLIENT_ID
-    AZURE_CLIENT_SECRET = SdkEnvironmentVariables.AZURE_CLIENT_SECRET
-    AZURE_CLIENT_CERTIFICATE_PATH = SdkEnvironmentVariables.AZURE_CLIENT_CERTIFICATE_PATH
-    AZURE_CLIENT_SEND_CERTIFICATE_CHAIN = SdkEnvironmentVariables.AZURE_CLIENT_SEND_CERTIFICATE_CHAIN
-    AZURE_TENANT_ID = SdkEnvironmentVariables.AZURE_TENANT_ID
+    # Read by azure-identity, named here so that it is not imported
+    AZURE_CLIENT_ID = "AZURE_CLIENT_ID"
+    AZURE_CLIENT_SECRET = "AZURE_CLIENT_SECRET"
+    AZURE_CLIENT_CERTIFICATE_PATH = "AZURE_CLIENT_CERTIFICATE_PATH"
+    AZURE_CLIENT_SEND_CERTIFICATE_CHAIN = "AZURE_CLIENT_SEND_CERTIFICATE_CHAIN"
+    AZURE_TENANT_ID = "AZURE_TENANT_ID"
     QUANTUM_TOKEN_FILE = "AZURE_QUANTUM_TOKEN_FILE"
     CONNECTION_STRING = "AZURE_QUANTUM_CONNECTION_STRING"
     ALL = [
@@ -65,7 +74,7 @@ class ConnectionConstants:
 
     MSA_TENANT_ID = "9188040d-6c67-4c5b-b112-36a304b66dad"
 
-    AUTHORITY = AzureIdentityInternals.get_default_authority()
+    AUTHORITY = _get_default_authority()
     DOGFOOD_AUTHORITY = "login.windows-ppe.net"
 
     # pylint: disable=unnecessary-lambda-assignment
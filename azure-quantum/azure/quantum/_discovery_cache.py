@@ -0,0 +1,191 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""
+Internal on-disk cache of the workspace details discovered
+from Azure Resource Graph and Azure Resource Manager.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from azure.core.pipeline import PipelineResponse
+from azure.quantum._workspace_connection_params import WorkspaceConnectionParams
+
+logger = logging.getLogger(__name__)
+
+# How long discovered workspace details are reused for
+DEFAULT_TTL_SECS = 24 * 60 * 60.0
+
+# Details resolved by the discovery, stored for each workspace
+_DISCOVERED_FIELDS = (
+    "subscription_id",
+    "resource_group",
+    "location",
+    "quantum_endpoint",
+    "workspace_kind",
+)
+
+
+class WorkspaceDiscoveryCache:
+    """
+    Persists the details of workspaces discovered from Azure Resource Graph
+    and Azure Resource Manager to a JSON file, so that processes connecting
+    to the same workspace do not look it up again.
+
+    Entries are keyed by the environment, tenant, workspace name and the
+    connection parameters given to look it up, and are discarded once they
+    are older than `ttl_secs` or incomplete.
+
+    The file can be shared by concurrent processes: it is replaced
+    atomically, and an unreadable file is treated as empty.
+
+    :param path: Path of the JSON file the entries are stored in.
+    :param ttl_secs: How long the entries are reused for, in seconds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_secs: float = DEFAULT_TTL_SECS,
+    ):
+        self._path = path
+        self.ttl_secs = ttl_secs
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        """Path of the JSON file the entries are stored in."""
+        return self._path
+
+    @staticmethod
+    def get_key(connection_params: WorkspaceConnectionParams) -> str:
+        """
+        Returns the key of the entry of a workspace, built from the
+        parameters known before the workspace is looked up.
+        """
+        parts = (
+            connection_params.arm_endpoint,
+            connection_params.tenant_id,
+            connection_params.subscription_id,
+            connection_params.resource_group,
+            connection_params.location,
+            connection_params.workspace_name,
+        )
+        return "|".join((part or "").lower() for part in parts)
+
+    def load(self, key: str, connection_params: WorkspaceConnectionParams) -> bool:
+        """
+        Sets the cached details of a workspace on the connection parameters.
+
+        :param key: Key of the entry, from `get_key`.
+        :param connection_params: The workspace connection parameters to update.
+        :return: True if a valid entry was found and applied.
+        :rtype: bool
+        """
+        with self._lock:
+            entry = self._read().get(key)
+        if not self._is_valid(entry):
+            return False
+        connection_params.subscription_id = entry["subscription_id"]
+        connection_params.resource_group = entry["resource_group"]
+        connection_params.location = entry["location"]
+        connection_params.quantum_endpoint = entry["quantum_endpoint"]
+        connection_params.workspace_kind = entry.get("workspace_kind")
+        logger.debug("Loaded the details of workspace %s from the discovery cache",
+                     connection_params.workspace_name)
+        return True
+
+    def store(self, key: str, connection_params: WorkspaceConnectionParams) -> None:
+        """
+        Stores the discovered details of a workspace.
+
+        :param key: Key of the entry, from `get_key`.
+        :param connection_params: The completed workspace connection parameters.
+        """
+        entry: Dict[str, Any] = {
+            field: getattr(connection_params, field) for field in _DISCOVERED_FIELDS
+        }
+        entry["workspace_kind"] = connection_params.workspace_kind.name
+        entry["time"] = time.time()
+        with self._lock:
+            entries = self._read()
+            entries[key] = entry
+            self._write(entries)
+
+    def invalidate(self, key: str) -> None:
+        """
+        Drops the entry of a workspace, e.g. after its cached details
+        turned out to be stale, so that it is looked up again.
+        """
+        with self._lock:
+            entries = self._read()
+            if entries.pop(key, None) is not None:
+                logger.debug("Invalidated discovery cache entry %s", key)
+                self._write(entries)
+
+    def create_response_hook(self, key: str) -> Callable[[PipelineResponse], None]:
+        """
+        Returns a `raw_response_hook` for the clients of a workspace whose
+        details were loaded from the cache, which drops its entry the first
+        time the service responds with 404 Not Found, e.g. because the
+        workspace was moved or deleted, so that the next process looks the
+        workspace up again instead of reusing stale details.
+        """
+        invalidated = threading.Event()
+
+        def on_response(response: PipelineResponse) -> None:
+            if invalidated.is_set() or response.http_response.status_code != 404:
+                return
+            invalidated.set()
+            self.invalidate(key)
+
+        return on_response
+
+    def clear(self) -> None:
+        """Drops all the entries."""
+        with self._lock:
+            if os.path.isfile(self._path):
+                os.remove(self._path)
+
+    def _is_valid(self, entry: Optional[Dict[str, Any]]) -> bool:
+        if not isinstance(entry, dict):
+            return False
+        if time.time() - entry.get("time", 0) >= self.ttl_secs:
+            return False
+        return all(
+            entry.get(field) for field in _DISCOVERED_FIELDS
+            if field != "workspace_kind"
+        )
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable discovery cache {self._path}: {e}")
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _write(self, entries: Dict[str, Any]) -> None:
+        directory = os.path.dirname(os.path.abspath(self._path))
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so that a concurrent reader
+        # or an interrupted write never leaves a truncated file behind
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            logger.warning(f"Failed to persist the discovery cache: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
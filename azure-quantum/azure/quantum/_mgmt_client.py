@@ -13,6 +13,7 @@ from typing import Any, Dict, Optional, cast
 from azure.core import PipelineClient
 from azure.core.credentials import TokenProvider
 from azure.core.pipeline import policies
+from azure.core.pipeline.transport import HttpTransport
 from azure.core.rest import HttpRequest
 from azure.core.exceptions import HttpResponseError
 from azure.quantum._workspace_connection_params import WorkspaceConnectionParams
@@ -38,6 +39,10 @@ class WorkspaceMgmtClient():
     
     :param user_agent:
         Add the specified value as a prefix to the HTTP User-Agent header.
+
+    :param transport:
+        Optional HTTP transport to send requests through,
+        to share connections with other clients.
     """
 
     # Constants
@@ -46,7 +51,13 @@ class WorkspaceMgmtClient():
     CONNECT_DOC_LINK = "https://learn.microsoft.com/en-us/azure/quantum/how-to-connect-workspace"
     CONNECT_DOC_MESSAGE = f"To find details on how to connect to your workspace, please see {CONNECT_DOC_LINK}."
     
-    def __init__(self, credential: TokenProvider, base_url: str, user_agent: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        credential: TokenProvider,
+        base_url: str,
+        user_agent: Optional[str] = None,
+        transport: Optional[HttpTransport] = None,
+    ) -> None:
         """
         Initialize the WorkspaceMgmtClient.
         
@@ -68,7 +79,11 @@ class WorkspaceMgmtClient():
             policies.RetryPolicy(retry_total=self.DEFAULT_RETRY_TOTAL),
             policies.BearerTokenCredentialPolicy(self._credential, ConnectionConstants.ARM_CREDENTIAL_SCOPE),
         ]
-        self._client: PipelineClient = PipelineClient(base_url=cast(str, base_url), policies=self._policies)
+        self._client: PipelineClient = PipelineClient(
+            base_url=cast(str, base_url),
+            policies=self._policies,
+            transport=transport,
+        )
     
     def close(self) -> None:
         self._client.close()
@@ -0,0 +1,61 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""
+Internal helpers to run independent service or storage calls concurrently.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Default number of worker threads for bulk operations.
+# The work is I/O bound, so this is independent of the number of CPUs.
+DEFAULT_MAX_WORKERS = 8
+
+
+def map_concurrently(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: Optional[int] = None,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    Calls `func` on each item using a bounded thread pool
+    and returns the results in the order of `items`.
+
+    :param func: Function to call for each item.
+    :param items: Items to process.
+    :param max_workers: Maximum number of concurrent calls.
+        Defaults to `DEFAULT_MAX_WORKERS`.
+    :param return_exceptions: If `True`, an exception raised for an item
+        is returned in place of its result. Otherwise, the first exception
+        (in the order of `items`) is raised once the calls already
+        started have finished, and the calls not yet started are cancelled.
+    :return: Results (or exceptions) in the order of `items`.
+    :rtype: list
+    """
+    items = list(items)
+    if not items:
+        return []
+    if max_workers is None:
+        max_workers = DEFAULT_MAX_WORKERS
+    if max_workers < 1:
+        raise ValueError("max_workers must be greater than 0.")
+
+    results = []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = [executor.submit(func, item) for item in items]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:  # pylint: disable=broad-except
+                if not return_exceptions:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                results.append(e)
+    return results
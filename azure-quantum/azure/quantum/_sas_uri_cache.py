@@ -0,0 +1,130 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""
+Internal cache of storage SAS URIs returned by the Azure Quantum service.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import threading
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# A SAS URI is considered expired this long before its actual expiry,
+# so it is never handed out a moment before it stops working.
+SAS_EXPIRY_MARGIN = timedelta(minutes=5)
+
+
+def get_sas_expiry(sas_uri: str) -> Optional[datetime]:
+    """
+    Returns the expiry time (`se` query parameter) of a SAS URI.
+
+    :param sas_uri: URI with a SAS token.
+    :return: The UTC expiry time, or `None` if the URI has no expiry.
+    :rtype: Optional[datetime]
+    """
+    query_params = parse_qs(urlparse(sas_uri).query)
+    token_expire_query_param = query_params.get("se")
+    if token_expire_query_param is None:
+        return None
+
+    # Since python < 3.11 can not easily parse Z suffixed UTC timestamp and
+    # assuming that the timestamp is always UTC, we replace that suffix with UTC offset.
+    return datetime.fromisoformat(
+        token_expire_query_param[0].replace('Z', '+00:00')
+    )
+
+
+def is_sas_uri_valid(
+    sas_uri: str,
+    margin: timedelta = SAS_EXPIRY_MARGIN
+) -> bool:
+    """
+    Checks if a SAS URI has an expiry that is not within `margin` from now.
+
+    :param sas_uri: URI with a SAS token.
+    :param margin: How long before the expiry the URI stops being valid.
+    :return: True if the SAS URI can still be used.
+    :rtype: bool
+    """
+    expiry = get_sas_expiry(sas_uri)
+    if expiry is None:
+        return False
+    return datetime.now(tz=timezone.utc) < expiry - margin
+
+
+class SasUriCache:
+    """
+    Thread-safe cache of SAS URIs keyed by container and blob name.
+    Entries are dropped once they get within `margin` of their expiry,
+    so that a new SAS URI is requested ahead of time.
+
+    :param max_size: Maximum number of cached URIs.
+        The least recently used URIs are evicted first.
+    :param margin: How long before the expiry a URI is refreshed.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        margin: timedelta = SAS_EXPIRY_MARGIN
+    ):
+        self._max_size = max_size
+        self._margin = margin
+        self._uris: "OrderedDict[Tuple[str, Optional[str]], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        container_name: str,
+        blob_name: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Returns the cached SAS URI for a container or blob,
+        or `None` if there is none that is still valid.
+        """
+        key = (container_name, blob_name)
+        with self._lock:
+            sas_uri = self._uris.get(key)
+            if sas_uri is None:
+                return None
+            if not is_sas_uri_valid(sas_uri, self._margin):
+                del self._uris[key]
+                return None
+            self._uris.move_to_end(key)
+            return sas_uri
+
+    def set(
+        self,
+        container_name: str,
+        blob_name: Optional[str],
+        sas_uri: str
+    ) -> None:
+        """
+        Caches the SAS URI for a container or blob.
+        URIs without an expiry, or about to expire, are not cached.
+        """
+        if not is_sas_uri_valid(sas_uri, self._margin):
+            return
+        key = (container_name, blob_name)
+        with self._lock:
+            self._uris[key] = sas_uri
+            self._uris.move_to_end(key)
+            while len(self._uris) > self._max_size:
+                self._uris.popitem(last=False)
+
+    def invalidate(
+        self,
+        container_name: str,
+        blob_name: Optional[str] = None
+    ) -> None:
+        """Removes the cached SAS URI for a container or blob."""
+        with self._lock:
+            self._uris.pop((container_name, blob_name), None)
+
+    def clear(self) -> None:
+        """Removes all cached SAS URIs."""
+        with self._lock:
+            self._uris.clear()
@@ -0,0 +1,150 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""
+Internal signer of SAS URIs for a storage account whose key is known,
+used by workspaces created with a storage connection string.
+"""
+
+from datetime import datetime, timedelta, timezone
+import logging
+import threading
+from typing import Optional, Set
+from urllib.parse import quote
+
+from azure.core.exceptions import ResourceExistsError
+from azure.core.pipeline.transport import HttpTransport
+from azure.storage.blob import (
+    BlobSasPermissions,
+    BlobServiceClient,
+    generate_blob_sas,
+    generate_container_sas,
+)
+
+from azure.quantum._sas_uri_cache import SasUriCache
+from azure.quantum.storage import _client_kwargs, create_container_using_client
+
+logger = logging.getLogger(__name__)
+
+# Lifetime of the SAS tokens signed locally, the same as the tokens
+# signed by `azure.quantum.storage.get_container_uri`
+DEFAULT_SAS_LIFETIME = timedelta(days=14)
+
+
+class StorageSasSigner:
+    """
+    Signs container and blob SAS URIs locally with the key of a storage
+    account, without calling the Azure Quantum service, and creates each
+    container at most once, remembering the containers known to exist.
+
+    Signed URIs are reused until they get close to their expiry.
+
+    :param connection_string: Connection string of the storage account,
+        including its account key.
+    :param sas_lifetime: Lifetime of the signed SAS tokens.
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        sas_lifetime: Optional[timedelta] = None,
+    ):
+        self._connection_string = connection_string
+        self._sas_lifetime = sas_lifetime or DEFAULT_SAS_LIFETIME
+        # Parsing the connection string does not send any request
+        service_client = BlobServiceClient.from_connection_string(connection_string)
+        self._account_name = service_client.account_name
+        self._account_key = service_client.credential.account_key
+        self._account_url = service_client.url.rstrip("/")
+        self._known_containers: Set[str] = set()
+        self._lock = threading.Lock()
+        self._sas_uri_cache = SasUriCache()
+
+    @property
+    def account_name(self) -> str:
+        """Name of the storage account."""
+        return self._account_name
+
+    @property
+    def sas_lifetime(self) -> timedelta:
+        """Lifetime of the signed SAS tokens."""
+        return self._sas_lifetime
+
+    def is_known_container(self, container_name: str) -> bool:
+        """Returns True if the container is known to exist."""
+        with self._lock:
+            return container_name in self._known_containers
+
+    def add_known_container(self, container_name: str) -> None:
+        """Remembers that the container exists."""
+        with self._lock:
+            self._known_containers.add(container_name)
+
+    def forget_container(self, container_name: str) -> None:
+        """Forgets that the container exists, e.g. after it was deleted,
+        so that it is created again the next time it is used."""
+        with self._lock:
+            self._known_containers.discard(container_name)
+
+    def ensure_container(
+        self,
+        container_name: str,
+        transport: Optional[HttpTransport] = None,
+    ) -> None:
+        """
+        Creates the container if it is not known to exist yet.
+        Requests are sent through `transport` if given.
+        """
+        if self.is_known_container(container_name):
+            return
+        service_client = BlobServiceClient.from_connection_string(
+            self._connection_string, **_client_kwargs(transport)
+        )
+        try:
+            create_container_using_client(
+                service_client.get_container_client(container_name)
+            )
+        except ResourceExistsError:
+            # Created concurrently
+            pass
+        self.add_known_container(container_name)
+
+    def get_sas_uri(
+        self,
+        container_name: str,
+        blob_name: Optional[str] = None,
+    ) -> str:
+        """
+        Returns a container URI with a SAS read/write token,
+        or a blob URI with a SAS read token if `blob_name` is given.
+        """
+        sas_uri = self._sas_uri_cache.get(container_name, blob_name)
+        if sas_uri is not None:
+            return sas_uri
+
+        expiry = datetime.now(tz=timezone.utc) + self._sas_lifetime
+        if blob_name is None:
+            sas_token = generate_container_sas(
+                self._account_name,
+                container_name,
+                account_key=self._account_key,
+                permission=BlobSasPermissions(
+                    read=True, add=True, write=True, create=True
+                ),
+                expiry=expiry,
+            )
+            sas_uri = f"{self._account_url}/{container_name}?{sas_token}"
+        else:
+            sas_token = generate_blob_sas(
+                self._account_name,
+                container_name,
+                blob_name,
+                account_key=self._account_key,
+                permission=BlobSasPermissions(read=True),
+                expiry=expiry,
+            )
+            sas_uri = f"{self._account_url}/{container_name}/{quote(blob_name, safe='/~')}?{sas_token}"
+        logger.debug("Signed SAS URI for %s/%s", container_name, blob_name)
+        self._sas_uri_cache.set(container_name, blob_name, sas_uri)
+        return sas_uri
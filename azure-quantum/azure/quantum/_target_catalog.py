@@ -0,0 +1,148 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""
+Internal cache of the targets available in a workspace.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from azure.quantum._client.models import ProviderStatus, TargetStatus
+
+logger = logging.getLogger(__name__)
+
+# How long the targets listed by the service are reused for
+DEFAULT_TTL_SECS = 60.0
+
+
+class _Snapshot:
+    """Targets listed at a point in time, indexed by provider and target ID."""
+
+    def __init__(self, providers: Iterable[ProviderStatus]):
+        self.time = time.monotonic()
+        self.entries: List[Tuple[str, TargetStatus]] = []
+        self.by_key: Dict[Tuple[str, str], Tuple[str, TargetStatus]] = {}
+        self.by_target: Dict[str, List[Tuple[str, TargetStatus]]] = {}
+        self.by_provider: Dict[str, List[Tuple[str, TargetStatus]]] = {}
+        for provider in providers:
+            for target in provider.targets or []:
+                entry = (provider.id, target)
+                self.entries.append(entry)
+                self.by_key[(provider.id.lower(), target.id.lower())] = entry
+                self.by_target.setdefault(target.id.lower(), []).append(entry)
+                self.by_provider.setdefault(provider.id.lower(), []).append(entry)
+
+
+class TargetCatalog:
+    """
+    Thread-safe cache of the provider and target statuses of a workspace,
+    so that looking up targets, e.g. to select a backend, does not list
+    the providers of the workspace on every call.
+
+    The statuses are listed again once they are older than `ttl_secs`.
+    With `background_refresh`, stale statuses are returned while they are
+    listed again in a background thread, so that callers never wait for the
+    service once the catalog was loaded.
+
+    :param list_providers: Lists the provider statuses of the workspace.
+    :param ttl_secs: How long the statuses are reused for, in seconds.
+    :param background_refresh: Refresh stale statuses in the background.
+    """
+
+    def __init__(
+        self,
+        list_providers: Callable[[], Iterable[ProviderStatus]],
+        ttl_secs: float = DEFAULT_TTL_SECS,
+        background_refresh: bool = False,
+    ):
+        self._list_providers = list_providers
+        self.ttl_secs = ttl_secs
+        self.background_refresh = background_refresh
+        self._snapshot: Optional[_Snapshot] = None
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def get(
+        self,
+        name: Optional[str] = None,
+        provider_id: Optional[str] = None,
+    ) -> List[Tuple[str, TargetStatus]]:
+        """
+        Returns the Provider ID and Target Status of the targets,
+        optionally filtered by a combination of Provider ID and Target Name.
+
+        :param name: Optional name of the Target to filter for.
+        :param provider_id: Optional Provider ID to filter for.
+        :return: List of tuples containing Provider ID and TargetStatus.
+        :rtype: List[Tuple[str, TargetStatus]]
+        """
+        snapshot = self._get_snapshot()
+        if name is not None and provider_id is not None:
+            entry = snapshot.by_key.get((provider_id.lower(), name.lower()))
+            return [entry] if entry is not None else []
+        if name is not None:
+            return list(snapshot.by_target.get(name.lower(), []))
+        if provider_id is not None:
+            return list(snapshot.by_provider.get(provider_id.lower(), []))
+        return list(snapshot.entries)
+
+    def get_target_status(
+        self,
+        provider_id: str,
+        name: str,
+    ) -> Optional[TargetStatus]:
+        """
+        Returns the status of a target of a provider,
+        or `None` if the workspace has no such target.
+        """
+        entry = self._get_snapshot().by_key.get((provider_id.lower(), name.lower()))
+        return entry[1] if entry is not None else None
+
+    def invalidate(self) -> None:
+        """Drops the cached statuses, so that they are listed again on next use."""
+        self._snapshot = None
+
+    def _get_snapshot(self) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and not self._is_stale(snapshot):
+            return snapshot
+        if snapshot is not None and self.background_refresh:
+            self._start_background_refresh()
+            return snapshot
+        with self._refresh_lock:
+            # Another thread may have refreshed the catalog in the meantime
+            snapshot = self._snapshot
+            if snapshot is None or self._is_stale(snapshot):
+                snapshot = self._refresh()
+            return snapshot
+
+    def _is_stale(self, snapshot: _Snapshot) -> bool:
+        return time.monotonic() - snapshot.time >= self.ttl_secs
+
+    def _refresh(self) -> _Snapshot:
+        snapshot = _Snapshot(self._list_providers())
+        logger.debug("Listed %d targets", len(snapshot.entries))
+        self._snapshot = snapshot
+        return snapshot
+
+    def _start_background_refresh(self) -> None:
+        if not self._refresh_lock.acquire(blocking=False):
+            # Already being refreshed
+            return
+
+        def refresh():
+            try:
+                self._refresh()
+            except Exception as e:
+                logger.warning(f"Failed to refresh the targets of the workspace: {e}")
+            finally:
+                self._refresh_lock.release()
+
+        self._refresh_thread = threading.Thread(
+            target=refresh, name="TargetCatalogRefresh", daemon=True
+        )
+        self._refresh_thread.start()
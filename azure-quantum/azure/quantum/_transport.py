@@ -0,0 +1,87 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""
+Internal pool of HTTP connections shared by the clients of a workspace.
+"""
+
+import threading
+from typing import Optional
+
+from azure.core.pipeline.transport import RequestsTransport
+import requests
+from requests.adapters import HTTPAdapter
+
+# Number of connections kept alive per host. The workspace talks to
+# a handful of hosts (the service, ARM and the storage accounts),
+# with many concurrent requests to each when jobs are submitted
+# or results downloaded in parallel.
+DEFAULT_POOL_SIZE = 32
+
+# Number of hosts a connection pool is kept for
+DEFAULT_POOL_CONNECTIONS = 10
+
+
+class SharedTransport:
+    """
+    Keep-alive connection pool shared by the service, management and
+    storage clients of a workspace, so that each client does not open
+    its own connections and pay a new TLS handshake.
+
+    Each client gets its own `RequestsTransport` from :meth:`create_transport`,
+    all backed by the same `requests.Session`. Closing a client does not close
+    the session, which lives until :meth:`close` is called.
+
+    Requests are sent over HTTP/1.1: `requests`, which the synchronous
+    transport of azure-core is built on, does not support HTTP/2, so
+    concurrent requests to a host use one pooled connection each.
+
+    :param pool_size: Maximum number of connections kept alive per host.
+    :param pool_connections: Number of hosts to keep a connection pool for.
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        pool_connections: Optional[int] = None,
+    ):
+        self._pool_size = pool_size or DEFAULT_POOL_SIZE
+        self._pool_connections = pool_connections or DEFAULT_POOL_CONNECTIONS
+        self._session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool_size(self) -> int:
+        """Maximum number of connections kept alive per host."""
+        return self._pool_size
+
+    def _get_session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self._pool_connections,
+                    pool_maxsize=self._pool_size,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def create_transport(self) -> RequestsTransport:
+        """
+        Returns a transport for an Azure SDK client
+        that sends its requests through the shared session.
+        """
+        return RequestsTransport(session=self._get_session(), session_owner=False)
+
+    def close(self) -> None:
+        """
+        Closes the connections of the shared session. A new session
+        is opened if a transport is created afterwards.
+        """
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
@@ -0,0 +1,46 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""
+Internal User-Agent policy of the clients of a workspace.
+"""
+
+from typing import Any, Callable, Optional
+
+from azure.core.pipeline.policies import UserAgentPolicy
+from azure.quantum._client._configuration import VERSION
+
+
+class WorkspaceUserAgentPolicy(UserAgentPolicy):
+    """
+    User-Agent policy that reads the UserAgent of the workspace on every
+    request, so that appending a value to it, e.g. when submitting a Q#
+    program, applies to the next request without recreating the client,
+    its pipeline and its connections.
+
+    Works in both synchronous and asynchronous pipelines.
+
+    :param get_user_agent: Returns the current UserAgent of the workspace,
+        added in front of the Azure SDK user agent.
+    """
+
+    def __init__(
+        self,
+        get_user_agent: Callable[[], Optional[str]],
+        **kwargs: Any,
+    ):
+        # The UserAgent of the workspace is added per request instead
+        kwargs.pop("user_agent", None)
+        kwargs.setdefault("sdk_moniker", "quantum/{}".format(VERSION))
+        super().__init__(**kwargs)
+        self._get_user_agent = get_user_agent
+
+    @property
+    def user_agent(self) -> str:
+        """The current user agent value."""
+        user_agent = super().user_agent
+        workspace_user_agent = self._get_user_agent()
+        if workspace_user_agent:
+            return f"{workspace_user_agent} {user_agent}"
+        return user_agent
@@ -0,0 +1,626 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""
+Module providing the base class of the synchronous and asynchronous
+Workspace classes, with the logic that does not call the service.
+"""
+
+from __future__ import annotations
+from datetime import datetime, timedelta
+import logging
+import threading
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Union,
+)
+from azure.quantum._client.models import (
+    JobStatus,
+    JobUpdateOptions,
+    Priority,
+    SasUriResponse,
+)
+from azure.quantum._workspace_connection_params import (
+    WorkspaceConnectionParams
+)
+from azure.quantum._constants import (
+    ConnectionConstants,
+)
+from azure.quantum.credential_manager import CredentialManager
+from azure.quantum._discovery_cache import (
+    DEFAULT_TTL_SECS as DEFAULT_DISCOVERY_TTL_SECS,
+    WorkspaceDiscoveryCache,
+)
+from azure.quantum._mgmt_client import WorkspaceMgmtClient
+from azure.quantum._sas_uri_cache import SasUriCache
+from azure.quantum._storage_signer import StorageSasSigner
+from azure.quantum._user_agent_policy import WorkspaceUserAgentPolicy
+from azure.quantum._workspace_filters import create_filter, create_orderby
+from azure.quantum.job.results_cache import ResultsCache
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["WorkspaceBase"]
+
+# pylint: disable=line-too-long
+class WorkspaceBase:
+    """
+    Base class of :class:`azure.quantum.Workspace` and
+    :class:`azure.quantum.aio.Workspace`, which resolves the workspace
+    and holds the state shared by both. The subclasses make the
+    service calls, synchronously or as coroutines.
+
+    Accepts the parameters of :class:`azure.quantum.Workspace`
+    that do not depend on the client type.
+    """
+
+    # Internal parameter names
+    _FROM_CONNECTION_STRING_PARAM = '_from_connection_string'
+    _QUANTUM_ENDPOINT_PARAM = '_quantum_endpoint'
+    _WORKSPACE_KIND_PARAM = '_workspace_kind'
+    _MGMT_CLIENT_PARAM = '_mgmt_client'
+
+    # Type of the connections shared by the clients of the workspace,
+    # set by the subclasses
+    _SHARED_TRANSPORT_CLS = None
+
+    def __init__(
+        self,
+        subscription_id: Optional[str] = None,
+        resource_group: Optional[str] = None,
+        name: Optional[str] = None,
+        storage: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        location: Optional[str] = None,
+        credential: Optional[object] = None,
+        user_agent: Optional[str] = None,
+        connection_pool_size: Optional[int] = None,
+        storage_sas_lifetime: Optional[timedelta] = None,
+        discovery_cache_path: Optional[str] = None,
+        discovery_cache_ttl_secs: Optional[float] = None,
+        **kwargs: Any,
+    ) -> None:
+        # Extract internal params before passing kwargs to WorkspaceConnectionParams
+        # Param to track whether the workspace was created from a connection string
+        from_connection_string = kwargs.pop(WorkspaceBase._FROM_CONNECTION_STRING_PARAM, False)
+        # In case from connection string, quantum_endpoint must be passed
+        quantum_endpoint = kwargs.pop(WorkspaceBase._QUANTUM_ENDPOINT_PARAM, None)
+        workspace_kind = kwargs.pop(WorkspaceBase._WORKSPACE_KIND_PARAM, None)
+        # Params to pass a mock in tests
+        self._mgmt_client = kwargs.pop(WorkspaceBase._MGMT_CLIENT_PARAM, None)
+
+        connection_params = WorkspaceConnectionParams(
+            location=location,
+            subscription_id=subscription_id,
+            resource_group=resource_group,
+            workspace_name=name,
+            credential=credential,
+            resource_id=resource_id,
+            quantum_endpoint=quantum_endpoint,
+            user_agent=user_agent,
+            workspace_kind=workspace_kind,
+            **kwargs
+        ).default_from_env_vars()
+
+        logger.info("Using %s environment.", connection_params.environment)
+
+        connection_params.assert_have_enough_for_discovery()
+
+        self._connection_params = connection_params
+        self._storage = storage
+        # Signs SAS URIs with the key of the storage account, created on first use
+        self._storage_sas_lifetime = storage_sas_lifetime
+        self._storage_signer: Optional[StorageSasSigner] = None
+        self._storage_signer_lock = threading.Lock()
+        # Connections shared by the clients of the workspace, opened on first use
+        self._shared_transport = self._SHARED_TRANSPORT_CLS(pool_size=connection_pool_size)
+
+        # pylint: disable=protected-access
+        using_connection_string = (
+            from_connection_string
+            or connection_params._used_connection_string
+        )
+
+        if isinstance(connection_params.credential, CredentialManager):
+            # Acquire the tokens in the background while the workspace is set up
+            scopes = [ConnectionConstants.DATA_PLANE_CREDENTIAL_SCOPE]
+            if not using_connection_string and not connection_params.is_complete():
+                scopes.append(ConnectionConstants.ARM_CREDENTIAL_SCOPE)
+            connection_params.credential.prefetch(*scopes)
+
+        # Workspace details looked up before, by this or another process
+        self._discovery_cache: Optional[WorkspaceDiscoveryCache] = None
+        self._discovery_cache_key: Optional[str] = None
+        loaded_from_cache = False
+        if discovery_cache_path and not using_connection_string \
+           and not connection_params.is_complete():
+            self._discovery_cache = WorkspaceDiscoveryCache(
+                discovery_cache_path,
+                ttl_secs=DEFAULT_DISCOVERY_TTL_SECS if discovery_cache_ttl_secs is None else discovery_cache_ttl_secs,
+            )
+            key = self._discovery_cache.get_key(connection_params)
+            loaded_from_cache = self._discovery_cache.load(key, connection_params)
+            if loaded_from_cache:
+                self._discovery_cache_key = key
+
+        # Populate workspace details from ARG if not using connection string and
+        # name is provided but missing subscription and/or resource group
+        if not using_connection_string and not loaded_from_cache \
+           and not connection_params.can_build_resource_id():
+            self._get_mgmt_client().load_workspace_from_arg(connection_params)
+
+        # Populate workspace details from ARM if not using connection string and not loaded from ARG
+        if not using_connection_string and not connection_params.is_complete():
+            self._get_mgmt_client().load_workspace_from_arm(connection_params)
+
+        connection_params.assert_complete()
+
+        if self._discovery_cache is not None and not loaded_from_cache:
+            self._discovery_cache.store(key, connection_params)
+
+        # SAS URIs returned by the service, reused until shortly before they expire
+        self._sas_uri_cache = SasUriCache()
+        self._results_cache: Optional[ResultsCache] = None
+
+        # Create WorkspaceClient
+        self._client = self._create_client()
+
+    @property
+    def location(self) -> str:
+        """
+        Returns the Azure location of the Quantum Workspace.
+
+        :return: Azure location name.
+        :rtype: str
+        """
+        return self._connection_params.location
+
+    @property
+    def subscription_id(self) -> str:
+        """
+        Returns the Azure Subscription ID of the Quantum Workspace.
+
+        :return: Azure Subscription ID.
+        :rtype: str
+        """
+        return self._connection_params.subscription_id
+
+    @property
+    def resource_group(self) -> str:
+        """
+        Returns the Azure Resource Group of the Quantum Workspace.
+
+        :return: Azure Resource Group name.
+        :rtype: str
+        """
+        return self._connection_params.resource_group
+
+    @property
+    def name(self) -> str:
+        """
+        Returns the Name of the Quantum Workspace.
+
+        :return: Azure Quantum Workspace name.
+        :rtype: str
+        """
+        return self._connection_params.workspace_name
+
+    @property
+    def credential(self) -> Any:
+        """
+        Returns the Credential used to connect to the Quantum Workspace.
+
+        :return: Azure SDK Credential from [Azure.Identity](https://learn.microsoft.com/python/api/overview/azure/identity-readme?view=azure-python#credential-classes).
+        :rtype: typing.Any
+        """
+        return self._connection_params.credential
+
+    @property
+    def storage(self) -> str:
+        """
+        Returns the Azure Storage account name associated with the Quantum Workspace.
+
+        :return: Azure Storage account name.
+        :rtype: str
+        """
+        return self._storage
+
+    @property
+    def results_cache(self) -> Optional[ResultsCache]:
+        """
+        Returns the cache of job results downloaded through this workspace,
+        if any. Results are not cached by default: set it to a `ResultsCache()`
+        to parse the results of each job only once, or to a
+        `ResultsCache(directory=...)` to also persist them across processes.
+
+        :return: Cache of job results.
+        :rtype: Optional[ResultsCache]
+        """
+        return self._results_cache
+
+    @results_cache.setter
+    def results_cache(self, value: Optional[ResultsCache]) -> None:
+        self._results_cache = value
+
+    @property
+    def user_agent(self) -> str:
+        """
+        Returns the Workspace's UserAgent string that is sent to
+        the service via the UserAgent header.
+
+        :return: User Agent string.
+        :rtype: str
+        """
+        return self._connection_params.get_full_user_agent()
+
+    def append_user_agent(self, value: str) -> None:
+        """
+        Append a new value to the Workspace's UserAgent.
+        The values are appended using a dash.
+
+        :param value:
+            UserAgent value to add, e.g. "azure-quantum-<plugin>"
+        """
+        self._connection_params.append_user_agent(value=value)
+
+    @classmethod
+    def from_connection_string(cls, connection_string: str, **kwargs):
+        """
+        Creates a new Azure Quantum Workspace client from a connection string.
+
+        :param connection_string:
+            A valid connection string, usually obtained from the
+            `Quantum Workspace -> Operations -> Access Keys` blade in the Azure Portal.
+
+        :return: New Azure Quantum Workspace client.
+        :rtype: Workspace
+        """
+        connection_params = WorkspaceConnectionParams(connection_string=connection_string)
+        kwargs[cls._FROM_CONNECTION_STRING_PARAM] = True
+        kwargs[cls._QUANTUM_ENDPOINT_PARAM] = connection_params.quantum_endpoint
+        kwargs[cls._WORKSPACE_KIND_PARAM] = connection_params.workspace_kind.value if connection_params.workspace_kind else None
+        return cls(
+            subscription_id=connection_params.subscription_id,
+            resource_group=connection_params.resource_group,
+            name=connection_params.workspace_name,
+            location=connection_params.location,
+            credential=connection_params.get_credential_or_default(),
+            **kwargs)
+
+    def _create_client(self):
+        """
+        An internal method to (re)create the underlying Azure SDK REST API client,
+        implemented by the subclasses with `_get_client_kwargs`.
+        """
+        raise NotImplementedError()
+
+    def _get_client_kwargs(self) -> Dict[str, Any]:
+        """
+        Returns the keyword arguments of the underlying Azure SDK REST API
+        client, shared by its synchronous and asynchronous versions.
+        """
+        connection_params = self._connection_params
+        kwargs = {}
+        if connection_params.api_version:
+            kwargs["api_version"] = connection_params.api_version
+        if self._discovery_cache_key is not None:
+            # Drop the cached workspace details if they turn out to be stale
+            kwargs["raw_response_hook"] = self._discovery_cache.create_response_hook(
+                self._discovery_cache_key
+            )
+        return dict(
+            credential=connection_params.get_credential_or_default(),
+            # The UserAgent is read on every request, so that appending
+            # to it does not require recreating the client
+            user_agent_policy=WorkspaceUserAgentPolicy(connection_params.get_full_user_agent),
+            credential_scopes = [ConnectionConstants.DATA_PLANE_CREDENTIAL_SCOPE],
+            endpoint=connection_params.quantum_endpoint,
+            authentication_policy=connection_params.get_auth_policy(),
+            **kwargs
+        )
+
+    def _create_mgmt_client(self) -> WorkspaceMgmtClient:
+        """
+        Creates the Azure Resource Manager client, used to look up
+        the details of a partially specified workspace.
+        """
+        connection_params = self._connection_params
+        return WorkspaceMgmtClient(
+            credential=connection_params.get_credential_or_default(),
+            base_url=connection_params.arm_endpoint,
+            user_agent=connection_params.get_full_user_agent(),
+        )
+
+    def _get_mgmt_client(self) -> WorkspaceMgmtClient:
+        """
+        Returns the Azure Resource Manager client, created on first use.
+        """
+        if self._mgmt_client is None:
+            self._mgmt_client = self._create_mgmt_client()
+        return self._mgmt_client
+
+    def _get_storage_signer(self) -> StorageSasSigner:
+        """
+        Returns the signer of SAS URIs for the storage account
+        of the `storage` connection string.
+        """
+        with self._storage_signer_lock:
+            if self._storage_signer is None:
+                self._storage_signer = StorageSasSigner(
+                    self.storage, sas_lifetime=self._storage_sas_lifetime
+                )
+            return self._storage_signer
+
+    def _get_storage_transport(self):
+        """
+        Returns a transport for a storage client, that shares
+        the connections of the other clients of the workspace.
+        The asynchronous transports must be created from a coroutine.
+        """
+        return self._shared_transport.create_transport()
+
+    def _get_top_level_items_client(self):
+        """
+        Returns the internal Azure SDK REST API client
+        for the `{workspace}/topLevelItems` API.
+
+        :return: REST API client for the `topLevelItems` API.
+        :rtype: ServicesTopLevelItemsOperations
+        """
+        return self._client.services.top_level_items
+
+    def _get_sessions_client(self):
+        """
+        Returns the internal Azure SDK REST API client
+        for the `{workspace}/sessions` API.
+
+        :return: REST API client for the `sessions` API.
+        :rtype: ServicesSessionsOperations
+        """
+        return self._client.services.sessions
+
+    def _get_jobs_client(self):
+        """
+        Returns the internal Azure SDK REST API client
+        for the `{workspace}/jobs` API.
+
+        :return: REST API client for the `jobs` API.
+        :rtype: ServicesJobsOperations
+        """
+        return self._client.services.jobs
+
+    def _get_workspace_storage_client(self):
+        """
+        Returns the internal Azure SDK REST API client
+        for the `{workspace}/storage` API.
+
+        :return: REST API client for the `storage` API.
+        :rtype: ServicesStorageOperations
+        """
+        return self._client.services.storage
+
+    def _get_quotas_client(self):
+        """
+        Returns the internal Azure SDK REST API client
+        for the `{workspace}/quotas` API.
+
+        :return: REST API client for the `quotas` API.
+        :rtype: ServicesQuotasOperations
+        """
+        return self._client.services.quotas
+
+    def _get_known_sas_uri(
+        self,
+        container_name: str,
+        blob_name: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Returns the SAS URL of a container or blob that does not require
+        calling the service: signed with the key of the `storage` account,
+        or returned by the service before and not about to expire.
+
+        :return: Storage Account SAS URL, or `None` if the service must be called.
+        :rtype: Optional[str]
+        """
+        if self.storage is not None:
+            return self._get_storage_signer().get_sas_uri(container_name, blob_name)
+
+        sas_uri = self._sas_uri_cache.get(container_name, blob_name)
+        if sas_uri is not None:
+            logger.debug("Using cached SAS URI for %s/%s", container_name, blob_name)
+        return sas_uri
+
+    def _cache_sas_uri(
+        self,
+        container_name: str,
+        blob_name: Optional[str],
+        container_uri: SasUriResponse
+    ) -> str:
+        """
+        Caches the SAS URL returned by the service for a container or blob.
+
+        :return: Storage Account SAS URL.
+        :rtype: str
+        """
+        logger.debug("Container URI from service: %s", container_uri)
+        self._sas_uri_cache.set(container_name, blob_name, container_uri.sas_uri)
+        return container_uri.sas_uri
+
+    def _get_container_name(
+        self,
+        job_id: Optional[str] = None,
+        container_name: Optional[str] = None,
+        container_name_format: Optional[str] = "job-{job_id}"
+    ) -> str:
+        """
+        Returns the name of the container of a job, or of the workspace
+        if no job ID is given, unless a container name is given.
+        """
+        if container_name is None:
+            if job_id is not None:
+                container_name = container_name_format.format(job_id=job_id)
+            elif job_id is None:
+                container_name = f"{self.name}-data"
+        return container_name
+
+    @staticmethod
+    def _create_job_update_options(
+        name: Optional[str] = None,
+        priority: Optional[Union[str, Priority]] = None,
+        tags: Optional[List[str]] = None,
+    ) -> JobUpdateOptions:
+        """
+        Returns the options of a job update, with only the given
+        values set so that the others are left unchanged on the service.
+        """
+        if name is None and priority is None and tags is None:
+            raise ValueError(
+                "At least one of 'name', 'priority' or 'tags' must be specified.")
+
+        update_options = JobUpdateOptions()
+        if name is not None:
+            update_options.name = name
+        if priority is not None:
+            update_options.priority = priority
+        if tags is not None:
+            update_options.tags = tags
+        return update_options
+
+    # The filter and ordering expressions do not depend on the client type
+    _create_filter = staticmethod(create_filter)
+    _create_orderby = staticmethod(create_orderby)
+
+    # The pagers are returned without calling the service, so the paginated
+    # list methods return an ItemPaged with the synchronous client and an
+    # AsyncItemPaged with the asynchronous one.
+
+    def list_jobs_paginated(
+        self,
+        *,
+        name_match: Optional[str] = None,
+        job_type: Optional[str]= None,
+        provider: Optional[list[str]]= None,
+        target: Optional[list[str]]= None,
+        status: Optional[list[JobStatus]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        skip: Optional[int] = 0,
+        top: Optional[int]=100,
+        orderby_property: Optional[str] = None,
+        is_asc: Optional[bool] = True,
+        job_ids: Optional[list[str]] = None,
+    ):
+        client = self._get_jobs_client()
+
+        job_filter = self._create_filter(
+            job_name=name_match,
+            job_type=job_type,
+            provider_ids=provider,
+            target=target,
+            status=status,
+            created_after=created_after,
+            created_before=created_before,
+            job_ids=job_ids,
+        )
+        orderby = self._create_orderby(orderby_property, is_asc)
+
+        return client.list(subscription_id=self.subscription_id, resource_group_name=self.resource_group, workspace_name=self.name, filter=job_filter, orderby=orderby, top = top, skip = skip)
+
+    def list_top_level_items_paginated(
+        self,
+        *,
+        name_match: Optional[str] = None,
+        item_type: Optional[str]= None,
+        job_type: Optional[str]= None,
+        provider: Optional[list[str]]= None,
+        target: Optional[list[str]]= None,
+        status: Optional[list[JobStatus]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        skip: Optional[int] = 0,
+        top: Optional[int]=100,
+        orderby_property: Optional[str] = None,
+        is_asc: Optional[bool] = True
+    ):
+        client = self._get_top_level_items_client()
+
+        top_level_item_filter = self._create_filter(
+            job_name=name_match,
+            item_type=item_type,
+            job_type=job_type,
+            provider_ids=provider,
+            target=target,
+            status=status,
+            created_after=created_after,
+            created_before=created_before
+        )
+        orderby = self._create_orderby(orderby_property, is_asc)
+
+        return client.listv2(subscription_id=self.subscription_id, resource_group_name=self.resource_group, workspace_name=self.name, filter=top_level_item_filter, orderby=orderby, top = top, skip = skip)
+
+    def list_sessions_paginated(
+        self,
+        *,
+        provider: Optional[list[str]]= None,
+        target: Optional[list[str]]= None,
+        status: Optional[list[JobStatus]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        skip: Optional[int] = 0,
+        top: Optional[int]=100,
+        orderby_property: Optional[str] = None,
+        is_asc: Optional[bool] = True
+    ):
+        """
+        Get the list of sessions in the given workspace.
+
+        :return: List of Workspace Sessions.
+        :rtype: typing.List[Session]
+        """
+        client = self._get_sessions_client()
+        session_filter = self._create_filter(
+            provider_ids=provider,
+            target=target,
+            status=status,
+            created_after=created_after,
+            created_before=created_before
+        )
+
+        orderby = self._create_orderby(orderby_property=orderby_property, is_asc=is_asc)
+
+        return client.listv2(subscription_id=self.subscription_id, resource_group_name=self.resource_group, workspace_name=self.name, filter = session_filter, orderby=orderby, skip=skip, top=top)
+
+    def list_session_jobs_paginated(
+        self,
+        *,
+        session_id: str,
+        name_match: Optional[str] = None,
+        status: Optional[list[JobStatus]] = None,
+        skip: Optional[int] = 0,
+        top: Optional[int]=100,
+        orderby_property: Optional[str] = None,
+        is_asc: Optional[bool] = True
+    ):
+        """
+        Gets all jobs associated with a session.
+
+        :param session_id:
+            The id of session.
+
+        :return: List of all jobs associated with a session.
+        :rtype: typing.List[Job]
+        """
+        client = self._get_sessions_client()
+
+        session_job_filter = self._create_filter(
+            job_name=name_match,
+            status=status
+        )
+
+        orderby = self._create_orderby(orderby_property=orderby_property, is_asc=is_asc)
+
+        return client.jobs_list(subscription_id=self.subscription_id, resource_group_name=self.resource_group, workspace_name=self.name, session_id=session_id, filter = session_job_filter, orderby=orderby, skip=skip, top=top)
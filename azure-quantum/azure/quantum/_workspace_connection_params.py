@@ -8,13 +8,11 @@ import os
 from re import Match
 from typing import (
     Optional,
-    Callable,
     Union,
     Any
 )
 from azure.core.credentials import AzureKeyCredential
 from azure.core.pipeline.policies import AzureKeyCredentialPolicy
-from azure.identity import DefaultAzureCredential
 from azure.quantum._constants import (
     EnvironmentKind,
     WorkspaceKind,
@@ -80,7 +78,6 @@ class WorkspaceConnectionParams:
         client_id: Optional[str] = None,
         api_version: Optional[str] = None,
         connection_string: Optional[str] = None,
-        on_new_client_request: Optional[Callable] = None,
         workspace_kind: Optional[str] = None,
     ):
         # fields are used for these properties since
@@ -100,11 +97,10 @@ class WorkspaceConnectionParams:
         self.client_id = None
         self.tenant_id = None
         self.api_version = None
+        # DefaultAzureCredential created when no credential is set
+        self._default_credential = None
         # Track if connection string was used
         self._used_connection_string = False
-        # callback to create a new client if needed
-        # for example, when changing the user agent
-        self.on_new_client_request = on_new_client_request
         # merge the connection parameters passed
         # connection_string is set first as it
         # should be overridden by other parameters
@@ -506,10 +502,16 @@ class WorkspaceConnectionParams:
     def get_credential_or_default(self) -> Any:
         """
         Get the credential if one was set,
-        or defaults to a new DefaultAzureCredential.
+        or defaults to a DefaultAzureCredential, created once
+        so that its tokens are reused by the clients of the workspace.
         """
-        return (self.credential
-                or DefaultAzureCredential(exclude_interactive_browser_credential=False)) # CodeQL [SM05139] Only used as default fallback. Not used in Azure production service.
+        if self.credential:
+            return self.credential
+        if self._default_credential is None:
+            # Only loaded when no credential is given, as it takes a while to import
+            from azure.identity import DefaultAzureCredential
+            self._default_credential = DefaultAzureCredential(exclude_interactive_browser_credential=False) # CodeQL [SM05139] Only used as default fallback. Not used in Azure production service.
+        return self._default_credential
 
     def get_auth_policy(self) -> Any:
         """
@@ -523,8 +525,8 @@ class WorkspaceConnectionParams:
 
     def append_user_agent(self, value: str):
         """
-        Append a new value to the Workspace's UserAgent and re-initialize the
-        WorkspaceClient. The values are appended using a dash.
+        Append a new value to the Workspace's UserAgent.
+        The values are appended using a dash.
 
         :param value: UserAgent value to add, e.g. "azure-quantum-<plugin>"
         """
@@ -539,8 +541,6 @@ class WorkspaceConnectionParams:
 
         if new_user_agent != self.user_agent:
             self.user_agent = new_user_agent
-            if self.on_new_client_request:
-                self.on_new_client_request()
 
     def get_full_user_agent(self):
         """
@@ -0,0 +1,134 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""
+Builds the filter and ordering expressions of the job, session and
+top level item queries, shared by the synchronous and asynchronous workspaces.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+__all__ = ["create_filter", "create_orderby"]
+
+
+def create_filter(
+        job_name: Optional[str] = None,
+        item_type: Optional[List[str]] = None,
+        job_type: Optional[List[str]] = None,
+        provider_ids: Optional[List[str]] = None,
+        target: Optional[List[str]] = None,
+        status: Optional[List[str]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        job_ids: Optional[List[str]] = None,) -> str:
+    """Returns the OData filter expression of the workspace item queries,
+    or None if no criteria is given."""
+    has_filter = False
+    filter_string = ""
+
+    if job_name:
+        filter_string += f"startswith(Name, '{job_name}')"
+        has_filter = True
+
+    if (job_ids is not None and len(job_ids) != 0):
+        if has_filter:
+            filter_string += " and "
+
+        filter_string += "("
+
+        job_id_filter = " or ".join([f"Id eq '{jid}'" for jid in job_ids])
+
+        filter_string += f"{job_id_filter})"
+        has_filter = True
+
+    if (item_type is not None and len(item_type) != 0):
+        if has_filter:
+            filter_string += " and "
+
+        filter_string += "("
+
+        item_type_filter = " or ".join([f"ItemType eq '{iid}'" for iid in item_type])
+
+        filter_string += f"{item_type_filter})"
+        has_filter = True
+
+    if (job_type is not None and len(job_type) != 0):
+        if has_filter:
+            filter_string += " and "
+
+        filter_string += "("
+
+        job_type_filter = " or ".join([f"JobType eq '{jid}'" for jid in job_type])
+
+        filter_string += f"{job_type_filter})"
+        has_filter = True
+
+    if (provider_ids is not None and len(provider_ids) != 0):
+        if has_filter:
+            filter_string += " and "
+
+        filter_string += "("
+
+        provider_filter = " or ".join([f"ProviderId eq '{pid}'" for pid in provider_ids])
+
+        filter_string += f"{provider_filter})"
+        has_filter = True
+
+    if (target is not None and len(target) != 0):
+        if has_filter:
+            filter_string += " and "
+
+        filter_string += "("
+
+        target_filter = " or ".join([f"Target eq '{tid}'" for tid in target])
+
+        filter_string += f"{target_filter})"
+        has_filter = True
+
+    if (status is not None and len(status) != 0):
+        if has_filter:
+            filter_string += " and "
+
+        filter_string += "("
+
+        status_filter = " or ".join([f"State eq '{sid}'" for sid in status])
+
+        filter_string += f"{status_filter})"
+        has_filter = True
+
+    if created_after is not None:
+        if has_filter:
+            filter_string += " and "
+
+        iso_date_string = created_after.date().isoformat()
+        filter_string += f"CreationTime ge {iso_date_string}"
+
+    if created_before is not None:
+        if has_filter:
+            filter_string += " and "
+
+        iso_date_string = created_before.date().isoformat()
+        filter_string += f"CreationTime le {iso_date_string}"
+
+    if filter_string:
+        return filter_string
+    else:
+        return None
+
+
+def create_orderby(orderby_property: str, is_asc: bool) -> str:
+    """Returns the OData ordering expression of the workspace item queries,
+    or None if no property is given."""
+    if orderby_property:
+        var_names = ["Name", "ItemType", "JobType", "ProviderId", "Target", "State", "CreationTime"]
+
+        if orderby_property in var_names:
+            orderby = f"{orderby_property} asc" if is_asc else f"{orderby_property} desc"
+        else:
+            raise ValueError(f"Invalid orderby property: {orderby_property}")
+
+        return orderby
+    else:
+        return None
@@ -0,0 +1,12 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+
+"""Defines asyncio interfaces for interacting with Azure Quantum"""
+
+from .job import Job, JobDetails
+from .session import Session
+from .workspace import Workspace
+
+__all__ = ["Workspace", "Job", "JobDetails", "Session"]
@@ -0,0 +1,75 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""
+Internal pool of asynchronous HTTP connections shared by the storage
+clients of an asynchronous workspace.
+"""
+
+import asyncio
+from typing import Optional
+
+from azure.core.pipeline.transport import AioHttpTransport
+
+from azure.quantum._transport import DEFAULT_POOL_SIZE
+
+
+class SharedAsyncTransport:
+    """
+    Keep-alive connection pool shared by the asynchronous storage clients
+    of a workspace, the counterpart of :class:`azure.quantum._transport.SharedTransport`.
+
+    Each client gets its own `AioHttpTransport` from :meth:`create_transport`,
+    all backed by the same `aiohttp.ClientSession`. Closing a client does not
+    close the session, which lives until :meth:`close` is awaited.
+
+    The session is bound to the event loop it is created in, so it is created
+    on first use from a coroutine, and a new one is created if the transport
+    is later used from another event loop. As `aiohttp` does not support
+    HTTP/2, requests are sent over HTTP/1.1.
+
+    :param pool_size: Maximum number of connections kept alive per host.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None):
+        self._pool_size = pool_size or DEFAULT_POOL_SIZE
+        self._session = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def pool_size(self) -> int:
+        """Maximum number of connections kept alive per host."""
+        return self._pool_size
+
+    def _get_session(self):
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self._pool_size),
+                trust_env=True,
+            )
+            self._loop = loop
+        return self._session
+
+    def create_transport(self) -> AioHttpTransport:
+        """
+        Returns a transport for an asynchronous Azure SDK client
+        that sends its requests through the shared session.
+        Must be called from a coroutine.
+        """
+        return AioHttpTransport(session=self._get_session(), session_owner=False)
+
+    async def close(self) -> None:
+        """
+        Closes the connections of the shared session. A new session
+        is opened if a transport is created afterwards.
+        """
+        session, self._session = self._session, None
+        loop, self._loop = self._loop, None
+        # A session of another, already closed, event loop cannot be closed
+        # from this one; its connections were closed with its loop
+        if session is not None and not session.closed and loop is asyncio.get_running_loop():
+            await session.close()
@@ -0,0 +1,626 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+
+import asyncio
+import inspect
+import logging
+import os
+import time
+
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from azure.storage.blob import BlobClient, BlobProperties
+from azure.storage.blob.aio import ContainerClient
+
+from azure.quantum._client.models import JobDetails
+from azure.quantum._parallel import DEFAULT_MAX_WORKERS
+from azure.quantum.job.base_job import ContentType, DEFAULT_TIMEOUT
+from azure.quantum.job.job_failed_with_results_error import JobFailedWithResultsError
+from azure.quantum.job.job_mixin import JobMixin
+from azure.quantum.job.workspace_item import WorkspaceItem
+from azure.quantum.aio.storage import _gather, download_blob, download_blob_chunks, download_blob_properties, upload_blob
+
+__all__ = ["Job", "JobDetails"]
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from azure.quantum.aio.workspace import Workspace
+    from azure.quantum._client.models import Priority
+
+
+async def _parse_chunks(parse: Callable[[Iterator[bytes]], Any], chunks: AsyncIterator[bytes]) -> Any:
+    """Parses the chunks of a download with `parse` in a worker thread,
+    while the event loop downloads them, so that the incremental parser
+    of the results neither blocks the event loop nor needs the whole payload."""
+    loop = asyncio.get_running_loop()
+
+    def iter_chunks() -> Iterator[bytes]:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(chunks.__anext__(), loop).result()
+            except StopAsyncIteration:
+                return
+
+    try:
+        return await asyncio.to_thread(parse, iter_chunks())
+    finally:
+        await chunks.aclose()
+
+
+class Job(JobMixin, WorkspaceItem):
+    """Azure Quantum Job whose service and storage calls are coroutines,
+    including its attachments. Results are parsed exactly like
+    :class:`azure.quantum.job.Job`.
+
+    :param workspace: Asynchronous workspace instance to submit job to
+    :type workspace: azure.quantum.aio.Workspace
+    :param job_details: Job details model,
+            contains Job ID, name and other details
+    :type job_details: JobDetails
+    """
+
+    def __init__(self, workspace: "Workspace", job_details: JobDetails, **kwargs):
+        self.results = None
+        super().__init__(
+            workspace=workspace,
+            details=job_details,
+            **kwargs
+        )
+
+    @classmethod
+    async def from_input_data(
+        cls,
+        workspace: "Workspace",
+        name: str,
+        target: str,
+        input_data: bytes,
+        content_type: ContentType = ContentType.json,
+        blob_name: str = "inputData",
+        encoding: str = "",
+        job_id: str = None,
+        container_name: str = None,
+        provider_id: str = None,
+        input_data_format: str = None,
+        output_data_format: str = None,
+        input_params: Dict[str, Any] = None,
+        session_id: Optional[str] = None,
+        priority: Optional[str] = None,
+        tags: Optional[list[str]] = None,
+        shared_container_name: Optional[str] = None,
+        **kwargs
+    ) -> "Job":
+        """Create a new Azure Quantum job based on a raw input_data payload.
+        See :meth:`azure.quantum.job.BaseJob.from_input_data` for the parameters.
+
+        :return: Azure Quantum Job
+        :rtype: Job
+        """
+        if job_id is None:
+            job_id = cls.create_job_id()
+
+        if shared_container_name is not None:
+            container_name = shared_container_name
+            blob_name = f"{job_id}/{blob_name}"
+
+        container_uri = await workspace.get_container_uri(
+            job_id=job_id,
+            container_name=container_name
+        )
+        logger.debug(f"Container URI: {container_uri}")
+
+        if shared_container_name is not None and "output_data_uri" not in kwargs:
+            kwargs["output_data_uri"] = cls._get_shared_output_data_uri(container_uri, job_id)
+
+        container_client = ContainerClient.from_container_url(
+            container_uri, transport=workspace._get_storage_transport()
+        )
+        async with container_client:
+            input_data_uri = await upload_blob(
+                container_client,
+                blob_name,
+                content_type,
+                encoding,
+                input_data,
+                return_sas_token=False,
+            )
+
+        return await cls.from_storage_uri(
+            workspace=workspace,
+            job_id=job_id,
+            target=target,
+            input_data_uri=input_data_uri,
+            container_uri=container_uri,
+            name=name,
+            input_data_format=input_data_format,
+            output_data_format=output_data_format,
+            provider_id=provider_id,
+            input_params=input_params,
+            session_id=session_id,
+            priority=priority,
+            tags=tags,
+            **kwargs
+        )
+
+    @classmethod
+    async def from_storage_uri(
+        cls,
+        workspace: "Workspace",
+        name: str,
+        target: str,
+        input_data_uri: str,
+        provider_id: str,
+        input_data_format: str,
+        output_data_format: str,
+        container_uri: str = None,
+        job_id: str = None,
+        input_params: Dict[str, Any] = None,
+        submit_job: bool = True,
+        session_id: Optional[str] = None,
+        priority: Optional[str] = None,
+        tags: Optional[list[str]] = None,
+        **kwargs
+    ) -> "Job":
+        """Create new Job from URI if input data is already uploaded
+        to blob storage.
+        See :meth:`azure.quantum.job.BaseJob.from_storage_uri` for the parameters.
+
+        :return: Job instance
+        :rtype: Job
+        """
+        if job_id is None:
+            job_id = cls.create_job_id()
+        if input_params is None:
+            input_params = {}
+
+        if container_uri is None:
+            container_uri = await workspace.get_container_uri(job_id=job_id)
+
+        details = JobDetails(
+            id=job_id,
+            name=name,
+            container_uri=container_uri,
+            input_data_format=input_data_format,
+            output_data_format=output_data_format,
+            input_data_uri=input_data_uri,
+            provider_id=provider_id,
+            target=target,
+            input_params=input_params,
+            session_id=session_id,
+            priority=priority,
+            tags=tags,
+            **kwargs
+        )
+        job = cls(workspace, details, **kwargs)
+
+        logger.info(
+            f"Submitting job '{name}'. \
+                Using payload from: '{job.details.input_data_uri}'"
+        )
+
+        if submit_job:
+            logger.debug(f"==> submitting: {job.details}")
+            await job.submit()
+
+        return job
+
+    async def submit(self):
+        """Submit a job to Azure Quantum."""
+        logger.debug(f"Submitting job with ID {self.id}")
+        job = await self.workspace.submit_job(self)
+        self.details = job.details
+
+    async def refresh(self):
+        """Refreshes the Job's details by querying the workspace."""
+        self.details = (await self.workspace.get_job(self.id)).details
+
+    async def delete(self):
+        """Delete the given job."""
+        await self.workspace.delete_job(self)
+
+    async def update(
+        self,
+        *,
+        name: Optional[str] = None,
+        priority: Optional[Union[str, "Priority"]] = None,
+        tags: Optional[List[str]] = None,
+    ) -> "Job":
+        """Update the job's name, priority and/or tags after submission.
+
+        :return: This job, with refreshed details.
+        :rtype: Job
+        """
+        updated = await self.workspace.update_job(
+            self,
+            name=name,
+            priority=priority,
+            tags=tags,
+        )
+        self.details = updated.details
+        return self
+
+    async def wait_until_completed(
+        self,
+        max_poll_wait_secs=30,
+        timeout_secs=None,
+        print_progress=True
+    ) -> None:
+        """Keeps refreshing the Job's details
+        until it reaches a finished status, without blocking the event loop.
+
+        :param max_poll_wait_secs: Maximum poll wait time, defaults to 30
+        :type max_poll_wait_secs: int
+        :param timeout_secs: Timeout in seconds, defaults to None
+        :type timeout_secs: int
+        :param print_progress: Print "." to stdout to display progress
+        :type print_progress: bool
+        :raises: :class:`TimeoutError` If the total poll time exceeds timeout, raise.
+        """
+        await self.refresh()
+        poll_wait = Job._default_poll_wait
+        start_time = time.time()
+        while not self.has_completed():
+            if timeout_secs is not None and (time.time() - start_time) >= timeout_secs:
+                raise TimeoutError(f"The wait time has exceeded {timeout_secs} seconds.")
+
+            logger.debug(
+                f"Waiting for job {self.id},"
+                + f"it is in status '{self.details.status}'"
+            )
+            if print_progress:
+                print(".", end="", flush=True)
+            await asyncio.sleep(poll_wait)
+            await self.refresh()
+            poll_wait = (
+                max_poll_wait_secs
+                if poll_wait >= max_poll_wait_secs
+                else poll_wait * 1.5
+            )
+
+    def as_asyncio_future(
+        self,
+        get_results: Optional[Callable[["Job"], Any]] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> asyncio.Future:
+        """Returns an asyncio future that resolves to the results of the job
+        once it has completed, to use with `asyncio.gather` and `asyncio.wait`.
+        The job is polled by a task of the event loop.
+        Cancelling the future stops polling, but does not cancel the job itself.
+
+        :param get_results: Function or coroutine function called with the
+            completed job that returns its results, defaults to :meth:`get_results`
+        :type get_results: Callable[[Job], Any]
+        :param loop: Event loop of the future, defaults to the current event loop
+        :type loop: asyncio.AbstractEventLoop
+        :return: Future of the results of the job
+        :rtype: asyncio.Future
+        """
+        if get_results is None:
+            get_results = lambda job: job.get_results()
+
+        async def wait_for_results():
+            await self.wait_until_completed(print_progress=False)
+            results = get_results(self)
+            if inspect.isawaitable(results):
+                results = await results
+            return results
+
+        return asyncio.ensure_future(wait_for_results(), loop=loop)
+
+    async def get_results(self, timeout_secs: float = DEFAULT_TIMEOUT):
+        """Get job results by downloading the results blob from the
+        storage container linked via the workspace.
+        See :meth:`azure.quantum.job.Job.get_results`.
+
+        :param timeout_secs: Timeout in seconds, defaults to 300
+        :type timeout_secs: float
+        :return: Results dictionary with histogram shots, or raw results if not a json object.
+        :rtype: typing.Any
+        """
+        if self.results is not None:
+            return self.results
+
+        return await self._get_parsed_results("results", self._parse_results, timeout_secs)
+
+    async def get_results_histogram(self, timeout_secs: float = DEFAULT_TIMEOUT):
+        """Get job results histogram by downloading the results blob from the
+        storage container linked via the workspace.
+        See :meth:`azure.quantum.job.Job.get_results_histogram`.
+
+        :param timeout_secs: Timeout in seconds, defaults to 300
+        :type timeout_secs: float
+        :return: Results dictionary with histogram shots.
+        :rtype: typing.Any
+        """
+        if self.results is not None:
+            return self.results
+
+        return await self._get_parsed_results("histogram", self._parse_results_histogram, timeout_secs)
+
+    async def get_results_shots(self, timeout_secs: float = DEFAULT_TIMEOUT, format: str = "list"):
+        """Get job results per shot data by downloading the results blob from the
+        storage container linked via the workspace.
+        See :meth:`azure.quantum.job.Job.get_results_shots`.
+
+        :param timeout_secs: Timeout in seconds, defaults to 300
+        :type timeout_secs: float
+        :param format: "list" or "array", defaults to "list"
+        :type format: str
+        :return: List of shot results.
+        :rtype: typing.Any
+        """
+        if format == "array":
+            return await self._get_parsed_results("shot_table", self._parse_results_shot_table, timeout_secs)
+        if format != "list":
+            raise ValueError(f"Unsupported shots format \"{format}\", expected \"list\" or \"array\".")
+
+        if self.results is not None:
+            return self.results
+
+        return await self._get_parsed_results("shots", self._parse_results_shots, timeout_secs)
+
+    async def _get_parsed_results(self, kind: str, parse, timeout_secs: float):
+        """Waits for the job to succeed and returns its results parsed with `parse`,
+        going through the results cache of the workspace if it has one."""
+        if not self.has_completed():
+            await self.wait_until_completed(timeout_secs=timeout_secs)
+
+        if not self.has_succeeded():
+            await self._raise_for_failed_job()
+
+        output_data_uri = self.details.output_data_uri
+        # Parse the v2 format while it is downloaded
+        streamed = self._is_streamed_result(kind)
+        cache = self._get_results_cache()
+        if cache is None:
+            if streamed:
+                return await _parse_chunks(parse, self.download_data_chunks(output_data_uri))
+            return parse(await self.download_data(output_data_uri))
+
+        etag = (await self.download_blob_properties(output_data_uri)).etag
+        results = cache.get_parsed(self.id, output_data_uri, etag, kind)
+        if results is not None:
+            return results
+
+        # Persisted payloads are read and written off the event loop
+        payload = await asyncio.to_thread(cache.get_payload, self.id, output_data_uri, etag)
+        if payload is not None:
+            results = parse(payload)
+        elif streamed:
+            results = await _parse_chunks(
+                lambda chunks: parse(cache.persist_chunks(self.id, output_data_uri, etag, chunks)),
+                self.download_data_chunks(output_data_uri),
+            )
+        else:
+            payload = await self.download_data(output_data_uri)
+            await asyncio.to_thread(cache.set_payload, self.id, output_data_uri, etag, payload)
+            results = parse(payload)
+        cache.set_parsed(self.id, output_data_uri, etag, kind, results)
+        return results
+
+    async def _raise_for_failed_job(self):
+        """Raises the error for a job that did not succeed, downloading
+        the failure results first if the job class allows it."""
+        if self.details.status == "Failed" and self._allow_failure_results():
+            job_blob_properties = await self.download_blob_properties(self.details.output_data_uri)
+            if job_blob_properties.size > 0:
+                job_failure_data = await self.download_data(self.details.output_data_uri)
+                raise JobFailedWithResultsError("An error occurred during job execution.", job_failure_data)
+
+        raise self._job_failed_error()
+
+    async def download_data(self, blob_uri: str) -> bytes:
+        """Download file from blob uri
+
+        :param blob_uri: Blob URI
+        :type blob_uri: str
+        :return: Payload from blob
+        :rtype: bytes
+        """
+        blob_uri_with_sas_token = await self._get_blob_uri_with_sas_token(blob_uri)
+        return await download_blob(
+            blob_uri_with_sas_token,
+            self.workspace._get_storage_transport(),
+            max_concurrency=self._DOWNLOAD_MAX_CONCURRENCY,
+        )
+
+    async def download_blob_properties(self, blob_uri: str):
+        """Download Blob properties
+
+        :param blob_uri: Blob URI
+        :type blob_uri: str
+        :return: Blob properties
+        :rtype: dict
+        """
+        blob_uri_with_sas_token = await self._get_blob_uri_with_sas_token(blob_uri)
+        return await download_blob_properties(
+            blob_uri_with_sas_token, self.workspace._get_storage_transport()
+        )
+
+    async def download_data_chunks(self, blob_uri: str) -> AsyncIterator[bytes]:
+        """Download file from blob uri as a stream of chunks,
+        without holding the whole payload in memory
+
+        :param blob_uri: Blob URI
+        :type blob_uri: str
+        :return: Async iterator of payload chunks
+        :rtype: AsyncIterator[bytes]
+        """
+        blob_uri_with_sas_token = await self._get_blob_uri_with_sas_token(blob_uri)
+        async for chunk in download_blob_chunks(
+            blob_uri_with_sas_token,
+            self.workspace._get_storage_transport(),
+            max_concurrency=self._DOWNLOAD_MAX_CONCURRENCY,
+        ):
+            yield chunk
+
+    async def upload_attachment(
+        self,
+        name: str,
+        data: bytes,
+        container_uri: str = None,
+        content_type: Optional[ContentType] = ContentType.json,
+        encoding: str = "",
+    ) -> str:
+        """Uploads an attachment to the job's container file. Attachment's are identified by name.
+        See :meth:`azure.quantum.job.BaseJob.upload_attachment`.
+
+        :return: Uploaded data URI
+        :rtype: str
+        """
+        return (await self.upload_attachments(
+            {name: data},
+            container_uri=container_uri,
+            content_type=content_type,
+            encoding=encoding,
+        ))[name]
+
+    async def upload_attachments(
+        self,
+        attachments: Dict[str, Any],
+        container_uri: str = None,
+        content_type: Optional[ContentType] = ContentType.json,
+        encoding: str = "",
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """Uploads several attachments to the job's container concurrently.
+        See :meth:`azure.quantum.job.BaseJob.upload_attachments`.
+
+        :return: Uploaded data URI of each attachment, by name
+        :rtype: Dict[str, str]
+        """
+        container_client = await self._get_attachments_container_client(container_uri)
+        limit = asyncio.Semaphore(max_workers or DEFAULT_MAX_WORKERS)
+
+        async def upload(name, data):
+            async with limit:
+                return await upload_blob(
+                    container_client,
+                    name,
+                    content_type,
+                    encoding,
+                    data,
+                    return_sas_token=False,
+                )
+
+        async with container_client:
+            uris = await _gather(upload(name, data) for name, data in attachments.items())
+        return dict(zip(attachments, uris))
+
+    async def download_attachment(self, name: str, container_uri: str = None) -> bytes:
+        """Downloads an attachment from job's container in Azure Storage.
+        See :meth:`azure.quantum.job.BaseJob.download_attachment`.
+
+        :return: Attachment data
+        :rtype: bytes
+        """
+        return (await self.download_attachments([name], container_uri=container_uri))[name]
+
+    async def download_attachments(
+        self,
+        names: Iterable[str],
+        container_uri: str = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, bytes]:
+        """Downloads several attachments from the job's container concurrently.
+        See :meth:`azure.quantum.job.BaseJob.download_attachments`.
+
+        :return: Data of each attachment, by name
+        :rtype: Dict[str, bytes]
+        """
+        container_client = await self._get_attachments_container_client(container_uri)
+        limit = asyncio.Semaphore(max_workers or DEFAULT_MAX_WORKERS)
+
+        async def download(name):
+            async with limit:
+                downloader = await container_client.get_blob_client(name).download_blob()
+                return await downloader.readall()
+
+        names = list(names)
+        async with container_client:
+            data = await _gather(download(name) for name in names)
+        return dict(zip(names, data))
+
+    async def list_attachments(self) -> List[BlobProperties]:
+        """Lists the attachments in the job's linked storage container.
+        See :meth:`azure.quantum.job.BaseJob.list_attachments`.
+
+        :return: List of blobs in the job's linked storage container.
+        :rtype: list[~azure.storage.blob.BlobProperties]
+        """
+        async with await self._get_attachments_container_client() as container_client:
+            return [blob async for blob in container_client.list_blobs()]
+
+    async def download_all_attachments(
+        self,
+        dest_dir: str,
+        container_uri: str = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """Downloads all the attachments of the job's container to files in a
+        local directory, concurrently. Files are written off the event loop.
+        See :meth:`azure.quantum.job.BaseJob.download_all_attachments`.
+
+        :return: Path of the file of each attachment, by name
+        :rtype: Dict[str, str]
+        """
+        container_client = await self._get_attachments_container_client(container_uri)
+        limit = asyncio.Semaphore(max_workers or DEFAULT_MAX_WORKERS)
+        dest_dir = os.path.abspath(dest_dir)
+
+        async def download(name, path):
+            async with limit:
+                await asyncio.to_thread(os.makedirs, os.path.dirname(path), exist_ok=True)
+                downloader = await container_client.get_blob_client(name).download_blob()
+                f = await asyncio.to_thread(open, path, "wb")
+                try:
+                    async for chunk in downloader.chunks():
+                        await asyncio.to_thread(f.write, chunk)
+                finally:
+                    await asyncio.to_thread(f.close)
+
+        async with container_client:
+            paths = {}
+            async for blob in container_client.list_blobs():
+                path = os.path.abspath(os.path.join(dest_dir, *blob.name.split("/")))
+                if os.path.commonpath([dest_dir, path]) != dest_dir:
+                    raise ValueError(
+                        f"Attachment '{blob.name}' can not be downloaded outside of '{dest_dir}'."
+                    )
+                paths[blob.name] = path
+            await _gather(download(name, path) for name, path in paths.items())
+        return paths
+
+    async def _get_attachments_container_client(self, container_uri: str = None) -> ContainerClient:
+        """Get an asynchronous client of the container attachments are stored in,
+        defaulting to the job's linked container
+        :param container_uri: Container URI
+        :type container_uri: str
+        :return: Container client
+        :rtype: ~azure.storage.blob.aio.ContainerClient
+        """
+        if container_uri is None:
+            if self._details.container_uri is None:
+                container_uri = await self.workspace.get_container_uri(job_id=self.id)
+            else:
+                container_uri = self._details.container_uri
+        return ContainerClient.from_container_url(
+            container_uri, transport=self.workspace._get_storage_transport()
+        )
+
+    async def _get_blob_uri_with_sas_token(self, blob_uri: str) -> str:
+        """Get Blob URI with SAS-token if one was not specified in blob_uri parameter
+        :param blob_uri: Blob URI
+        :type blob_uri: str
+        :return: Blob URI with SAS-token
+        :rtype: str
+        """
+        if not self._has_valid_sas_token(blob_uri):
+            blob_client = BlobClient.from_blob_url(blob_uri)
+            blob_uri = await self.workspace._get_linked_storage_sas_uri(
+                blob_client.container_name, blob_client.blob_name
+            )
+
+        return blob_uri
@@ -0,0 +1,80 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+
+from typing import TYPE_CHECKING, List
+
+from azure.quantum.job.session import Session as _SyncSession
+
+__all__ = ["Session"]
+
+if TYPE_CHECKING:
+    from azure.quantum.aio.job import Job
+
+
+class Session(_SyncSession):
+    """Azure Quantum Job Session whose service calls are coroutines.
+    Accepts the same parameters as :class:`azure.quantum.job.Session`,
+    with an asynchronous workspace.
+
+    Use it in an `async with` block to close it when the block exits.
+    """
+
+    async def open(self) -> "Session":
+        """Opens a session, effectively creating a new session in the
+           Azure Quantum service, and allowing it to accept jobs under it.
+
+        :return: The session object with updated details after its opening.
+        :rtype: Session
+        """
+        await self.workspace.open_session(self)
+        return self
+
+    async def close(self) -> "Session":
+        """Closes a session, not allowing further jobs to be submitted under
+           the session.
+
+        :return: The session object with updated details after its closing.
+        :rtype: Session
+        """
+        await self.workspace.close_session(self)
+        return self
+
+    async def refresh(self) -> "Session":
+        """Fetches the latest session details from the Azure Quantum service.
+
+        :return: The session object with updated details.
+        :rtype: Session
+        """
+        await self.workspace.refresh_session(self)
+        return self
+
+    async def list_jobs(self) -> List["Job"]:
+        """Lists all jobs associated with this session.
+
+        :return: A list of all jobs associated with this session.
+        :rtype: typing.List[Job]
+        """
+        return await self.workspace.list_session_jobs(session_id=self.id)
+
+    def __enter__(self):
+        raise TypeError("Use `async with` to use an asynchronous session in a block.")
+
+    def __exit__(self, type, value, traceback):
+        pass
+
+    async def __aenter__(self) -> "Session":
+        """Async context manager implementation to use a session in
+           an `async with` block.
+           This `__aenter__` method is a no-op.
+        """
+        return self
+
+    async def __aexit__(self, type, value, traceback) -> None:
+        """Async context manager implementation to use a session in
+           an `async with` block.
+           This `__aexit__` attempts to close the session; the exception
+           that was raised in the block, if any, is propagated.
+        """
+        await self.close()
@@ -0,0 +1,587 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""
+Asynchronous counterparts of the helpers of :mod:`azure.quantum.storage`,
+built on `azure.storage.blob.aio`, so that uploading job data and
+downloading results never blocks the event loop.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+import inspect
+import logging
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from azure.core import exceptions, MatchConditions
+from azure.core.pipeline.transport import AsyncHttpTransport
+from azure.storage.blob import (
+    BlobSasPermissions,
+    BlobProperties,
+    BlobType,
+    ContentSettings,
+    generate_container_sas,
+)
+from azure.storage.blob.aio import (
+    BlobClient,
+    BlobServiceClient,
+    ContainerClient,
+)
+from datetime import datetime, timedelta
+from azure.quantum.storage import (
+    DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    StreamedBlobState,
+    _BlockCheckpoint,
+    _StreamedBlobBase,
+    _client_kwargs,
+    _open_upload_data,
+    get_blob_uri_with_sas_token,
+    remove_sas_token,
+)
+
+__all__ = [
+    "create_container",
+    "create_container_using_client",
+    "get_container_uri",
+    "upload_blob",
+    "append_blob",
+    "download_blob",
+    "download_blob_chunks",
+    "download_blob_properties",
+    "download_blob_metadata",
+    "set_blob_metadata",
+    "StreamedBlob",
+    "StreamedBlobState",
+    "get_blob_uri_with_sas_token",
+    "remove_sas_token",
+]
+
+logger = logging.getLogger(__name__)
+
+
+async def create_container(
+    connection_string: str,
+    container_name: str,
+    transport: Optional[AsyncHttpTransport] = None,
+) -> ContainerClient:
+    """
+    Creates and initialize a container; returns the client needed to access it.
+    Requests are sent through `transport` if given.
+    The caller is responsible for closing the returned client.
+    """
+    blob_service_client = BlobServiceClient.from_connection_string(
+        connection_string, **_client_kwargs(transport)
+    )
+    logger.info(
+        f'{"Initializing storage client for account:"}'
+        + f"{blob_service_client.account_name}"
+    )
+
+    container_client = blob_service_client.get_container_client(container_name)
+    await create_container_using_client(container_client)
+    return container_client
+
+
+async def create_container_using_client(container_client: ContainerClient):
+    """
+    Creates the container if it doesn't already exist.
+    """
+    if not await container_client.exists():
+        logger.debug(
+            f'{"  - uploading to **new** container:"}'
+            f"{container_client.container_name}"
+        )
+        await container_client.create_container()
+
+
+async def get_container_uri(
+    connection_string: str,
+    container_name: str,
+    transport: Optional[AsyncHttpTransport] = None,
+) -> str:
+    """
+    Creates and initialize a container;
+    returns a URI with a SAS read/write token to access it.
+    """
+    async with await create_container(connection_string, container_name, transport) as container:
+        logger.info(
+            f'{"Creating SAS token for container"}'
+            + f"'{container_name}' on account: '{container.account_name}'"
+        )
+
+        sas_token = generate_container_sas(
+            container.account_name,
+            container.container_name,
+            account_key=container.credential.account_key,
+            permission=BlobSasPermissions(
+                read=True, add=True, write=True, create=True
+            ),
+            expiry=datetime.utcnow() + timedelta(days=14),
+        )
+
+        uri = container.url + "?" + sas_token
+    logger.debug(f"  - container url: '{uri}'.")
+    return uri
+
+
+async def upload_blob(
+    container: ContainerClient,
+    blob_name: str,
+    content_type: str,
+    content_encoding: str,
+    data: Any,
+    return_sas_token: bool = True,
+) -> str:
+    """
+    Uploads the given data to a blob record.
+    If a blob with the given name already exist, it throws an error.
+    Container must already exist in a storage.
+
+    Besides bytes, str, streams and async iterables, data can be
+    the `os.PathLike` path of a file, a `memoryview` or an `mmap.mmap`,
+    which are streamed to the blob without being copied into memory first.
+
+    Returns a uri with a SAS token to access the newly created blob.
+    """
+    logger.info(
+        f"Uploading blob '{blob_name}'"
+        + f"to container '{container.container_name}'"
+        + f"on account: '{container.account_name}'"
+    )
+
+    content_settings = ContentSettings(
+        content_type=content_type, content_encoding=content_encoding
+    )
+
+    blob = container.get_blob_client(blob_name)
+
+    async with _open_upload_data_async(data) as (stream, length):
+        await blob.upload_blob(stream, length=length, content_settings=content_settings)
+    logger.debug(f"  - blob '{blob_name}' uploaded. generating sas token.")
+
+    if return_sas_token:
+        uri = get_blob_uri_with_sas_token(blob)
+    else:
+        uri = remove_sas_token(blob.url)
+    logger.debug(f"  - blob access url: '{uri}'.")
+
+    return uri
+
+
+class _FileReader:
+    """Stream over a file whose reads run in a worker thread, so that
+    uploading the file does not block the event loop. It is not seekable,
+    so that the storage client reads it sequentially and awaits each read."""
+
+    def __init__(self, file: Any):
+        self._file = file
+
+    async def read(self, size: int = -1) -> bytes:
+        return await asyncio.to_thread(self._file.read, size)
+
+
+@asynccontextmanager
+async def _open_upload_data_async(data: Any) -> AsyncIterator[Tuple[Any, Optional[int]]]:
+    """Opens data to upload as :func:`azure.quantum.storage._open_upload_data`
+    does, but reads files without blocking the event loop."""
+    if isinstance(data, os.PathLike):
+        file = await asyncio.to_thread(open, data, "rb")
+        try:
+            yield _FileReader(file), os.fstat(file.fileno()).st_size
+        finally:
+            file.close()
+    else:
+        with _open_upload_data(data) as (stream, length):
+            yield stream, length
+
+
+async def append_blob(
+    container: ContainerClient,
+    blob_name: str,
+    content_type: str,
+    content_encoding: str,
+    data: Any,
+    return_sas_token: bool = True,
+    metadata: Dict[str, str] = None,
+) -> str:
+    """
+    Uploads the given data to a blob record.
+    If a blob with the given name already exist, it throws an error.
+    Container must already exist in a storage.
+
+    Returns a uri with a SAS token to access the newly created blob.
+    """
+    logger.info(
+        f"Appending data to blob '{blob_name}'"
+        + f"in container '{container.container_name}'"
+        + f"on account: '{container.account_name}'"
+    )
+
+    content_settings = ContentSettings(
+        content_type=content_type, content_encoding=content_encoding
+    )
+    blob = container.get_blob_client(blob_name)
+    try:
+        props = await blob.get_blob_properties()
+        if props.blob_type != BlobType.AppendBlob:
+            raise Exception("blob must be an append blob")
+    except exceptions.ResourceNotFoundError:
+        props = await blob.create_append_blob(
+            content_settings=content_settings, metadata=metadata
+        )
+
+    await blob.append_block(data, len(data))
+    logger.debug(f"  - blob '{blob_name}' appended. generating sas token.")
+
+    if return_sas_token:
+        uri = get_blob_uri_with_sas_token(blob)
+    else:
+        uri = remove_sas_token(blob.url)
+
+    logger.debug(f"  - blob access url: '{uri}'.")
+
+    return uri
+
+
+async def download_blob(
+    blob_url: str,
+    transport: Optional[AsyncHttpTransport] = None,
+    max_concurrency: int = 1,
+    chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+) -> Any:
+    """
+    Downloads the given blob from the container.
+    With a `max_concurrency` greater than 1, the blob is downloaded as
+    ranges of `chunk_size` bytes, up to `max_concurrency` at a time.
+    """
+    async with BlobClient.from_blob_url(blob_url, **_client_kwargs(transport)) as blob_client:
+        logger.info(
+            f"Downloading blob '{blob_client.blob_name}'"
+            + f"from container '{blob_client.container_name}'"
+            + f"on account: '{blob_client.account_name}'"
+        )
+
+        if max_concurrency > 1:
+            first_chunk, size, etag = await _download_first_range(blob_client, chunk_size)
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def download_range(offset: int) -> bytes:
+                async with semaphore:
+                    return await _download_range(blob_client, offset, chunk_size, size, etag)
+
+            chunks = [first_chunk] + await _gather(
+                download_range(offset)
+                for offset in range(len(first_chunk), size, chunk_size)
+            )
+            # Joining a single chunk returns it without a copy
+            response = b"".join(chunks)
+        else:
+            downloader = await blob_client.download_blob()
+            response = await downloader.readall()
+    logger.debug(response)
+
+    return response
+
+
+async def download_blob_chunks(
+    blob_url: str,
+    transport: Optional[AsyncHttpTransport] = None,
+    max_concurrency: int = 1,
+    chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Downloads the given blob from the container,
+    returning its content as an async iterator of chunks.
+    With a `max_concurrency` greater than 1, up to `max_concurrency`
+    ranges of `chunk_size` bytes are downloaded ahead of the consumer,
+    and yielded in order.
+    """
+    async with BlobClient.from_blob_url(blob_url, **_client_kwargs(transport)) as blob_client:
+        logger.info(
+            f"Downloading blob '{blob_client.blob_name}'"
+            + f"from container '{blob_client.container_name}'"
+            + f"on account: '{blob_client.account_name}'"
+        )
+
+        if max_concurrency <= 1:
+            downloader = await blob_client.download_blob()
+            async for chunk in downloader.chunks():
+                yield chunk
+            return
+
+        first_chunk, size, etag = await _download_first_range(blob_client, chunk_size)
+        if first_chunk:
+            yield first_chunk
+        pending: List[asyncio.Task] = []
+        try:
+            for offset in range(len(first_chunk), size, chunk_size):
+                pending.append(asyncio.ensure_future(
+                    _download_range(blob_client, offset, chunk_size, size, etag)
+                ))
+                if len(pending) >= max_concurrency:
+                    yield await pending.pop(0)
+            while pending:
+                yield await pending.pop(0)
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+async def _gather(coroutines) -> List[Any]:
+    """Runs the coroutines concurrently and returns their results in order.
+    If one of them fails, the others are cancelled."""
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def _download_first_range(blob_client: BlobClient, chunk_size: int) -> Tuple[bytes, int, str]:
+    """Downloads the first range of a blob. Returns its data, the size
+    of the whole blob and its ETag, so that the other ranges are only
+    downloaded if the blob has not changed since."""
+    try:
+        downloader = await blob_client.download_blob(offset=0, length=chunk_size)
+    except exceptions.HttpResponseError as e:
+        if e.status_code != 416:
+            raise
+        # A range cannot be requested from an empty blob
+        properties = await blob_client.get_blob_properties()
+        return b"", properties.size, properties.etag
+    data = await downloader.readall()
+    size = len(data)
+    content_range = downloader.properties.content_range
+    if content_range and "/" in content_range:
+        try:
+            size = int(content_range.rsplit("/", 1)[1])
+        except ValueError:
+            pass
+    return data, size, downloader.properties.etag
+
+
+async def _download_range(
+    blob_client: BlobClient, offset: int, chunk_size: int, size: int, etag: str
+) -> bytes:
+    length = min(chunk_size, size - offset)
+    downloader = await blob_client.download_blob(
+        offset=offset,
+        length=length,
+        etag=etag,
+        match_condition=MatchConditions.IfNotModified,
+    )
+    data = await downloader.readall()
+    if len(data) != length:
+        raise exceptions.IncompleteReadError(
+            message=f"Expected {length} bytes at offset {offset}, received {len(data)}."
+        )
+    return data
+
+
+async def download_blob_properties(
+    blob_url: str, transport: Optional[AsyncHttpTransport] = None
+) -> BlobProperties:
+    """Downloads the blob properties from Azure for the given blob URI"""
+    async with BlobClient.from_blob_url(blob_url, **_client_kwargs(transport)) as blob_client:
+        logger.info(
+            f"Downloading blob properties '{blob_client.blob_name}'"
+            + f"from container '{blob_client.container_name}'"
+            + f"on account: '{blob_client.account_name}'"
+        )
+
+        response = await blob_client.get_blob_properties()
+    logger.debug(response)
+
+    return response
+
+
+async def download_blob_metadata(
+    blob_url: str, transport: Optional[AsyncHttpTransport] = None
+) -> Dict[str, str]:
+    """Downloads the blob metadata from the
+    blob properties in Azure for the given blob URI"""
+    return (await download_blob_properties(blob_url, transport)).metadata
+
+
+async def set_blob_metadata(
+    blob_url: str,
+    metadata: Dict[str, str],
+    transport: Optional[AsyncHttpTransport] = None,
+):
+    """Sets the provided dictionary as the metadata on the Azure blob"""
+    async with BlobClient.from_blob_url(blob_url, **_client_kwargs(transport)) as blob_client:
+        logger.info(
+            f"Setting blob properties '{blob_client.blob_name}'"
+            + f"from container '{blob_client.container_name}' on account:"
+            + f"'{blob_client.account_name}'"
+        )
+        return await blob_client.set_blob_metadata(metadata=metadata)
+
+
+class StreamedBlob(_StreamedBlobBase):
+    """Asynchronous counterpart of :class:`azure.quantum.storage.StreamedBlob`,
+    a state machine for writing blobs using the Azure Block Blob API.
+
+    To use, start awaiting `upload_data()` or `upload_stream()`
+    to add data. Data is split into blocks of up to `block_size` bytes,
+    up to `max_workers` of which are staged concurrently, and each
+    call returns once all of its blocks have been staged. A block that
+    fails to be staged with a transient error is retried on its own, up to
+    `max_retries` times, with the retry policy of the storage client
+    disabled, as with :class:`azure.quantum.storage.StreamedBlob`.
+    Once all data has been added, await `commit()`
+    to commit the blocks and make the blob available/readable.
+
+    With a `checkpoint_path`, an interrupted upload can be resumed
+    as with :class:`azure.quantum.storage.StreamedBlob`.
+
+    :param container: The asynchronous container client that the blob
+        will be uploaded to. Container must already exist in a storage.
+    :param blob_name: The name of the blob
+        (including optional path) within the blob container
+    :param content_type: The HTTP content type to apply to the blob metadata
+    :param content_encoding: The HTTP
+        content encoding to apply to the blob metadata
+    :param block_size: Maximum size of a block in bytes, defaults to 4 MiB
+    :param max_workers: Maximum number of blocks staged concurrently,
+        defaults to 8
+    :param max_retries: Number of times a block is retried
+        after failing to be staged, defaults to 3
+    :param checkpoint_path: Path of the file recording the staged blocks,
+        to resume an interrupted upload, defaults to None
+    """
+
+    async def upload_data(self, data):
+        """Uploads data to the given block blob in Azure,
+        as one or more blocks of up to `block_size` bytes
+
+        :param data: The data to be uploaded.
+        :type data: Union[bytes, str, Iterable[bytes], AsyncIterable[bytes], IO[bytes]]
+        """
+        chunks = self._split_data(data)
+        if chunks is not None:
+            await self._upload_blocks(_iterate(chunks))
+        else:
+            await self.upload_stream(data)
+
+    async def upload_stream(self, stream):
+        """Uploads a stream of arbitrary size to the given block blob in Azure,
+        reading it one block at a time. At most twice as many blocks as
+        `max_workers` are held in memory at once.
+
+        :param stream: File-like object opened in binary mode, whose `read`
+            may be a coroutine, or iterable or async iterable of bytes chunks
+            of any size. The synchronous reads of a file-like object run in
+            a worker thread
+        :type stream: Union[IO[bytes], Iterable[bytes], AsyncIterable[bytes]]
+        """
+        await self._upload_blocks(self._read_blocks(stream))
+
+    async def _read_blocks(self, stream) -> AsyncIterator[bytes]:
+        if hasattr(stream, "read"):
+            if not inspect.iscoroutinefunction(stream.read):
+                # Synchronous reads, e.g. of a file, run in a worker thread
+                stream = _FileReader(stream)
+            while True:
+                block = await stream.read(self.block_size)
+                if not block:
+                    return
+                yield block
+        else:
+            chunks = stream if hasattr(stream, "__aiter__") else _iterate(stream)
+            buffer = bytearray()
+            async for chunk in chunks:
+                for block in self._buffer_blocks(buffer, chunk):
+                    yield block
+            if buffer:
+                yield bytes(buffer)
+
+    async def _upload_blocks(self, chunks: AsyncIterator) -> None:
+        self._start_upload()
+        max_pending = 2 * self.max_workers
+        semaphore = asyncio.Semaphore(self.max_workers)
+        pending = set()
+        try:
+            async for chunk in chunks:
+                id, offset = self._add_block(chunk)
+                if await self._is_block_staged(id, offset, chunk):
+                    self.resumed_blocks += 1
+                    continue
+                pending.add(asyncio.ensure_future(
+                    self._stage_block(id, chunk, semaphore, offset)
+                ))
+                if len(pending) >= max_pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        task.result()
+            for task in list(pending):
+                pending.discard(task)
+                await task
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+
+    async def _is_block_staged(self, id: str, offset: int, data) -> bool:
+        """Checks if a block with the same data was staged by a previous
+        upload recorded in the checkpoint, and is still staged."""
+        if self._checkpoint is None:
+            return False
+        if self._staged_blocks is None:
+            # The checkpoint is a local file, read without blocking the event loop
+            recorded = await asyncio.to_thread(self._checkpoint.load)
+            uncommitted = []
+            if recorded:
+                try:
+                    _, uncommitted = await self.blob.get_block_list("uncommitted")
+                except exceptions.ResourceNotFoundError:
+                    pass
+            self._resume(recorded, uncommitted)
+        return _BlockCheckpoint.matches(self._staged_blocks.get(id), offset, data)
+
+    async def _stage_block(
+        self, id: str, data, semaphore: asyncio.Semaphore, offset: int = 0
+    ) -> None:
+        attempt = 0
+        async with semaphore:
+            while True:
+                try:
+                    logger.debug(f"Uploading block '{id}' to {self.blob_name}")
+                    # Failed blocks are retried by this loop only
+                    await self.blob.stage_block(id, data, length=len(data), retry_total=0)
+                    if self._checkpoint is not None:
+                        await asyncio.to_thread(self._checkpoint.record, id, offset, data)
+                    return
+                except exceptions.AzureError as e:
+                    delay = self._get_retry_delay(id, attempt, e)
+                    if delay is None:
+                        raise
+                    attempt += 1
+                    await asyncio.sleep(delay)
+
+    async def commit(self, metadata: Dict[str, str] = None):
+        """Commits all previously uploaded blobs to the block blob
+
+        :param metadata: Optional dictionary of
+               metadata to be applied to the block blob
+        """
+        self._check_commit()
+        await self.blob.commit_block_list(
+            self.blocks,
+            content_settings=self.content_settings,
+            metadata=metadata,
+        )
+        self.state = StreamedBlobState.committed
+        if self._checkpoint is not None:
+            await asyncio.to_thread(self._checkpoint.remove)
+        logger.debug(f"Committed {self.blob_name}")
+
+
+async def _iterate(items) -> AsyncIterator:
+    for item in items:
+        yield item
@@ -0,0 +1,596 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""
+Module providing the asynchronous Workspace class, used to connect to
+an Azure Quantum Workspace from an asyncio event loop.
+"""
+
+from __future__ import annotations
+from datetime import datetime
+import logging
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from typing_extensions import Self
+from azure.core.exceptions import HttpResponseError, ResourceExistsError
+from azure.quantum._client.aio import WorkspaceClient
+from azure.quantum._client.models import (
+    BlobDetails,
+    JobDetails,
+    JobStatus,
+    Priority,
+    SessionDetails,
+    TargetStatus,
+)
+from azure.quantum.aio.job import Job
+from azure.quantum.aio.session import Session
+from azure.quantum.aio._transport import SharedAsyncTransport
+from azure.quantum.aio.storage import create_container
+from azure.quantum._workspace_base import WorkspaceBase
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Workspace"]
+
+# pylint: disable=line-too-long
+# pylint: disable=too-many-public-methods
+class Workspace(WorkspaceBase):
+    """
+    Represents an Azure Quantum workspace whose service calls are
+    coroutines, so that a single event loop can drive many concurrent
+    requests without a thread per call.
+
+    Accepts the same parameters as :class:`azure.quantum.Workspace`,
+    except the target cache ones: it has no `get_targets`, as the
+    :class:`azure.quantum.target.Target` classes submit jobs synchronously.
+    Submit jobs with :meth:`azure.quantum.aio.Job.from_input_data` instead.
+    Requires an async HTTP transport such as `aiohttp`, installed with
+    `pip install azure-quantum[aio]`.
+
+    Resolving a partially specified workspace (for example, only a name)
+    queries Azure Resource Manager synchronously once, when the object
+    is created. To avoid that, specify the subscription ID, resource group,
+    workspace name and location, or use a connection string.
+
+    :param subscription_id:
+        The Azure subscription ID.
+        Ignored if resource_id is specified.
+
+    :param resource_group:
+        The Azure resource group name.
+        Ignored if resource_id is specified.
+
+    :param name:
+        The Azure Quantum workspace name.
+        Ignored if resource_id is specified.
+
+    :param storage:
+        The Azure storage account connection string.
+        Required only if the specified Azure Quantum
+        workspace does not have linked storage.
+
+    :param resource_id:
+        The resource ID of the Azure Quantum workspace.
+
+    :param location:
+        The Azure region where the Azure Quantum workspace is provisioned.
+
+    :param credential:
+        The credential to use to connect to Azure services.
+        Both synchronous credentials and the asynchronous credentials
+        from `azure.identity.aio` are supported for the service calls.
+        An asynchronous credential requires a fully specified workspace,
+        as it cannot be used to resolve it from Azure Resource Manager.
+
+        Defaults to \"DefaultAzureCredential\".
+
+    :param user_agent:
+        Add the specified value as a prefix to the HTTP User-Agent header
+        when communicating to the Azure Quantum service.
+
+    :param connection_pool_size:
+        Maximum number of connections kept alive per host by the
+        storage requests of the workspace. Defaults to 32.
+
+    :param storage_sas_lifetime:
+        Lifetime of the SAS tokens signed with the key of the `storage`
+        account. Defaults to 14 days.
+
+    :param discovery_cache_path:
+        Path of a JSON file where the details of the workspace are stored
+        once looked up from Azure Resource Manager, so that other processes
+        connecting to the same workspace do not look it up again.
+        Disabled by default.
+
+    :param discovery_cache_ttl_secs:
+        How long the workspace details in `discovery_cache_path` are
+        reused for, in seconds. Defaults to 24 hours.
+    """
+
+    _SHARED_TRANSPORT_CLS = SharedAsyncTransport
+
+    def _create_client(self) -> WorkspaceClient:
+        """"
+        An internal method to (re)create the underlying asynchronous Azure SDK REST API client.
+
+        :return: Asynchronous Azure SDK REST API client for Azure Quantum.
+        :rtype: WorkspaceClient
+        """
+        return WorkspaceClient(**self._get_client_kwargs())
+
+    async def _get_linked_storage_sas_uri(
+        self,
+        container_name: str,
+        blob_name: Optional[str] = None
+    ) -> str:
+        """
+        Calls the service and returns a container/blob SAS URL
+        for the Storage associated with the Quantum Workspace.
+        If the workspace was given a `storage` connection string,
+        the SAS URL is signed locally with its key instead.
+
+        :param container_name:
+            The name of the storage container.
+
+        :param blob_name:
+            Optional name of the blob. Defaults to `None`.
+
+        :return: Storage Account SAS URL to a container or blob.
+        :rtype: str
+        """
+        sas_uri = self._get_known_sas_uri(container_name, blob_name)
+        if sas_uri is not None:
+            return sas_uri
+
+        client = self._get_workspace_storage_client()
+        blob_details = BlobDetails(
+            container_name=container_name, blob_name=blob_name
+        )
+        container_uri = await client.get_sas_uri(
+            self.subscription_id,
+            self.resource_group,
+            self.name,
+            blob_details=blob_details)
+
+        return self._cache_sas_uri(container_name, blob_name, container_uri)
+
+    async def submit_job(self, job: Job) -> Job:
+        """
+        Submits a job to be processed in the Workspace.
+
+        :param job:
+            Job to submit.
+
+        :return: Azure Quantum Job that was submitted, with an updated status.
+        :rtype: Job
+        """
+        client = self._get_jobs_client()
+        details = await client.create(
+            self.subscription_id,
+            self.resource_group,
+            self.name,
+            job.details.id,
+            job.details
+        )
+        return Job(self, details)
+
+    async def cancel_job(self, job: Job) -> Job:
+        """
+        Requests the Workspace to cancel the
+        execution of a job.
+
+        :param job:
+            Job to cancel.
+
+        :return: Azure Quantum Job that was requested to be cancelled, with an updated status.
+        :rtype: Job
+        """
+        client = self._get_jobs_client()
+
+        try:
+            await client.cancel(
+                self.subscription_id,
+                self.resource_group,
+                self.name,
+                job.details.id)
+        except HttpResponseError as e:
+            # See Workspace.cancel_job: the service answers a successful cancellation with 204 No Content.
+            if e.status_code != 204:
+                raise
+
+        details = await client.get(
+            self.subscription_id,
+            self.resource_group,
+            self.name,
+            job.id)
+        return Job(self, details)
+
+    async def update_job(
+        self,
+        job: Job,
+        *,
+        name: Optional[str] = None,
+        priority: Optional[Union[str, Priority]] = None,
+        tags: Optional[List[str]] = None,
+    ) -> Job:
+        """
+        Updates the name, priority and/or tags of a job after it has
+        been submitted.
+
+        Only the arguments that are explicitly provided are updated;
+        any argument left as ``None`` is left unchanged on the service.
+
+        :param job:
+            Job to update.
+
+        :param name:
+            The new name of the job.
+
+        :param priority:
+            The new priority of the job.
+
+        :param tags:
+            The new list of user-supplied tags associated with the job.
+
+        :return: Azure Quantum Job with updated details.
+        :rtype: Job
+        """
+        update_options = self._create_job_update_options(name, priority, tags)
+        client = self._get_jobs_client()
+        job_id = job.id
+
+        await client.update(
+            self.subscription_id,
+            self.resource_group,
+            self.name,
+            job_id,
+            update_options)
+
+        details = await client.get(
+            self.subscription_id,
+            self.resource_group,
+            self.name,
+            job_id)
+        return Job(self, details)
+
+    async def delete_job(self, job: Job) -> None:
+        """Deletes a job.
+        :param job:
+            Job to delete.
+        """
+        client = self._get_jobs_client()
+        await client.delete(
+            self.subscription_id,
+            self.resource_group,
+            self.name,
+            job.details.id)
+
+    async def get_job(self, job_id: str) -> Job:
+        """
+        Returns the job corresponding to the given id.
+
+        :param job_id:
+            Id of a job to fetch.
+
+        :return: Azure Quantum Job.
+        :rtype: Job
+        """
+        client = self._get_jobs_client()
+        details = await client.get(
+            self.subscription_id,
+            self.resource_group,
+            self.name,
+            job_id)
+        return Job(self, details)
+
+    async def list_jobs(
+        self,
+        name_match: Optional[str] = None,
+        job_type: Optional[list[str]]= None,
+        provider: Optional[list[str]]= None,
+        target: Optional[list[str]]= None,
+        status: Optional[list[JobStatus]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        orderby_property: Optional[str] = None,
+        is_asc: Optional[bool] = True
+    ) -> List[Job]:
+        """
+        Returns list of jobs that meet optional (limited) filter criteria.
+
+        :return: Jobs that matched the search criteria.
+        :rtype: typing.List[Job]
+        """
+        paginator = self.list_jobs_paginated(
+            name_match=name_match,
+            job_type=job_type,
+            provider=provider,
+            target=target,
+            status=status,
+            created_after=created_after,
+            created_before=created_before,
+            orderby_property=orderby_property,
+            is_asc=is_asc)
+
+        return [Job(self, j) async for j in paginator]
+
+    async def _get_target_status(
+            self,
+            name: Optional[str] = None,
+            provider_id: Optional[str] = None,
+        ) -> List[Tuple[str, TargetStatus]]:
+        """
+        Returns a list of tuples containing the `Provider ID` and `Target Status`,
+        with the option of filtering that list by a combination of Provider ID and Target Name.
+
+        :return: List of tuples containing Provider ID and TargetStatus.
+        :rtype: typing.List[typing.Tuple[str, TargetStatus]]
+        """
+        return [
+            (provider.id, target)
+            async for provider in self._client.services.providers.list(
+                self.subscription_id,
+                self.resource_group,
+                self.name)
+            for target in provider.targets
+            if (provider_id is None or provider.id.lower() == provider_id.lower())
+                and (name is None or target.id.lower() == name.lower())
+        ]
+
+    async def get_quotas(self) -> List[Dict[str, Any]]:
+        """
+        Get a list of quotas for the given workspace.
+        Each quota is represented as a dictionary, containing the
+        properties for that quota.
+
+        :return: Workspace quotas.
+        :rtype: typing.List[typing.Dict[str, typing.Any]
+        """
+        client = self._get_quotas_client()
+        return [q.as_dict() async for q in client.list(
+            self.subscription_id,
+            self.resource_group,
+            self.name
+        )]
+
+    async def list_top_level_items(
+        self,
+        name_match: Optional[str] = None,
+        item_type: Optional[list[str]]= None,
+        job_type: Optional[list[str]]= None,
+        provider: Optional[list[str]]= None,
+        target: Optional[list[str]]= None,
+        status: Optional[list[JobStatus]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        orderby_property: Optional[str] = None,
+        is_asc: Optional[bool] = True
+    ) -> List[Union[Job, Session]]:
+        """
+        Get a list of top level items for the given workspace,
+        which can be standalone Jobs (Jobs not associated with a Session)
+        or Sessions (which can contain Jobs).
+
+        :return: List of Workspace top level Jobs or Sessions.
+        :rtype: typing.List[typing.Union[Job, Session]]
+        """
+        paginator = self.list_top_level_items_paginated(
+            name_match=name_match,
+            item_type=item_type,
+            job_type=job_type,
+            provider=provider,
+            target=target,
+            status=status,
+            created_after=created_after,
+            created_before=created_before,
+            orderby_property=orderby_property,
+            is_asc=is_asc
+        )
+
+        result = []
+        async for item_details in paginator:
+            if isinstance(item_details, JobDetails):
+                result.append(Job(self, job_details=item_details))
+            elif isinstance(item_details, SessionDetails):
+                result.append(Session(self, details=item_details))
+            else:
+                raise TypeError("item_details must be of type `SessionDetails` or `JobDetails`.")
+        return result
+
+    async def list_sessions(
+        self,
+        provider: Optional[list[str]]= None,
+        target: Optional[list[str]]= None,
+        status: Optional[list[JobStatus]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        orderby_property: Optional[str] = None,
+        is_asc: Optional[bool] = True
+    ) -> List[Session]:
+        """
+        Get the list of sessions in the given workspace.
+
+        :return: List of Workspace Sessions.
+        :rtype: typing.List[Session]
+        """
+        paginator = self.list_sessions_paginated(
+            provider=provider,
+            target=target,
+            status=status,
+            created_after=created_after,
+            created_before=created_before,
+            orderby_property=orderby_property,
+            is_asc=is_asc)
+
+        return [Session(workspace=self, details=session_details)
+                async for session_details in paginator]
+
+    async def open_session(
+        self,
+        session: Session,
+    ) -> None:
+        """
+        Opens/creates a session in the given workspace.
+
+        :param session:
+            The session to be opened/created.
+        """
+        client = self._get_sessions_client()
+        session.details = await client.open(
+            self.subscription_id,
+            self.resource_group,
+            self.name,
+            session.id,
+            session.details)
+
+    async def close_session(
+        self,
+        session: Session
+    ) -> None:
+        """
+        Closes a session in the given workspace if the
+        session is not in a terminal state.
+        Otherwise, just refreshes the session details.
+
+        :param session:
+            The session to be closed.
+        """
+        client = self._get_sessions_client()
+        if not session.is_in_terminal_state():
+            session.details = await client.close(
+                self.subscription_id,
+                self.resource_group,
+                self.name,
+                session_id=session.id)
+        else:
+            session.details = await client.get(
+                self.subscription_id,
+                self.resource_group,
+                self.name,
+                session_id=session.id)
+
+    async def refresh_session(
+        self,
+        session: Session
+    ) -> None:
+        """
+        Updates the session details with the latest information
+        from the workspace.
+
+        :param session:
+            The session to be refreshed.
+        """
+        session.details = (await self.get_session(session_id=session.id)).details
+
+    async def get_session(
+        self,
+        session_id: str
+    ) -> Session:
+        """
+        Gets a session from the workspace.
+
+        :param session_id:
+            The id of session to be retrieved.
+
+        :return: Azure Quantum Session
+        :rtype: Session
+        """
+        client = self._get_sessions_client()
+        session_details = await client.get(
+            self.subscription_id,
+            self.resource_group,
+            self.name,
+            session_id=session_id)
+        return Session(workspace=self, details=session_details)
+
+    async def list_session_jobs(
+        self,
+        session_id: str,
+        name_match: Optional[str] = None,
+        status: Optional[list[JobStatus]] = None,
+        orderby_property: Optional[str] = None,
+        is_asc: Optional[bool] = True
+    ) -> List[Job]:
+        """
+        Gets all jobs associated with a session.
+
+        :param session_id:
+            The id of session.
+
+        :return: List of all jobs associated with a session.
+        :rtype: typing.List[Job]
+        """
+        paginator = self.list_session_jobs_paginated(
+            session_id=session_id,
+            name_match=name_match,
+            status=status,
+            orderby_property=orderby_property,
+            is_asc=is_asc)
+
+        return [Job(workspace=self, job_details=job_details)
+                async for job_details in paginator]
+
+    async def get_container_uri(
+        self,
+        job_id: Optional[str] = None,
+        container_name: Optional[str] = None,
+        container_name_format: Optional[str] = "job-{job_id}"
+    ) -> str:
+        """
+        Get container URI based on job ID or container name.
+        Creates a new container if it does not yet exist.
+
+        :param job_id:
+            Job ID, defaults to `None`.
+
+        :param container_name:
+            Container name, defaults to `None`.
+
+        :param container_name_format:
+            Container name format, defaults to "job-{job_id}".
+
+        :return: Container URI.
+        :rtype: str
+        """
+        container_name = self._get_container_name(job_id, container_name, container_name_format)
+        if self.storage is None:
+            container_uri = await self._get_linked_storage_sas_uri(
+                container_name
+            )
+        else:
+            signer = self._get_storage_signer()
+            if not signer.is_known_container(container_name):
+                try:
+                    container = await create_container(
+                        self.storage, container_name, self._get_storage_transport()
+                    )
+                    await container.close()
+                except ResourceExistsError:
+                    # Created concurrently
+                    pass
+                signer.add_known_container(container_name)
+            container_uri = signer.get_sas_uri(container_name)
+        return container_uri
+
+    async def close(self) -> None:
+        if self._mgmt_client:
+            self._mgmt_client.close()
+        await self._client.close()
+        await self._shared_transport.close()
+
+    async def __aenter__(self) -> Self:
+        await self._client.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_details: Any) -> None:
+        if self._mgmt_client:
+            self._mgmt_client.close()
+        await self._client.__aexit__(*exc_details)
+        await self._shared_transport.close()
@@ -2,6 +2,8 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 ##
+import asyncio
+import concurrent.futures
 from typing import TYPE_CHECKING, Dict, Optional, Sequence
 
 if TYPE_CHECKING:
@@ -144,6 +146,31 @@ class Job:
             **extra_kwargs,
         )
 
+    def as_future(
+        self,
+        *,
+        param_resolver=None,
+        seed=None,
+    ) -> concurrent.futures.Future:
+        """Return a future of the Cirq result of the job, resolved once
+        the job has completed. See :meth:`azure.quantum.Job.as_future`."""
+        return self._azure_job.as_future(
+            lambda _: self.results(param_resolver=param_resolver, seed=seed)
+        )
+
+    def as_asyncio_future(
+        self,
+        *,
+        param_resolver=None,
+        seed=None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> asyncio.Future:
+        """Return an asyncio future of the Cirq result of the job, resolved once
+        the job has completed. See :meth:`azure.quantum.Job.as_future`."""
+        return asyncio.wrap_future(
+            self.as_future(param_resolver=param_resolver, seed=seed), loop=loop
+        )
+
     def cancel(self):
         """Cancel the given job."""
         self._azure_job.workspace.cancel_job(self._azure_job)
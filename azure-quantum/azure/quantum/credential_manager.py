@@ -0,0 +1,222 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""
+Defines a credential that caches its access tokens, to be shared
+by the workspaces of a process.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from azure.core.credentials import AccessToken
+
+__all__ = ["CredentialManager"]
+
+logger = logging.getLogger(__name__)
+
+# How long before their expiry tokens are refreshed
+DEFAULT_REFRESH_WINDOW_SECS = 300
+
+# Name of the persistent token cache of the default credential
+DEFAULT_CACHE_NAME = "azure-quantum"
+
+_TokenKey = Tuple[Tuple[str, ...], Optional[str], bool]
+
+
+class CredentialManager:
+    """
+    Credential that resolves the credential chain once and caches an access
+    token per scope, so that the workspaces sharing it do not each acquire
+    their own tokens. Pass the same instance as the `credential` of several
+    workspaces, including asynchronous ones.
+
+    Tokens are refreshed proactively once they get within
+    `refresh_window_secs` of their expiry: a single caller refreshes the
+    token while the others keep using the still valid one, which is also
+    used if the refresh fails.
+
+    Without `credential`, a `DefaultAzureCredential` is created on first use.
+    With `persist_tokens`, its tokens are also persisted to an encrypted
+    cache of the operating system user, so that other processes of the user,
+    e.g. a fleet of worker processes authenticated with a service principal,
+    do not acquire them again. The persistent cache is supported by the
+    credentials of the chain that acquire tokens from Microsoft Entra ID,
+    such as the environment and workload identity credentials.
+
+    :param credential:
+        The credential to get tokens from.
+        Defaults to a `DefaultAzureCredential`.
+    :param refresh_window_secs:
+        How long before their expiry tokens are refreshed, in seconds.
+    :param persist_tokens:
+        Persist the tokens of the default credential to an encrypted cache.
+        Ignored if `credential` is given.
+    :param cache_name:
+        Name of the persistent token cache.
+    :param allow_unencrypted_storage:
+        Persist the tokens unencrypted if encryption is not available,
+        e.g. on Linux without libsecret.
+    """
+
+    def __init__(
+        self,
+        credential: Optional[Any] = None,
+        refresh_window_secs: float = DEFAULT_REFRESH_WINDOW_SECS,
+        persist_tokens: bool = False,
+        cache_name: str = DEFAULT_CACHE_NAME,
+        allow_unencrypted_storage: bool = False,
+    ):
+        self._credential = credential
+        self._owns_credential = credential is None
+        self.refresh_window_secs = refresh_window_secs
+        self._persist_tokens = persist_tokens
+        self._cache_name = cache_name
+        self._allow_unencrypted_storage = allow_unencrypted_storage
+        self._tokens: Dict[_TokenKey, AccessToken] = {}
+        self._token_locks: Dict[_TokenKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def credential(self) -> Any:
+        """The credential tokens are acquired from."""
+        with self._lock:
+            if self._credential is None:
+                from azure.identity import DefaultAzureCredential, TokenCachePersistenceOptions
+                kwargs = {}
+                if self._persist_tokens:
+                    kwargs["cache_persistence_options"] = TokenCachePersistenceOptions(
+                        name=self._cache_name,
+                        allow_unencrypted_storage=self._allow_unencrypted_storage,
+                    )
+                self._credential = DefaultAzureCredential(
+                    exclude_interactive_browser_credential=False, **kwargs
+                ) # CodeQL [SM05139] Only used as default fallback. Not used in Azure production service.
+            return self._credential
+
+    def get_token(
+        self,
+        *scopes: str,
+        claims: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        enable_cae: bool = False,
+        **kwargs: Any,
+    ) -> AccessToken:
+        """
+        Returns an access token for the scopes, from the cache if it is
+        not about to expire.
+
+        :param scopes: Scopes the token is requested for.
+        :param claims: Additional claims required in the token, e.g. from a
+            claims challenge. Always requests a new token.
+        :param tenant_id: Optional tenant to include in the token request.
+        :param enable_cae: Request a token that supports Continuous Access Evaluation.
+        :return: The access token.
+        :rtype: AccessToken
+        """
+        key = (tuple(sorted(scopes)), tenant_id, enable_cae)
+        if claims:
+            # Tokens with specific claims are never served from the cache
+            with self._get_token_lock(key):
+                return self._request_token(key, scopes, claims=claims, **kwargs)
+
+        token = self._tokens.get(key)
+        if token is not None and not self._needs_refresh(token):
+            return token
+
+        lock = self._get_token_lock(key)
+        if token is not None and token.expires_on > time.time():
+            # Still valid: refresh it unless another caller already is
+            if not lock.acquire(blocking=False):
+                return token
+            try:
+                token = self._tokens.get(key, token)
+                if not self._needs_refresh(token):
+                    return token
+                return self._request_token(key, scopes, **kwargs)
+            except Exception as e:
+                logger.warning(f"Failed to refresh the access token, using the cached one: {e}")
+                return token
+            finally:
+                lock.release()
+
+        with lock:
+            # Another caller may have acquired a token in the meantime
+            token = self._tokens.get(key)
+            if token is not None and not self._needs_refresh(token):
+                return token
+            return self._request_token(key, scopes, **kwargs)
+
+    def prefetch(self, *scopes: str) -> List[threading.Thread]:
+        """
+        Acquires a token for each of the scopes in the background, e.g. while
+        a workspace is being set up, so that its first request does not wait
+        for the credential chain. Callers requesting a token for a scope
+        being prefetched wait for it instead of acquiring another one.
+
+        :param scopes: Scopes to acquire a token for, one token per scope.
+        :return: The threads acquiring the tokens.
+        :rtype: List[threading.Thread]
+        """
+        def fetch(scope: str):
+            try:
+                self.get_token(scope)
+            except Exception as e:
+                logger.debug(f"Failed to prefetch an access token for {scope}: {e}")
+
+        threads = []
+        for scope in scopes:
+            thread = threading.Thread(
+                target=fetch, args=(scope,), name="CredentialManagerPrefetch", daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    def clear(self) -> None:
+        """Drops the cached tokens, so that new ones are acquired on next use."""
+        self._tokens.clear()
+
+    def close(self) -> None:
+        """Closes the default credential, if it was created."""
+        if not self._owns_credential:
+            return
+        with self._lock:
+            credential, self._credential = self._credential, None
+        if credential is not None:
+            credential.close()
+
+    def __enter__(self) -> "CredentialManager":
+        return self
+
+    def __exit__(self, *exc_details: Any) -> None:
+        self.close()
+
+    def _get_token_lock(self, key: _TokenKey) -> threading.Lock:
+        with self._lock:
+            return self._token_locks.setdefault(key, threading.Lock())
+
+    def _needs_refresh(self, token: AccessToken) -> bool:
+        return token.expires_on - time.time() <= self.refresh_window_secs
+
+    def _request_token(
+        self,
+        key: _TokenKey,
+        scopes: Tuple[str, ...],
+        claims: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AccessToken:
+        _, tenant_id, enable_cae = key
+        if claims:
+            kwargs["claims"] = claims
+        if tenant_id:
+            kwargs["tenant_id"] = tenant_id
+        if enable_cae:
+            kwargs["enable_cae"] = enable_cae
+        token = self.credential.get_token(*scopes, **kwargs)
+        logger.debug("Acquired an access token for %s", ", ".join(scopes))
+        self._tokens[key] = token
+        return token
@@ -5,14 +5,22 @@
 
 """Defines Azure Quantum job model"""
 
-from azure.quantum._client.models import JobDetails
-from .base_job import BaseJob
-from .filtered_job import FilteredJob
-from .job import Job, ContentType
-from .job_failed_with_results_error import JobFailedWithResultsError
-from .workspace_item import WorkspaceItem
-from .workspace_item_factory import WorkspaceItemFactory
-from .session import Session, SessionHost, SessionDetails, SessionStatus, SessionJobFailurePolicy
+import importlib
+from typing import Any, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from azure.quantum._client.models import JobDetails
+    from .base_job import BaseJob
+    from .filtered_job import FilteredJob
+    from .job import Job, ContentType
+    from .input_store import InputStore
+    from .job_failed_with_results_error import JobFailedWithResultsError
+    from .job_watcher import JobWatcher
+    from .results_cache import ResultsCache
+    from .shot_table import ShotTable
+    from .workspace_item import WorkspaceItem
+    from .workspace_item_factory import WorkspaceItemFactory
+    from .session import Session, SessionHost, SessionDetails, SessionStatus, SessionJobFailurePolicy
 
 __all__ = [
     "Job",
@@ -26,5 +34,44 @@ __all__ = [
     "SessionDetails",
     "SessionStatus",
     "SessionJobFailurePolicy",
-    "JobFailedWithResultsError"
-    ]
\ No newline at end of file
+    "InputStore",
+    "JobFailedWithResultsError",
+    "JobWatcher",
+    "ResultsCache",
+    "ShotTable"
+    ]
+
+# Names and the module they are imported from on first use, so that
+# e.g. the storage client and NumPy are only loaded when needed
+_LAZY_ATTRIBUTES = {
+    "JobDetails": "azure.quantum._client.models",
+    "BaseJob": ".base_job",
+    "FilteredJob": ".filtered_job",
+    "Job": ".job",
+    "ContentType": ".job",
+    "InputStore": ".input_store",
+    "JobFailedWithResultsError": ".job_failed_with_results_error",
+    "JobWatcher": ".job_watcher",
+    "ResultsCache": ".results_cache",
+    "ShotTable": ".shot_table",
+    "WorkspaceItem": ".workspace_item",
+    "WorkspaceItemFactory": ".workspace_item_factory",
+    "Session": ".session",
+    "SessionHost": ".session",
+    "SessionDetails": ".session",
+    "SessionStatus": ".session",
+    "SessionJobFailurePolicy": ".session",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
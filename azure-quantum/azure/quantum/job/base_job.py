@@ -4,16 +4,17 @@
 ##
 import abc
 import logging
-import uuid
+import os
 
 from enum import Enum
-from datetime import datetime, timezone, timedelta
-from urllib.parse import urlparse, parse_qs
-from typing import Any, Dict, Optional, TYPE_CHECKING
+from typing import Any, Dict, Iterable, Iterator, Optional, TYPE_CHECKING
+from azure.core.pipeline.transport import HttpTransport
 from azure.storage.blob import BlobClient, BlobProperties
 
-from azure.quantum.storage import upload_blob, download_blob, download_blob_properties, ContainerClient
+from azure.quantum.storage import upload_blob, download_blob, download_blob_chunks, download_blob_mapped, download_blob_properties, ContainerClient
 from azure.quantum._client.models import JobDetails
+from azure.quantum._parallel import map_concurrently
+from azure.quantum.job.job_mixin import JobMixin
 from azure.quantum.job.workspace_item import WorkspaceItem
 
 
@@ -29,7 +30,7 @@ class ContentType(str, Enum):
     json = "application/json"
     text_plain = "text/plain"
 
-class BaseJob(WorkspaceItem):
+class BaseJob(JobMixin, WorkspaceItem):
     # Optionally override these to create a Provider-specific Job subclass
     """
     Base job class with methods to create a job from raw blob data,
@@ -42,32 +43,6 @@ class BaseJob(WorkspaceItem):
     :type details: ItemDetails
     """
 
-    @staticmethod
-    def create_job_id() -> str:
-        """Create a unique id for a new job."""
-        return str(uuid.uuid1())
-
-    @property
-    def details(self) -> JobDetails:
-        """Job details"""
-        return self._details
-
-    @details.setter
-    def details(self, value: JobDetails):
-        self._details = value
-
-    @property
-    def container_name(self):
-        """Job input/output data container name"""
-
-        if self._details.container_uri is None:
-            return  f"job-{self.id}"
-        else:
-            container_uri = self._details.container_uri
-        path = urlparse(container_uri).path
-        container_name = path.split("/")[1]
-        return container_name
-
     @classmethod
     def from_input_data(
         cls,
@@ -87,6 +62,7 @@ class BaseJob(WorkspaceItem):
         session_id: Optional[str] = None,
         priority: Optional[str] = None,
         tags: Optional[list[str]] = None,
+        shared_container_name: Optional[str] = None,
         **kwargs
     ) -> "BaseJob":
         """Create a new Azure Quantum job based on a raw input_data payload.
@@ -97,9 +73,12 @@ class BaseJob(WorkspaceItem):
         :type name: str
         :param target: Azure Quantum target
         :type target: str
-        :param input_data: Raw input data to submit
-        :type input_data: bytes
-        :param blob_name: Input data blob name, defaults to "inputData"
+        :param input_data: Raw input data to submit, or the path of a file,
+            a memoryview or an mmap to upload it from without copying it into memory
+        :type input_data: Union[bytes, os.PathLike, memoryview, mmap.mmap]
+        :param blob_name: Input data blob name, defaults to "inputData".
+            Ignored if the workspace has an `input_store`, which names
+            the blob after the hash of input_data.
         :type blob_name: str
         :param content_type: Content type, e.g. "application/json"
         :type content_type: ContentType
@@ -123,6 +102,11 @@ class BaseJob(WorkspaceItem):
         :type priority: str
         :param tags: Tags for the job.
         :type tags: list[str]
+        :param shared_container_name: Name of a container shared by several jobs,
+            defaults to None. When set, the input and output blobs of the job are
+            stored under a "{job_id}/" prefix in this container, so its SAS URI
+            is requested once and reused by all the jobs.
+        :type shared_container_name: str
         :return: Azure Quantum Job
         :rtype: Job
         """
@@ -130,6 +114,10 @@ class BaseJob(WorkspaceItem):
         if job_id is None:
             job_id = cls.create_job_id()
 
+        if shared_container_name is not None:
+            container_name = shared_container_name
+            blob_name = f"{job_id}/{blob_name}"
+
         # Create container if it does not yet exist
         container_uri = workspace.get_container_uri(
             job_id=job_id,
@@ -137,14 +125,28 @@ class BaseJob(WorkspaceItem):
         )
         logger.debug(f"Container URI: {container_uri}")
 
-        # Upload data to container
-        input_data_uri = cls.upload_input_data(
-            container_uri=container_uri,
-            input_data=input_data,
-            content_type=content_type,
-            blob_name=blob_name,
-            encoding=encoding,
-        )
+        if shared_container_name is not None and "output_data_uri" not in kwargs:
+            kwargs["output_data_uri"] = cls._get_shared_output_data_uri(container_uri, job_id)
+
+        input_store = getattr(workspace, "input_store", None)
+        if input_store is not None:
+            # Reuse the payload if it was already uploaded for another job
+            input_data_uri = input_store.get_input_data_uri(
+                workspace,
+                input_data,
+                content_type=content_type,
+                encoding=encoding,
+            )
+        else:
+            # Upload data to container
+            input_data_uri = cls.upload_input_data(
+                container_uri=container_uri,
+                input_data=input_data,
+                content_type=content_type,
+                blob_name=blob_name,
+                encoding=encoding,
+                transport=workspace._get_storage_transport(),
+            )
 
         # Create and submit job
         return cls.from_storage_uri(
@@ -261,14 +263,16 @@ class BaseJob(WorkspaceItem):
         content_type: Optional[ContentType] = ContentType.json,
         blob_name: str = "inputData",
         encoding: str = "",
-        return_sas_token: bool = False
+        return_sas_token: bool = False,
+        transport: Optional[HttpTransport] = None,
     ) -> str:
         """Upload input data file
 
         :param container_uri: Container URI
         :type container_uri: str
-        :param input_data: Input data in binary format
-        :type input_data: bytes
+        :param input_data: Input data in binary format, or the path of a file,
+            a memoryview or an mmap to upload it from without copying it into memory
+        :type input_data: Union[bytes, os.PathLike, memoryview, mmap.mmap]
         :param content_type: Content type, e.g. "application/json"
         :type content_type: Optional, ContentType
         :param blob_name: Blob name, defaults to "inputData"
@@ -277,11 +281,14 @@ class BaseJob(WorkspaceItem):
         :type encoding: str
         :param return_sas_token: Flag to return SAS token as part of URI, defaults to False
         :type return_sas_token: bool
+        :param transport: HTTP transport to upload through, defaults to a new connection pool
+        :type transport: HttpTransport
         :return: Uploaded data URI
         :rtype: str
         """
         container_client = ContainerClient.from_container_url(
-            container_uri
+            container_uri,
+            **({"transport": transport} if transport is not None else {})
         )
 
         uploaded_blob_uri = upload_blob(
@@ -295,21 +302,52 @@ class BaseJob(WorkspaceItem):
         return uploaded_blob_uri
 
 
-    def download_data(self, blob_uri: str) -> dict:
+    def download_data(self, blob_uri: str, memory_map: bool = False) -> dict:
         """Download file from blob uri
 
         :param blob_uri: Blob URI
         :type blob_uri: str
+        :param memory_map: Download the payload to a temporary file and return
+            a read-only memoryview of the memory-mapped file instead of bytes,
+            so that large payloads do not have to fit in memory, defaults to False
+        :type memory_map: bool
         :return: Payload from blob
         :rtype: dict
         """
         
         blob_uri_with_sas_token = self._get_blob_uri_with_sas_token(blob_uri)
-        payload = download_blob(blob_uri_with_sas_token)
+        if memory_map:
+            return download_blob_mapped(
+                blob_uri_with_sas_token,
+                self.workspace._get_storage_transport(),
+                max_concurrency=self._DOWNLOAD_MAX_CONCURRENCY,
+            )
+        payload = download_blob(
+            blob_uri_with_sas_token,
+            self.workspace._get_storage_transport(),
+            max_concurrency=self._DOWNLOAD_MAX_CONCURRENCY,
+        )
 
         return payload
 
 
+    def download_data_chunks(self, blob_uri: str) -> Iterator[bytes]:
+        """Download file from blob uri as a stream of chunks,
+        without holding the whole payload in memory
+
+        :param blob_uri: Blob URI
+        :type blob_uri: str
+        :return: Iterator of payload chunks
+        :rtype: Iterator[bytes]
+        """
+        blob_uri_with_sas_token = self._get_blob_uri_with_sas_token(blob_uri)
+        return download_blob_chunks(
+            blob_uri_with_sas_token,
+            self.workspace._get_storage_transport(),
+            max_concurrency=self._DOWNLOAD_MAX_CONCURRENCY,
+        )
+
+
     def download_blob_properties(self, blob_uri: str):
         """Download Blob properties
 
@@ -320,7 +358,9 @@ class BaseJob(WorkspaceItem):
         """
 
         blob_uri_with_sas_token = self._get_blob_uri_with_sas_token(blob_uri)
-        return download_blob_properties(blob_uri_with_sas_token)
+        return download_blob_properties(
+            blob_uri_with_sas_token, self.workspace._get_storage_transport()
+        )
 
 
     def upload_attachment(
@@ -377,14 +417,7 @@ class BaseJob(WorkspaceItem):
         :rtype: bytes
         """
 
-        # Use Job's default container if not specified
-        if container_uri is None:
-            if self._details.container_uri is None:
-                container_uri = self.workspace.get_container_uri(job_id=self.id)
-            else:
-                container_uri = self._details.container_uri
-        
-        container_client = ContainerClient.from_container_url(container_uri)
+        container_client = self._get_attachments_container_client(container_uri)
         blob_client = container_client.get_blob_client(name)
         response = blob_client.download_blob().readall()
         return response
@@ -400,15 +433,142 @@ class BaseJob(WorkspaceItem):
         """
 
         # Use the job's linked storage container.
-        if self._details.container_uri is None:
-            container_uri = self.workspace.get_container_uri(job_id=self.id)
-        else:
-            container_uri = self._details.container_uri
-
-        container_client = ContainerClient.from_container_url(container_uri)
+        container_client = self._get_attachments_container_client()
         return list(container_client.list_blobs())
 
 
+    def upload_attachments(
+        self,
+        attachments: Dict[str, Any],
+        container_uri: str = None,
+        content_type: Optional[ContentType] = ContentType.json,
+        encoding: str = "",
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """Uploads several attachments to the job's container concurrently,
+        through a single container client. See :meth:`upload_attachment`.
+
+        :param attachments: Data of each attachment, by name. Data can also be
+            the path of a file, which is streamed from disk.
+        :type attachments: Dict[str, Union[bytes, os.PathLike]]
+        :param container_uri: Container URI, defaults to the job's linked container.
+        :type container_uri: str
+        :param content_type: Content type of the attachments, defaults to "application/json"
+        :type content_type: Optional, ContentType
+        :param encoding: Encoding of the attachments, e.g. "gzip", defaults to ""
+        :type encoding: str
+        :param max_workers: Maximum number of concurrent uploads, defaults to 8
+        :type max_workers: int
+
+        :return: Uploaded data URI of each attachment, by name
+        :rtype: Dict[str, str]
+        """
+        container_client = self._get_attachments_container_client(container_uri)
+
+        def _upload(item):
+            name, data = item
+            return upload_blob(
+                container_client,
+                name,
+                content_type,
+                encoding,
+                data,
+                return_sas_token=False,
+            )
+
+        items = list(attachments.items())
+        uris = map_concurrently(_upload, items, max_workers=max_workers)
+        return {name: uri for (name, _), uri in zip(items, uris)}
+
+    def download_attachments(
+        self,
+        names: Iterable[str],
+        container_uri: str = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, bytes]:
+        """Downloads several attachments from the job's container concurrently,
+        through a single container client. See :meth:`download_attachment`.
+
+        :param names: Attachment names
+        :type names: Iterable[str]
+        :param container_uri: Container URI, defaults to the job's linked container.
+        :type container_uri: str
+        :param max_workers: Maximum number of concurrent downloads, defaults to 8
+        :type max_workers: int
+
+        :return: Data of each attachment, by name
+        :rtype: Dict[str, bytes]
+        """
+        container_client = self._get_attachments_container_client(container_uri)
+
+        def _download(name):
+            return container_client.get_blob_client(name).download_blob().readall()
+
+        names = list(names)
+        data = map_concurrently(_download, names, max_workers=max_workers)
+        return dict(zip(names, data))
+
+    def download_all_attachments(
+        self,
+        dest_dir: str,
+        container_uri: str = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """Downloads all the attachments of the job's container to files in a
+        local directory, concurrently. Each attachment is streamed to its file
+        rather than held in memory. Attachment names containing "/" are
+        downloaded to subdirectories.
+
+        :param dest_dir: Directory to download the attachments to, created if needed
+        :type dest_dir: str
+        :param container_uri: Container URI, defaults to the job's linked container.
+        :type container_uri: str
+        :param max_workers: Maximum number of concurrent downloads, defaults to 8
+        :type max_workers: int
+
+        :return: Path of the file of each attachment, by name
+        :rtype: Dict[str, str]
+        """
+        container_client = self._get_attachments_container_client(container_uri)
+        dest_dir = os.path.abspath(dest_dir)
+        paths = {}
+        for blob in container_client.list_blobs():
+            path = os.path.abspath(os.path.join(dest_dir, *blob.name.split("/")))
+            if os.path.commonpath([dest_dir, path]) != dest_dir:
+                raise ValueError(
+                    f"Attachment '{blob.name}' can not be downloaded outside of '{dest_dir}'."
+                )
+            paths[blob.name] = path
+
+        def _download(item):
+            name, path = item
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                container_client.get_blob_client(name).download_blob().readinto(f)
+
+        map_concurrently(_download, list(paths.items()), max_workers=max_workers)
+        return paths
+
+    def _get_attachments_container_client(self, container_uri: str = None) -> ContainerClient:
+        """Get a client of the container attachments are stored in,
+        defaulting to the job's linked container.
+        Unlike the input and output data, attachments can be accessed with
+        a SAS URI by a job created without a workspace, so the client has
+        its own connections instead of those of the workspace.
+        :param container_uri: Container URI
+        :type container_uri: str
+        :return: Container client
+        :rtype: ContainerClient
+        """
+        if container_uri is None:
+            if self._details.container_uri is None:
+                container_uri = self.workspace.get_container_uri(job_id=self.id)
+            else:
+                container_uri = self._details.container_uri
+        return ContainerClient.from_container_url(
+            container_uri
+        )
+
     def _get_blob_uri_with_sas_token(self, blob_uri: str) -> str:
         """Get Blob URI with SAS-token if one was not specified in blob_uri parameter
         :param blob_uri: Blob URI
@@ -416,27 +576,7 @@ class BaseJob(WorkspaceItem):
         :return: Blob URI with SAS-token
         :rtype: str
         """
-        url = urlparse(blob_uri)
-        query_params = parse_qs(url.query)
-        token_expire_query_param = query_params.get("se")
-
-        token_expire_time = None
-
-        if token_expire_query_param is not None:
-            token_expire_time_str = token_expire_query_param[0]
-
-            # Since python < 3.11 can not easily parse Z suffixed UTC timestamp and 
-            # assuming that the timestamp is always UTC, we replace that suffix with UTC offset.
-            token_expire_time = datetime.fromisoformat(
-                token_expire_time_str.replace('Z', '+00:00')
-            )
-            
-            # Make an expiration time a little earlier, so there's no case where token is
-            # used a second or so before of its expiration.
-            token_expire_time = token_expire_time - timedelta(minutes=5)
-
-        current_utc_time = datetime.now(tz=timezone.utc)
-        if token_expire_time is None or current_utc_time >= token_expire_time:
+        if not self._has_valid_sas_token(blob_uri):
             # blob_uri does not contains SAS token or it is expired,
             # get sas url from service
             blob_client = BlobClient.from_blob_url(
@@ -446,4 +586,4 @@ class BaseJob(WorkspaceItem):
                 blob_client.container_name, blob_client.blob_name
             )
 
-        return blob_uri
\ No newline at end of file
+        return blob_uri
@@ -0,0 +1,192 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""Defines a content-addressed store of job input data"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from azure.core.exceptions import ResourceExistsError
+from azure.quantum.storage import ContainerClient, remove_sas_token, upload_blob
+
+if TYPE_CHECKING:
+    from azure.quantum.workspace import Workspace
+
+__all__ = ["InputStore"]
+
+logger = logging.getLogger(__name__)
+
+# Size of the slices files are read in to be hashed
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# How long a payload found in the container is trusted to still be there
+DEFAULT_TTL_SECS = 24 * 60 * 60.0
+
+
+class InputStore:
+    """Content-addressed store of job input data, so that a payload submitted
+    several times, e.g. with different input parameters, is uploaded once.
+
+    Each payload is stored in a container shared by all jobs, under
+    a blob named after the SHA-256 hash of its content, content type and
+    encoding. The URIs of the blobs known to exist are kept in a local index,
+    optionally persisted to a file, so that repeated submissions do not even
+    check the container.
+
+    Each URI is trusted for `ttl_secs` after the blob was last found or
+    uploaded, then the container is checked again and the payload uploaded
+    again if it is missing. A blob deleted from the container in the meantime,
+    e.g. by a lifecycle management policy, makes the jobs submitted with it
+    fail: call :meth:`clear` after deleting blobs from the container.
+
+    Enable it for a workspace with `workspace.input_store = InputStore()`.
+
+    :param container_name: Name of the container to store payloads in,
+        defaults to "job-inputs"
+    :type container_name: str
+    :param index_path: Optional file to persist the index in, defaults to None
+    :type index_path: str
+    :param ttl_secs: How long a blob of the index is trusted to exist
+        without checking the container, defaults to one day
+    :type ttl_secs: float
+    """
+
+    BLOB_PREFIX = "sha256/"
+
+    def __init__(
+        self,
+        container_name: str = "job-inputs",
+        index_path: Optional[str] = None,
+        ttl_secs: float = DEFAULT_TTL_SECS,
+    ):
+        self._container_name = container_name
+        self._index_path = index_path
+        self.ttl_secs = ttl_secs
+        self._lock = threading.Lock()
+        # Time each blob was last found or uploaded, by URI
+        self._known_uris: Dict[str, float] = {}
+        if index_path is not None and os.path.isfile(index_path):
+            with open(index_path, "r", encoding="utf-8") as f:
+                self._known_uris = json.load(f)
+
+    @property
+    def container_name(self) -> str:
+        """Name of the container payloads are stored in"""
+        return self._container_name
+
+    @staticmethod
+    def get_content_hash(
+        input_data: Any,
+        content_type: Optional[str] = None,
+        encoding: str = "",
+    ) -> str:
+        """Get the hash a payload is stored under.
+
+        :param input_data: Payload, as bytes, a buffer or the path of a file
+        :type input_data: Union[bytes, os.PathLike, memoryview, mmap.mmap]
+        :param content_type: Content type of the payload
+        :type content_type: str
+        :param encoding: Content encoding of the payload
+        :type encoding: str
+        :return: Hexadecimal SHA-256 hash
+        :rtype: str
+        """
+        digest = hashlib.sha256()
+        # The content settings are part of the blob, so payloads with
+        # different settings are stored separately
+        digest.update(f"{content_type or ''}\0{encoding or ''}\0".encode())
+        if isinstance(input_data, os.PathLike):
+            with open(input_data, "rb") as f:
+                for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+        else:
+            if isinstance(input_data, str):
+                input_data = input_data.encode("utf-8")
+            digest.update(input_data)
+        return digest.hexdigest()
+
+    def get_input_data_uri(
+        self,
+        workspace: "Workspace",
+        input_data: Any,
+        content_type: Optional[str] = None,
+        encoding: str = "",
+    ) -> str:
+        """Get the URI of a payload in the store, uploading it
+        if it is not stored yet.
+
+        :param workspace: Workspace whose storage the payload is stored in
+        :type workspace: Workspace
+        :param input_data: Payload, as bytes, a buffer or the path of a file
+        :type input_data: Union[bytes, os.PathLike, memoryview, mmap.mmap]
+        :param content_type: Content type of the payload
+        :type content_type: str
+        :param encoding: Content encoding of the payload
+        :type encoding: str
+        :return: Blob URI of the payload, without SAS token
+        :rtype: str
+        """
+        blob_name = self.BLOB_PREFIX + self.get_content_hash(input_data, content_type, encoding)
+        container_uri = workspace.get_container_uri(container_name=self._container_name)
+        uri = f"{remove_sas_token(container_uri)}/{blob_name}"
+        with self._lock:
+            checked = self._known_uris.get(uri)
+        if checked is not None and time.time() - checked < self.ttl_secs:
+            logger.debug(f"Reusing input data {uri}")
+            return uri
+
+        container_client = ContainerClient.from_container_url(
+            container_uri, transport=workspace._get_storage_transport()
+        )
+        blob_client = container_client.get_blob_client(blob_name)
+        if blob_client.exists():
+            logger.debug(f"Input data {uri} is already stored")
+        else:
+            try:
+                upload_blob(
+                    container_client,
+                    blob_name,
+                    content_type,
+                    encoding,
+                    input_data,
+                    return_sas_token=False,
+                )
+            except ResourceExistsError:
+                # Uploaded concurrently by another submission
+                pass
+        self._add(uri)
+        return uri
+
+    def _add(self, uri: str) -> None:
+        with self._lock:
+            self._known_uris[uri] = time.time()
+            if self._index_path is None:
+                return
+            directory = os.path.dirname(os.path.abspath(self._index_path))
+            os.makedirs(directory, exist_ok=True)
+            # Write to a temporary file first so that a concurrent reader
+            # or an interrupted write never leaves a truncated index behind
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self._known_uris, f, sort_keys=True)
+                os.replace(tmp_path, self._index_path)
+            except OSError as e:
+                logger.warning(f"Failed to persist the input store index: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def clear(self) -> None:
+        """Forget the known payloads, so that they are checked
+        again in the container on their next submission."""
+        with self._lock:
+            self._known_uris.clear()
+            if self._index_path is not None and os.path.isfile(self._index_path):
+                os.remove(self._index_path)
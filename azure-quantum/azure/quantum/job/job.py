@@ -4,16 +4,16 @@
 ##
 
 
+import asyncio
+import concurrent.futures
 import logging
 import time
-import json
 
-from typing import TYPE_CHECKING, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Union
 
 from azure.quantum._client.models import JobDetails
 from azure.quantum.job.job_failed_with_results_error import JobFailedWithResultsError
 from azure.quantum.job.base_job import BaseJob, ContentType, DEFAULT_TIMEOUT
-from azure.quantum.job.filtered_job import FilteredJob
 
 __all__ = ["Job", "JobDetails"]
 
@@ -22,12 +22,13 @@ logger = logging.getLogger(__name__)
 if TYPE_CHECKING:
     from azure.quantum.workspace import Workspace
     from azure.quantum._client.models import Priority
+    from azure.quantum._compression import CompressionStats
 
 
 _log = logging.getLogger(__name__)
 
 
-class Job(BaseJob, FilteredJob):
+class Job(BaseJob):
     """Azure Quantum Job that is submitted to a given Workspace.
 
     :param workspace: Workspace instance to submit job to
@@ -37,10 +38,10 @@ class Job(BaseJob, FilteredJob):
     :type job_details: JobDetails
     """
 
-    _default_poll_wait = 0.2
-
     def __init__(self, workspace: "Workspace", job_details: JobDetails, **kwargs):
         self.results = None
+        # Size and time of the compression of the input data, set by Target.submit
+        self.compression_stats: Optional["CompressionStats"] = None
         super().__init__(
             workspace=workspace,
             details=job_details,
@@ -91,22 +92,6 @@ class Job(BaseJob, FilteredJob):
         self.details = updated.details
         return self
 
-    def has_completed(self) -> bool:
-        """Check if the job has completed."""
-        return (
-            self.details.status == "Completed"
-            or self.details.status == "Succeeded"
-            or self.details.status == "Failed"
-            or self.details.status == "Cancelled"
-        )
-    
-    def has_succeeded(self) -> bool:
-        """Check if the job has succeeded."""
-        return (
-            self.details.status == "Completed"
-            or self.details.status == "Succeeded"
-        )
-
     def wait_until_completed(
         self,
         max_poll_wait_secs=30,
@@ -145,6 +130,48 @@ class Job(BaseJob, FilteredJob):
                 else poll_wait * 1.5
             )
 
+    def as_future(
+        self,
+        get_results: Optional[Callable[["Job"], Any]] = None,
+    ) -> concurrent.futures.Future:
+        """Returns a future that resolves to the results of the job
+        once it has completed, to use with `concurrent.futures.wait`,
+        `concurrent.futures.as_completed` and other executor-based code.
+
+        The job is polled by the job watcher of its workspace,
+        see :class:`azure.quantum.job.JobWatcher`, rather than
+        by a thread per future. Cancelling the future stops watching
+        the job, but does not cancel the job itself.
+
+        :param get_results: Function called with the completed job
+            that returns its results, defaults to :meth:`get_results`
+        :type get_results: Callable[[Job], Any]
+        :return: Future of the results of the job
+        :rtype: concurrent.futures.Future
+        """
+        if get_results is None:
+            get_results = lambda job: job.get_results()
+        return self.workspace.job_watcher.watch_results(self, get_results)
+
+    def as_asyncio_future(
+        self,
+        get_results: Optional[Callable[["Job"], Any]] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> asyncio.Future:
+        """Returns an asyncio future that resolves to the results of the job
+        once it has completed, to use with `asyncio.gather` and `asyncio.wait`.
+        See :meth:`as_future`.
+
+        :param get_results: Function called with the completed job
+            that returns its results, defaults to :meth:`get_results`
+        :type get_results: Callable[[Job], Any]
+        :param loop: Event loop of the future, defaults to the current event loop
+        :type loop: asyncio.AbstractEventLoop
+        :return: Future of the results of the job
+        :rtype: asyncio.Future
+        """
+        return asyncio.wrap_future(self.as_future(get_results), loop=loop)
+
     def get_results(self, timeout_secs: float = DEFAULT_TIMEOUT):
         """Get job results by downloading the results blob from the
         storage container linked via the workspace.
@@ -164,67 +191,7 @@ class Job(BaseJob, FilteredJob):
         if self.results is not None:
             return self.results
 
-        if not self.has_completed():
-            self.wait_until_completed(timeout_secs=timeout_secs)
-
-        if not self.has_succeeded():
-            if self.details.status == "Failed" and self._allow_failure_results():
-                job_blob_properties = self.download_blob_properties(self.details.output_data_uri)
-                if job_blob_properties.size > 0:
-                    job_failure_data = self.download_data(self.details.output_data_uri)
-                    raise JobFailedWithResultsError("An error occurred during job execution.", job_failure_data)
-
-            raise RuntimeError(
-                f'{"Cannot retrieve results as job execution failed"}'
-                + f"(status: {self.details.status}."
-                + f"error: {self.details.error_data})"
-            )
-
-        payload = self.download_data(self.details.output_data_uri)
-        try:
-            payload = payload.decode("utf8")
-            results = json.loads(payload)
-
-            if self.details.output_data_format == "microsoft.quantum-results.v1":
-                if "Histogram" not in results:
-                    raise ValueError(f"\"Histogram\" array was expected to be in the Job results for \"{self.details.output_data_format}\" output format.")
-                
-                histogram_values = results["Histogram"]
-
-                if len(histogram_values) % 2 == 0:
-                    # Re-mapping {'Histogram': ['[0]', 0.50, '[1]', 0.50] } to {'[0]': 0.50, '[1]': 0.50}
-                    return {histogram_values[i]: histogram_values[i + 1] for i in range(0, len(histogram_values), 2)}
-                else: 
-                    raise ValueError(f"\"Histogram\" array has invalid format. Even number of items is expected.")
-            elif self.details.output_data_format == "microsoft.quantum-results.v2":
-                if "DataFormat" not in results or results["DataFormat"] != "microsoft.quantum-results.v2":
-                    raise ValueError(f"\"DataFormat\" was expected to be \"microsoft.quantum-results.v2\" in the Job results for \"{self.details.output_data_format}\" output format.")
-
-                if "Results" not in results:
-                    raise ValueError(f"\"Results\" field was expected to be in the Job results for \"{self.details.output_data_format}\" output format.")
-                
-                if len(results["Results"]) < 1:
-                    raise ValueError("\"Results\" array was expected to contain at least one item")
-                
-                results = results["Results"][0]
-
-                if "Histogram" not in results:
-                    raise ValueError(f"\"Histogram\" array was expected to be in the Job results for \"{self.details.output_data_format}\" output format.")
-
-                if "Shots" not in results:
-                    raise ValueError(f"\"Shots\" array was expected to be in the Job results for \"{self.details.output_data_format}\" output format.")
-
-                histogram_values = results["Histogram"]
-
-                total_count = len(results["Shots"])
-
-                # Re-mapping object {'Histogram': [{"Outcome": [0], "Display": '[0]', "Count": 500}, {"Outcome": [1], "Display": '[1]', "Count": 500}]} to {'[0]': 0.50, '[1]': 0.50}
-                return {outcome["Display"]: outcome["Count"] / total_count for outcome in histogram_values}
-            
-            return results
-        except:
-            # If errors decoding the data, return the raw payload:
-            return payload
+        return self._get_parsed_results("results", self._parse_results, timeout_secs)
 
     def get_results_histogram(self, timeout_secs: float = DEFAULT_TIMEOUT):
         """Get job results histogram by downloading the results blob from the storage container linked via the workspace.
@@ -244,71 +211,9 @@ class Job(BaseJob, FilteredJob):
         if self.results is not None:
             return self.results
 
-        if not self.has_completed():
-            self.wait_until_completed(timeout_secs=timeout_secs)
-
-        if not self.has_succeeded():
-            if self.details.status == "Failed" and self._allow_failure_results():
-                job_blob_properties = self.download_blob_properties(self.details.output_data_uri)
-                if job_blob_properties.size > 0:
-                    job_failure_data = self.download_data(self.details.output_data_uri)
-                    raise JobFailedWithResultsError("An error occurred during job execution.", job_failure_data)
-
-            raise RuntimeError(
-                f'{"Cannot retrieve results as job execution failed"}'
-                + f"(status: {self.details.status}."
-                + f"error: {self.details.error_data})"
-            )
-
-        payload = self.download_data(self.details.output_data_uri)
-        try:
-            payload = payload.decode("utf8")
-            results = json.loads(payload)
-
-            if self.details.output_data_format == "microsoft.quantum-results.v2":
-                if "DataFormat" not in results or results["DataFormat"] != "microsoft.quantum-results.v2":
-                    raise ValueError(f"\"DataFormat\" was expected to be \"microsoft.quantum-results.v2\" in the Job results for \"{self.details.output_data_format}\" output format.")
-                if "Results" not in results:
-                    raise ValueError(f"\"Results\" field was expected to be in the Job results for \"{self.details.output_data_format}\" output format.")
-                
-                if len(results["Results"]) < 1:
-                    raise ValueError("\"Results\" array was expected to contain at least one item")
-                
-                results = results["Results"]
-
-                if len(results) == 1: 
-                    results = results[0]
-                    if "Histogram" not in results:
-                        raise ValueError(f"\"Histogram\" array was expected to be in the Job results for \"{self.details.output_data_format}\" output format.")
+        return self._get_parsed_results("histogram", self._parse_results_histogram, timeout_secs)
 
-                    histogram_values = results["Histogram"]
-                    outcome_keys = self._process_outcome(histogram_values)
-
-                    # Re-mapping object {'Histogram': [{"Outcome": [0], "Display": '[0]', "Count": 500}, {"Outcome": [1], "Display": '[1]', "Count": 500}]} to {'[0]': {"Outcome": [0], "Count": 500}, '[1]': {"Outcome": [1], "Count": 500}}
-                    return {hist_val["Display"]: {"outcome": outcome, "count": hist_val["Count"]} for outcome, hist_val in zip(outcome_keys, histogram_values)}
-
-                else:
-                    # This is handling the BatchResults edge case
-                    resultsArray = []
-                    for i, result in enumerate(results):
-                        if "Histogram" not in result:
-                            raise ValueError(f"\"Histogram\" array was expected to be in the Job results for result {i} for \"{self.details.output_data_format}\" output format.")
-
-                        histogram_values = result["Histogram"]
-                        outcome_keys = self._process_outcome(histogram_values)
-
-                        # Re-mapping object {'Histogram': [{"Outcome": [0], "Display": '[0]', "Count": 500}, {"Outcome": [1], "Display": '[1]', "Count": 500}]} to {'[0]': {"Outcome": [0], "Count": 500}, '[1]': {"Outcome": [1], "Count": 500}}
-                        resultsArray.append({hist_val["Display"]: {"outcome": outcome, "count": hist_val["Count"]} for outcome, hist_val in zip(outcome_keys, histogram_values)})
-
-                    return resultsArray
-
-            else:
-                raise ValueError(f"Getting a results histogram with counts instead of probabilities is not a supported feature for jobs using the \"{self.details.output_data_format}\" output format.")
-
-        except Exception as e:
-            raise e
-
-    def get_results_shots(self, timeout_secs: float = DEFAULT_TIMEOUT):
+    def get_results_shots(self, timeout_secs: float = DEFAULT_TIMEOUT, format: str = "list"):
         """Get job results per shot data by downloading the results blob from the
         storage container linked via the workspace.
         
@@ -321,92 +226,83 @@ class Job(BaseJob, FilteredJob):
 
         :param timeout_secs: Timeout in seconds, defaults to 300
         :type timeout_secs: float
+        :param format: "list" to return the shots as Python lists and tuples, or
+            "array" to return them as a NumPy-backed :class:`~azure.quantum.job.ShotTable`
+            (only for shots made of lists of bits), defaults to "list"
+        :type format: str
         :return: Results dictionary with histogram shots, or raw results if not a json object.
         :rtype: typing.Any
         """
+        if format == "array":
+            return self._get_parsed_results("shot_table", self._parse_results_shot_table, timeout_secs)
+        if format != "list":
+            raise ValueError(f"Unsupported shots format \"{format}\", expected \"list\" or \"array\".")
+
         if self.results is not None:
             return self.results
 
+        return self._get_parsed_results("shots", self._parse_results_shots, timeout_secs)
+
+    def _get_results_histogram_and_shots(self, timeout_secs: float = DEFAULT_TIMEOUT):
+        """Get the results histogram and the per shot data of the job, as returned by
+        `get_results_histogram` and `get_results_shots`, from a single download
+        and parse of the results blob.
+
+        :param timeout_secs: Timeout in seconds, defaults to 300
+        :type timeout_secs: float
+        :return: The results histogram and the results shots.
+        :rtype: typing.Tuple[typing.Any, typing.Any]
+        """
+        if self.results is not None:
+            return self.results, self.results
+
+        return self._get_parsed_results(
+            "histogram_and_shots", self._parse_results_histogram_and_shots, timeout_secs
+        )
+
+    def _get_parsed_results(self, kind: str, parse, timeout_secs: float):
+        """Waits for the job to succeed and returns its results parsed with `parse`,
+        going through the results cache of the workspace if it has one."""
         if not self.has_completed():
             self.wait_until_completed(timeout_secs=timeout_secs)
 
         if not self.has_succeeded():
-            if self.details.status == "Failed" and self._allow_failure_results():
-                job_blob_properties = self.download_blob_properties(self.details.output_data_uri)
-                if job_blob_properties.size > 0:
-                    job_failure_data = self.download_data(self.details.output_data_uri)
-                    raise JobFailedWithResultsError("An error occurred during job execution.", job_failure_data)
-
-            raise RuntimeError(
-                f'{"Cannot retrieve results as job execution failed"}'
-                + f"(status: {self.details.status}."
-                + f"error: {self.details.error_data})"
-            )
+            self._raise_for_failed_job()
+
+        output_data_uri = self.details.output_data_uri
+        # Parse the v2 format while it is downloaded
+        streamed = self._is_streamed_result(kind)
+        cache = self._get_results_cache()
+        if cache is None:
+            if streamed:
+                return parse(self.download_data_chunks(output_data_uri))
+            return parse(self.download_data(output_data_uri))
+
+        etag = self.download_blob_properties(output_data_uri).etag
+        results = cache.get_parsed(self.id, output_data_uri, etag, kind)
+        if results is not None:
+            return results
 
-        payload = self.download_data(self.details.output_data_uri)
-        try:
-            payload = payload.decode("utf8")
-            results = json.loads(payload)
-
-            if self.details.output_data_format == "microsoft.quantum-results.v2":
-                if "DataFormat" not in results or results["DataFormat"] != "microsoft.quantum-results.v2":
-                    raise ValueError(f"\"DataFormat\" was expected to be \"microsoft.quantum-results.v2\" in the Job results for \"{self.details.output_data_format}\" output format.")
-                if "Results" not in results:
-                    raise ValueError(f"\"Results\" field was expected to be in the Job results for \"{self.details.output_data_format}\" output format.")
-
-                results = results["Results"]
-
-                if len(results) < 1:
-                    raise ValueError("\"Results\" array was expected to contain at least one item")
-
-                if len(results) == 1: 
-                    result = results[0]
-                    if "Shots" not in result:
-                        raise ValueError(f"\"Shots\" array was expected to be in the Job results for \"{self.details.output_data_format}\" output format.")
-                    
-                    return [self._convert_tuples(shot) for shot in result["Shots"]]
-                else:
-                    # This is handling the BatchResults edge case
-                    shotsArray = []
-                    for i, result in enumerate(results):
-                        if "Shots" not in result:
-                            raise ValueError(f"\"Shots\" array was expected to be in the Job results for result {i} of \"{self.details.output_data_format}\" output format.")
-                        shotsArray.append([self._convert_tuples(shot) for shot in result["Shots"]])
-                    
-                    return shotsArray
-            else:   
-                raise ValueError(f"Individual shot results are not supported for jobs using the \"{self.details.output_data_format}\" output format.")
-        except Exception as e:
-            raise e
-
-    def _process_outcome(self, histogram_results):
-        return [self._convert_tuples(v['Outcome']) for v in histogram_results]
-
-    def _convert_tuples(self, data):
-        if isinstance(data, dict):
-            if "Error" in data:
-                return data
-            # Check if the dictionary represents a tuple
-            elif all(isinstance(k, str) and k.startswith("Item") for k in data.keys()):
-                # Convert the dictionary to a tuple
-                return tuple(self._convert_tuples(data[f"Item{i+1}"]) for i in range(len(data)))
-            else:
-                raise ValueError("Malformed tuple output")
-        elif isinstance(data, list):
-            # Recursively process list elements
-            return [self._convert_tuples(item) for item in data]
+        payload = cache.get_payload(self.id, output_data_uri, etag)
+        if payload is not None:
+            results = parse(payload)
+        elif streamed:
+            chunks = self.download_data_chunks(output_data_uri)
+            results = parse(cache.persist_chunks(self.id, output_data_uri, etag, chunks))
         else:
-            # Return the data as is (int, string, etc.)
-            return data
-
-    @classmethod
-    def _allow_failure_results(cls) -> bool: 
-        """
-        Allow to download job results even if the Job status is "Failed".
-
-        This method can be overridden in derived classes to alter the default
-        behaviour.
-
-        The default is False.
-        """
-        return False
\ No newline at end of file
+            payload = self.download_data(output_data_uri)
+            cache.set_payload(self.id, output_data_uri, etag, payload)
+            results = parse(payload)
+        cache.set_parsed(self.id, output_data_uri, etag, kind, results)
+        return results
+
+    def _raise_for_failed_job(self):
+        """Raises the error for a job that did not succeed, downloading
+        the failure results first if the job class allows it."""
+        if self.details.status == "Failed" and self._allow_failure_results():
+            job_blob_properties = self.download_blob_properties(self.details.output_data_uri)
+            if job_blob_properties.size > 0:
+                job_failure_data = self.download_data(self.details.output_data_uri)
+                raise JobFailedWithResultsError("An error occurred during job execution.", job_failure_data)
+
+        raise self._job_failed_error()
@@ -0,0 +1,275 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+import json
+import uuid
+
+from urllib.parse import urlparse
+from typing import TYPE_CHECKING, Optional
+
+from azure.quantum._client.models import JobDetails
+from azure.quantum._parallel import DEFAULT_MAX_WORKERS
+from azure.quantum._sas_uri_cache import is_sas_uri_valid
+from azure.quantum.job.filtered_job import FilteredJob
+from azure.quantum.job.results_v2_parser import collect_fields_v2, collect_results_v2, iter_payload_chunks, iter_results_v2
+
+__all__ = ["JobMixin"]
+
+if TYPE_CHECKING:
+    from azure.quantum.job.results_cache import ResultsCache
+
+
+class JobMixin(FilteredJob):
+    """
+    Mixin with the methods of a job that do not call the service
+    or the storage: its details, status and the parsing of its results.
+    Shared by :class:`azure.quantum.job.Job` and :class:`azure.quantum.aio.Job`,
+    which download the results synchronously or as coroutines.
+    """
+
+    # Maximum number of ranges of an output blob downloaded at a time.
+    # Blobs that fit in one range are downloaded with a single request.
+    _DOWNLOAD_MAX_CONCURRENCY = DEFAULT_MAX_WORKERS
+
+    @staticmethod
+    def create_job_id() -> str:
+        """Create a unique id for a new job."""
+        return str(uuid.uuid1())
+
+    @property
+    def details(self) -> JobDetails:
+        """Job details"""
+        return self._details
+
+    @details.setter
+    def details(self, value: JobDetails):
+        self._details = value
+
+    @property
+    def container_name(self):
+        """Job input/output data container name"""
+
+        if self._details.container_uri is None:
+            return  f"job-{self.id}"
+        else:
+            container_uri = self._details.container_uri
+        path = urlparse(container_uri).path
+        container_name = path.split("/")[1]
+        return container_name
+
+    _default_poll_wait = 0.2
+
+    # Kinds of results that are parsed from the v2 format while it is downloaded
+    _STREAMED_RESULT_KINDS = ("histogram", "shots", "histogram_and_shots", "shot_table")
+
+    @staticmethod
+    def _get_shared_output_data_uri(container_uri: str, job_id: str) -> str:
+        """Get the output data URI of a job stored in a shared container,
+        signed with the SAS token of the container URI
+        :param container_uri: Shared container URI
+        :type container_uri: str
+        :param job_id: Job ID
+        :type job_id: str
+        :return: Output data URI
+        :rtype: str
+        """
+        url = urlparse(container_uri)
+        return url._replace(path=f"{url.path}/{job_id}/rawOutputData").geturl()
+
+    @staticmethod
+    def _has_valid_sas_token(blob_uri: str) -> bool:
+        """Check if the blob URI carries a SAS-token that is not about to expire
+        :param blob_uri: Blob URI
+        :type blob_uri: str
+        :return: True if the SAS-token can still be used
+        :rtype: bool
+        """
+        return is_sas_uri_valid(blob_uri)
+
+    def has_completed(self) -> bool:
+        """Check if the job has completed."""
+        return (
+            self.details.status == "Completed"
+            or self.details.status == "Succeeded"
+            or self.details.status == "Failed"
+            or self.details.status == "Cancelled"
+        )
+    
+    def has_succeeded(self) -> bool:
+        """Check if the job has succeeded."""
+        return (
+            self.details.status == "Completed"
+            or self.details.status == "Succeeded"
+        )
+
+    def _is_streamed_result(self, kind: str) -> bool:
+        """Check if the results of the given kind can be parsed
+        from the v2 format while it is downloaded."""
+        return kind in self._STREAMED_RESULT_KINDS \
+            and self.details.output_data_format == "microsoft.quantum-results.v2"
+
+    def _get_results_cache(self) -> Optional["ResultsCache"]:
+        return getattr(self.workspace, "results_cache", None)
+
+    def _job_failed_error(self) -> RuntimeError:
+        return RuntimeError(
+            f'{"Cannot retrieve results as job execution failed"}'
+            + f"(status: {self.details.status}."
+            + f"error: {self.details.error_data})"
+        )
+
+    def _parse_results(self, payload):
+        """Parses the downloaded output payload as returned by `get_results`."""
+        try:
+            if self.details.output_data_format == "microsoft.quantum-results.v2":
+                return self._parse_results_probabilities_v2(payload)
+
+            payload = payload.decode("utf8")
+            results = json.loads(payload)
+
+            if self.details.output_data_format == "microsoft.quantum-results.v1":
+                if "Histogram" not in results:
+                    raise ValueError(f"\"Histogram\" array was expected to be in the Job results for \"{self.details.output_data_format}\" output format.")
+                
+                histogram_values = results["Histogram"]
+
+                if len(histogram_values) % 2 == 0:
+                    # Re-mapping {'Histogram': ['[0]', 0.50, '[1]', 0.50] } to {'[0]': 0.50, '[1]': 0.50}
+                    return {histogram_values[i]: histogram_values[i + 1] for i in range(0, len(histogram_values), 2)}
+                else: 
+                    raise ValueError(f"\"Histogram\" array has invalid format. Even number of items is expected.")
+            return results
+        except:
+            # If errors decoding the data, return the raw payload:
+            if self.details.output_data_format == "microsoft.quantum-results.v2":
+                try:
+                    return payload.decode("utf8")
+                except:
+                    pass
+            return payload
+
+    def _parse_results_probabilities_v2(self, payload):
+        """Parses the probabilities of the first result of a microsoft.quantum-results.v2 payload,
+        counting its shots without keeping them in memory."""
+        histogram_values = []
+        total_count = 0
+        first_result_keys = set()
+        for kind, index, value in iter_results_v2(iter_payload_chunks(payload)):
+            if index != 0:
+                continue
+            if kind == "Histogram":
+                histogram_values.append(value)
+            elif kind == "Shots":
+                total_count += 1
+            else:
+                first_result_keys = value
+
+        if "Histogram" not in first_result_keys:
+            raise ValueError(f"\"Histogram\" array was expected to be in the Job results for \"{self.details.output_data_format}\" output format.")
+
+        if "Shots" not in first_result_keys:
+            raise ValueError(f"\"Shots\" array was expected to be in the Job results for \"{self.details.output_data_format}\" output format.")
+
+        # Re-mapping object {'Histogram': [{"Outcome": [0], "Display": '[0]', "Count": 500}, {"Outcome": [1], "Display": '[1]', "Count": 500}]} to {'[0]': 0.50, '[1]': 0.50}
+        return {outcome["Display"]: outcome["Count"] / total_count for outcome in histogram_values}
+
+    def _parse_results_histogram(self, payload):
+        """Parses the downloaded output payload as returned by `get_results_histogram`.
+        The payload can also be an iterable of chunks of the output blob."""
+        if self.details.output_data_format == "microsoft.quantum-results.v2":
+            results = collect_results_v2(iter_payload_chunks(payload), "Histogram")
+            return self._format_histograms(results)
+
+        else:
+            raise ValueError(f"Getting a results histogram with counts instead of probabilities is not a supported feature for jobs using the \"{self.details.output_data_format}\" output format.")
+
+    def _parse_results_shots(self, payload):
+        """Parses the downloaded output payload as returned by `get_results_shots`.
+        The payload can also be an iterable of chunks of the output blob."""
+        if self.details.output_data_format == "microsoft.quantum-results.v2":
+            # Shots are converted as they are read, so that the JSON
+            # of the whole payload is never held in memory
+            results = collect_results_v2(iter_payload_chunks(payload), "Shots", convert=self._convert_tuples)
+
+            # A list is only returned for the BatchResults edge case
+            return results[0] if len(results) == 1 else results
+        else:   
+            raise ValueError(f"Individual shot results are not supported for jobs using the \"{self.details.output_data_format}\" output format.")
+
+    def _parse_results_histogram_and_shots(self, payload):
+        """Parses the downloaded output payload as returned by `_get_results_histogram_and_shots`,
+        reading the histogram and the shots in a single pass.
+        The payload can also be an iterable of chunks of the output blob."""
+        if self.details.output_data_format == "microsoft.quantum-results.v2":
+            results = collect_fields_v2(
+                iter_payload_chunks(payload), {"Histogram": None, "Shots": self._convert_tuples}
+            )
+            shots = results["Shots"]
+
+            # A list is only returned for the BatchResults edge case
+            return self._format_histograms(results["Histogram"]), shots[0] if len(shots) == 1 else shots
+        else:
+            raise ValueError(f"Getting a results histogram with counts instead of probabilities is not a supported feature for jobs using the \"{self.details.output_data_format}\" output format.")
+
+    def _format_histograms(self, results):
+        """Formats the histogram entries of each result of a v2 payload
+        as returned by `get_results_histogram`."""
+        # Re-mapping object {'Histogram': [{"Outcome": [0], "Display": '[0]', "Count": 500}, {"Outcome": [1], "Display": '[1]', "Count": 500}]} to {'[0]': {"Outcome": [0], "Count": 500}, '[1]': {"Outcome": [1], "Count": 500}}
+        histograms = [
+            {hist_val["Display"]: {"outcome": outcome, "count": hist_val["Count"]} for outcome, hist_val in zip(self._process_outcome(histogram_values), histogram_values)}
+            for histogram_values in results
+        ]
+        # A list is only returned for the BatchResults edge case
+        return histograms[0] if len(histograms) == 1 else histograms
+
+    def _parse_results_shot_table(self, payload):
+        """Parses the downloaded output payload as returned by `get_results_shots(format="array")`.
+        The payload can also be an iterable of chunks of the output blob."""
+        if self.details.output_data_format == "microsoft.quantum-results.v2":
+            # NumPy is only loaded when shots are requested as a table
+            from azure.quantum.job.shot_table import _ShotTableBuilder
+
+            # The bits of each shot are appended to the table as they are read
+            builders = collect_results_v2(iter_payload_chunks(payload), "Shots", new_items=_ShotTableBuilder)
+            tables = [builder.build() for builder in builders]
+
+            # A list is only returned for the BatchResults edge case
+            return tables[0] if len(tables) == 1 else tables
+        else:
+            raise ValueError(f"Individual shot results are not supported for jobs using the \"{self.details.output_data_format}\" output format.")
+
+    def _process_outcome(self, histogram_results):
+        return [self._convert_tuples(v['Outcome']) for v in histogram_results]
+
+    def _convert_tuples(self, data):
+        if isinstance(data, dict):
+            if "Error" in data:
+                return data
+            # Check if the dictionary represents a tuple
+            elif all(isinstance(k, str) and k.startswith("Item") for k in data.keys()):
+                # Convert the dictionary to a tuple
+                return tuple(self._convert_tuples(data[f"Item{i+1}"]) for i in range(len(data)))
+            else:
+                raise ValueError("Malformed tuple output")
+        elif isinstance(data, list):
+            # Recursively process list elements, scalars are returned as is
+            return [
+                self._convert_tuples(item) if isinstance(item, (dict, list)) else item
+                for item in data
+            ]
+        else:
+            # Return the data as is (int, string, etc.)
+            return data
+
+    @classmethod
+    def _allow_failure_results(cls) -> bool: 
+        """
+        Allow to download job results even if the Job status is "Failed".
+
+        This method can be overridden in derived classes to alter the default
+        behaviour.
+
+        The default is False.
+        """
+        return False
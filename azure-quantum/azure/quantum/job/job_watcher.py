@@ -0,0 +1,350 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""Defines a background service that polls the status of jobs"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from azure.quantum._parallel import DEFAULT_MAX_WORKERS
+
+if TYPE_CHECKING:
+    from azure.quantum.job.job import Job
+    from azure.quantum.workspace import Workspace
+
+__all__ = ["JobWatcher"]
+
+logger = logging.getLogger(__name__)
+
+JobCallback = Callable[["Job"], None]
+
+
+class _WatchedJob:
+    def __init__(self, job: "Job", poll_wait: float):
+        # Instance that is refreshed, whose details are copied
+        # to the other instances of the same job after each poll
+        self.job = job
+        self.others: List["Job"] = []
+        self.status = job.details.status
+        # Callbacks and futures, with the instance they were registered with
+        self.callbacks: List[Tuple[JobCallback, "Job"]] = []
+        self.futures: List[Tuple[Future, "Job"]] = []
+        self.poll_wait = poll_wait
+        self.next_poll_time = time.monotonic()
+
+
+class JobWatcher:
+    """Background service that polls the status of all the jobs
+    registered with it from a single thread, instead of one blocked
+    thread per job.
+
+    Jobs that are due for a poll at the same time are refreshed together
+    with one list request per batch of jobs. The poll interval of a job
+    starts at `min_poll_wait_secs` and backs off after every poll that
+    does not change its status. While a job is waiting in the queue,
+    the interval is capped at a tenth of the average queue time of
+    its target, within `min_poll_wait_secs` and `max_poll_wait_secs`.
+
+    Use :meth:`watch` to register a job, with an optional callback that is
+    called on the watcher thread each time the status of the job changes,
+    or :meth:`watch_results` to get a future of the results of a job.
+
+    Obtain the watcher of a workspace from `Workspace.job_watcher`,
+    rather than creating one directly.
+
+    :param workspace: Workspace the jobs belong to
+    :type workspace: Workspace
+    :param min_poll_wait_secs: Minimum poll interval in seconds, defaults to 1
+    :type min_poll_wait_secs: float
+    :param max_poll_wait_secs: Maximum poll interval in seconds, defaults to 30
+    :type max_poll_wait_secs: float
+    :param queue_time_refresh_secs: How long the average queue times of
+        the targets are reused before being requested again, defaults to 300
+    :type queue_time_refresh_secs: float
+    """
+
+    # Jobs due within this fraction of the minimum poll interval are
+    # refreshed along with the jobs that are already due
+    _COALESCE_FACTOR = 0.5
+    _BACKOFF_FACTOR = 1.5
+    _QUEUE_TIME_FRACTION = 0.1
+
+    def __init__(
+        self,
+        workspace: "Workspace",
+        min_poll_wait_secs: float = 1,
+        max_poll_wait_secs: float = 30,
+        queue_time_refresh_secs: float = 300,
+    ):
+        self._workspace = workspace
+        self._min_poll_wait = min_poll_wait_secs
+        self._max_poll_wait = max_poll_wait_secs
+        self._queue_time_refresh = queue_time_refresh_secs
+        self._queue_times: Dict[str, float] = {}
+        self._queue_times_time: Optional[float] = None
+        self._watched: Dict[str, _WatchedJob] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopped = False
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the watcher thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def watched_job_ids(self) -> List[str]:
+        """IDs of the jobs that are being watched"""
+        with self._condition:
+            return list(self._watched)
+
+    def watch(self, job: "Job", callback: Optional[JobCallback] = None) -> Future:
+        """Starts watching a job until it reaches a finished status.
+
+        :param job: Job to watch
+        :type job: Job
+        :param callback: Optional function called with the job, on the
+            watcher thread, each time its status changes. Defaults to None.
+        :type callback: Callable[[Job], None]
+        :return: Future that resolves to the job once it has completed.
+            Other instances of the same job are refreshed too.
+        :rtype: concurrent.futures.Future
+        """
+        future = Future()
+        if job.has_completed():
+            future.set_result(job)
+            return future
+
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("The job watcher has been stopped.")
+            watched = self._watched.get(job.id)
+            if watched is None:
+                watched = _WatchedJob(job, self._min_poll_wait)
+                self._watched[job.id] = watched
+            elif job is not watched.job and all(job is not other for other in watched.others):
+                watched.others.append(job)
+            if callback is not None:
+                watched.callbacks.append((callback, job))
+            watched.futures.append((future, job))
+            self._ensure_thread()
+            self._condition.notify()
+        future.add_done_callback(lambda f: self._on_future_done(job.id, f))
+        return future
+
+    def watch_results(
+        self,
+        job: "Job",
+        get_results: Callable[["Job"], Any],
+    ) -> Future:
+        """Starts watching a job, and gets its results once it has completed.
+
+        The results are downloaded on a shared pool of worker threads,
+        so that the watcher thread keeps polling the other jobs meanwhile.
+        Cancelling the returned future stops watching the job.
+
+        :param job: Job to watch
+        :type job: Job
+        :param get_results: Function called with the completed job
+            that returns its results, e.g. `Job.get_results`
+        :type get_results: Callable[[Job], Any]
+        :return: Future that resolves to the results of the job,
+            or to the exception raised by `get_results`
+        :rtype: concurrent.futures.Future
+        """
+        results_future = Future()
+        job_future = self.watch(job)
+
+        def set_results(completed_job: "Job"):
+            if not results_future.set_running_or_notify_cancel():
+                return
+            try:
+                results_future.set_result(get_results(completed_job))
+            except BaseException as e:
+                results_future.set_exception(e)
+
+        def on_job_done(f: Future):
+            if f.cancelled():
+                results_future.cancel()
+                return
+            try:
+                self._get_executor().submit(set_results, f.result())
+            except RuntimeError:
+                # The watcher was stopped meanwhile
+                results_future.cancel()
+
+        results_future.add_done_callback(
+            lambda f: job_future.cancel() if f.cancelled() else None
+        )
+        job_future.add_done_callback(on_job_done)
+        return results_future
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("The job watcher has been stopped.")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=DEFAULT_MAX_WORKERS,
+                    thread_name_prefix="azure-quantum-job-results",
+                )
+            return self._executor
+
+    def unwatch(self, job: "Job") -> None:
+        """Stops watching a job and cancels its pending futures.
+
+        :param job: Job to stop watching
+        :type job: Job
+        """
+        with self._condition:
+            watched = self._watched.pop(job.id, None)
+        if watched is not None:
+            self._cancel(watched)
+
+    def _on_future_done(self, job_id: str, future: Future) -> None:
+        """Stops watching a job once all of its futures are cancelled
+        and there is no callback left to call."""
+        if not future.cancelled():
+            return
+        with self._condition:
+            watched = self._watched.get(job_id)
+            if watched is None:
+                return
+            if not watched.callbacks and all(f.cancelled() for f, _ in watched.futures):
+                del self._watched[job_id]
+
+    def stop(self, timeout_secs: Optional[float] = None) -> None:
+        """Stops the watcher thread and cancels the pending futures
+        of all the watched jobs.
+
+        :param timeout_secs: Optional time to wait for the thread to stop, defaults to None
+        :type timeout_secs: float
+        """
+        with self._condition:
+            self._stopped = True
+            watched = list(self._watched.values())
+            self._watched.clear()
+            self._condition.notify()
+            thread = self._thread
+            executor = self._executor
+        for item in watched:
+            self._cancel(item)
+        if executor is not None:
+            executor.shutdown(wait=False)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout_secs)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run,
+                name="azure-quantum-job-watcher",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                due = self._wait_for_due_jobs()
+                if due is None:
+                    return
+            self._poll(due)
+
+    def _wait_for_due_jobs(self) -> Optional[List[_WatchedJob]]:
+        """Waits until some jobs are due for a poll, with the condition held.
+        Returns None once the watcher is stopped or has nothing left to watch."""
+        while not self._stopped:
+            if not self._watched:
+                # The thread is started again by the next call to watch
+                self._thread = None
+                return None
+            now = time.monotonic()
+            horizon = now + self._min_poll_wait * self._COALESCE_FACTOR
+            due = [w for w in self._watched.values() if w.next_poll_time <= horizon]
+            if any(w.next_poll_time <= now for w in due):
+                return due
+            next_poll_time = min(w.next_poll_time for w in self._watched.values())
+            self._condition.wait(next_poll_time - now)
+        return None
+
+    def _poll(self, due: List[_WatchedJob]) -> None:
+        try:
+            self._workspace._refresh_jobs([w.job for w in due])
+        except Exception as e:
+            logger.warning(f"Failed to refresh the status of {len(due)} jobs: {e}")
+
+        queue_times = self._get_queue_times()
+        now = time.monotonic()
+        for watched in due:
+            job = watched.job
+            status = job.details.status
+            changed = status != watched.status
+            watched.status = status
+            if changed:
+                watched.poll_wait = self._min_poll_wait
+            else:
+                watched.poll_wait = min(
+                    watched.poll_wait * self._BACKOFF_FACTOR,
+                    self._get_max_poll_wait(job, queue_times),
+                )
+            watched.next_poll_time = now + watched.poll_wait
+            for other in watched.others:
+                other.details = job.details
+
+            completed = job.has_completed()
+            if completed:
+                with self._condition:
+                    if self._watched.get(job.id) is watched:
+                        del self._watched[job.id]
+            if changed:
+                for callback, instance in list(watched.callbacks):
+                    try:
+                        callback(instance)
+                    except Exception:
+                        logger.exception(f"Callback of job {job.id} raised an exception")
+            if completed:
+                for future, instance in watched.futures:
+                    if not future.done():
+                        future.set_result(instance)
+
+    def _get_max_poll_wait(self, job: "Job", queue_times: Dict[str, float]) -> float:
+        if job.details.status != "Waiting":
+            return self._max_poll_wait
+        queue_time = queue_times.get((job.details.target or "").lower())
+        if not queue_time:
+            return self._max_poll_wait
+        return min(
+            self._max_poll_wait,
+            max(self._min_poll_wait, queue_time * self._QUEUE_TIME_FRACTION),
+        )
+
+    def _get_queue_times(self) -> Dict[str, float]:
+        """Returns the average queue time in seconds of each target,
+        by lowercase target name, requesting them again once they are stale."""
+        now = time.monotonic()
+        if (
+            self._queue_times_time is not None
+            and now - self._queue_times_time < self._queue_time_refresh
+        ):
+            return self._queue_times
+        self._queue_times_time = now
+        try:
+            self._queue_times = {
+                status.id.lower(): status.average_queue_time
+                for _, status in self._workspace._get_target_status()
+                if status.average_queue_time is not None
+            }
+        except Exception as e:
+            logger.debug(f"Failed to get the average queue time of the targets: {e}")
+        return self._queue_times
+
+    @staticmethod
+    def _cancel(watched: _WatchedJob) -> None:
+        for future, _ in watched.futures:
+            future.cancel()
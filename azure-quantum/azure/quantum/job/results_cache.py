@@ -0,0 +1,211 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""Defines a cache of downloaded job results"""
+
+from collections import OrderedDict
+import copy
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import quote, urlparse
+
+__all__ = ["ResultsCache"]
+
+logger = logging.getLogger(__name__)
+
+_CacheKey = Tuple[str, str, str]
+
+
+class ResultsCache:
+    """Cache of the results parsed from the output of succeeded jobs,
+    so that results are downloaded and parsed only once.
+
+    Caching is opt-in: assign a cache to `Workspace.results_cache` to enable it.
+
+    Parsed results are kept in memory, and a copy of them is returned
+    on each call so that callers can modify them. Output payloads are not
+    kept in memory; they are only persisted if a directory is given, so
+    that results survive process restarts.
+
+    Entries are keyed by job ID, output blob path and blob ETag, so that
+    an output blob that is written again is never served from the cache.
+    Use :meth:`clear` to remove them.
+
+    :param directory: Optional directory to persist payloads in, defaults to None
+    :type directory: str
+    :param max_entries: Maximum number of jobs kept in memory, defaults to 32
+    :type max_entries: int
+    """
+
+    _FILE_SUFFIX = ".results"
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = 32):
+        self._directory = directory
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[_CacheKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def directory(self) -> Optional[str]:
+        """Directory where payloads are persisted, if any"""
+        return self._directory
+
+    @staticmethod
+    def _key(job_id: str, blob_uri: str, etag: str) -> _CacheKey:
+        # The SAS token of the blob URI changes over time, the path does not
+        return (job_id, urlparse(blob_uri).path, etag)
+
+    def _get_path(self, key: _CacheKey) -> str:
+        file_name = quote("".join(key), safe="")
+        return os.path.join(self._directory, file_name + self._FILE_SUFFIX)
+
+    def get_payload(self, job_id: str, blob_uri: str, etag: str) -> Optional[bytes]:
+        """Get the persisted output payload of a job.
+
+        :param job_id: Job ID
+        :type job_id: str
+        :param blob_uri: Output data URI of the job
+        :type blob_uri: str
+        :param etag: ETag of the output blob
+        :type etag: str
+        :return: The payload, or None if it is not persisted
+        :rtype: bytes
+        """
+        if self._directory is None:
+            return None
+        path = self._get_path(self._key(job_id, blob_uri, etag))
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rb") as f:
+            payload = f.read()
+        logger.debug(f"Loaded results of job {job_id} from {path}")
+        return payload
+
+    def set_payload(self, job_id: str, blob_uri: str, etag: str, payload: bytes) -> None:
+        """Persist the output payload of a job.
+        Ignored if the cache has no directory.
+
+        :param job_id: Job ID
+        :type job_id: str
+        :param blob_uri: Output data URI of the job
+        :type blob_uri: str
+        :param etag: ETag of the output blob
+        :type etag: str
+        :param payload: Output payload downloaded from blob_uri
+        :type payload: bytes
+        """
+        for _ in self.persist_chunks(job_id, blob_uri, etag, [payload]):
+            pass
+
+    def persist_chunks(
+        self,
+        job_id: str,
+        blob_uri: str,
+        etag: str,
+        chunks: Iterable[bytes],
+    ) -> Iterator[bytes]:
+        """Persist the output payload of a job while it is downloaded.
+        The payload is only persisted once all the chunks have been consumed.
+
+        :param job_id: Job ID
+        :type job_id: str
+        :param blob_uri: Output data URI of the job
+        :type blob_uri: str
+        :param etag: ETag of the output blob
+        :type etag: str
+        :param chunks: Chunks of the payload downloaded from blob_uri
+        :type chunks: Iterable[bytes]
+        :return: The chunks
+        :rtype: Iterator[bytes]
+        """
+        if self._directory is None:
+            yield from chunks
+            return
+
+        path = self._get_path(self._key(job_id, blob_uri, etag))
+        # Write to a temporary file first so that a concurrent reader
+        # or an interrupted write never leaves a truncated payload behind
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        f = os.fdopen(fd, "wb")
+        try:
+            for chunk in chunks:
+                if f is not None:
+                    try:
+                        f.write(chunk)
+                    except OSError as e:
+                        logger.warning(f"Failed to persist results of job {job_id}: {e}")
+                        f.close()
+                        f = None
+                yield chunk
+            if f is not None:
+                f.close()
+                f = None
+                os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to persist results of job {job_id}: {e}")
+        finally:
+            if f is not None:
+                f.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get_parsed(self, job_id: str, blob_uri: str, etag: str, kind: str) -> Any:
+        """Get a copy of the cached results of a job.
+
+        :param job_id: Job ID
+        :type job_id: str
+        :param blob_uri: Output data URI of the job
+        :type blob_uri: str
+        :param etag: ETag of the output blob
+        :type etag: str
+        :param kind: Kind of parsed results, e.g. "histogram"
+        :type kind: str
+        :return: The parsed results, or None if they are not cached
+        :rtype: typing.Any
+        """
+        key = self._key(job_id, blob_uri, etag)
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is None or kind not in parsed:
+                return None
+            self._entries.move_to_end(key)
+            results = parsed[kind]
+        return copy.deepcopy(results)
+
+    def set_parsed(self, job_id: str, blob_uri: str, etag: str, kind: str, results: Any) -> None:
+        """Cache a copy of the results of a job.
+
+        :param job_id: Job ID
+        :type job_id: str
+        :param blob_uri: Output data URI of the job
+        :type blob_uri: str
+        :param etag: ETag of the output blob
+        :type etag: str
+        :param kind: Kind of parsed results, e.g. "histogram"
+        :type kind: str
+        :param results: Parsed results
+        :type results: typing.Any
+        """
+        key = self._key(job_id, blob_uri, etag)
+        results = copy.deepcopy(results)
+        with self._lock:
+            self._entries.setdefault(key, {})[kind] = results
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached results, including the persisted payloads."""
+        with self._lock:
+            self._entries.clear()
+        if self._directory is None:
+            return
+        for file_name in os.listdir(self._directory):
+            if file_name.endswith(self._FILE_SUFFIX):
+                os.remove(os.path.join(self._directory, file_name))
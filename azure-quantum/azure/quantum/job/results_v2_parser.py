@@ -0,0 +1,331 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""Defines an incremental parser for the microsoft.quantum-results.v2 format"""
+
+import codecs
+import json
+from json.scanner import make_scanner
+import mmap
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+__all__ = ["iter_results_v2", "iter_payload_chunks", "collect_results_v2", "collect_fields_v2"]
+
+RESULTS_V2_FORMAT = "microsoft.quantum-results.v2"
+
+# Size of the slices a payload that is already in memory is decoded in
+_PAYLOAD_CHUNK_SIZE = 1024 * 1024
+
+_WHITESPACE = " \t\n\r"
+_skip_whitespace = re.compile(r"[ \t\n\r]*").match
+
+
+def iter_payload_chunks(payload: Any) -> Iterable[Union[bytes, str]]:
+    """Returns the chunks to parse a downloaded payload from.
+
+    :param payload: The payload as bytes, str, a buffer such as the memoryview
+        returned by a memory-mapped download, or an iterable of bytes chunks
+        as returned by a blob download stream
+    :return: Iterable of bytes or str chunks
+    """
+    if isinstance(payload, (bytes, bytearray, memoryview, mmap.mmap)):
+        # Iterating a buffer directly would yield one byte at a time
+        view = memoryview(payload).cast("B")
+        return (
+            bytes(view[i : i + _PAYLOAD_CHUNK_SIZE])
+            for i in range(0, len(view), _PAYLOAD_CHUNK_SIZE)
+        )
+    if isinstance(payload, str):
+        return [payload]
+    if hasattr(payload, "decode"):
+        return [payload.decode("utf8")]
+    return payload
+
+
+class _StreamReader:
+    """Reads JSON tokens and values from a stream of chunks,
+    keeping in memory only the part that has not been consumed yet."""
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._scan_once = make_scanner(self._json_decoder)
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Appends the next chunk to the buffer.
+        Returns False if the stream is exhausted."""
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            text = chunk if isinstance(chunk, str) else self._decoder.decode(chunk)
+            if text:
+                self._buffer = self._buffer[self._pos:] + text
+                self._pos = 0
+                return True
+        tail = self._decoder.decode(b"", final=True)
+        self._buffer = self._buffer[self._pos:] + tail
+        self._pos = 0
+        self._eof = True
+        return bool(tail)
+
+    def peek(self) -> str:
+        """Returns the next non-whitespace character without consuming it,
+        or an empty string at the end of the stream."""
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ""
+
+    def next(self) -> str:
+        """Consumes and returns the next non-whitespace character."""
+        char = self.peek()
+        if not char:
+            raise ValueError("Unexpected end of the job results")
+        self._pos += 1
+        return char
+
+    def expect(self, expected: str) -> None:
+        char = self.next()
+        if char != expected:
+            raise ValueError(f"Expected '{expected}' in the job results, found '{char}'")
+
+    def value(self) -> Any:
+        """Consumes and returns the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def array_values(self) -> Iterator[Any]:
+        """Consumes a JSON array, yielding its values one at a time."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        scan_once = self._scan_once
+        while True:
+            buffer = self._buffer
+            pos = _skip_whitespace(buffer, self._pos).end()
+            try:
+                value, end = scan_once(buffer, pos)
+            except (StopIteration, json.JSONDecodeError):
+                # The value continues in the next chunk
+                self._pos = pos
+                if not self._fill():
+                    raise ValueError("Unexpected end of the job results")
+                continue
+            separator_pos = _skip_whitespace(buffer, end).end()
+            if separator_pos == len(buffer):
+                # Wait for the separator, as a number could also
+                # continue in the next chunk
+                self._pos = pos
+                if not self._fill():
+                    raise ValueError("Unexpected end of the job results")
+                continue
+            separator = buffer[separator_pos]
+            self._pos = separator_pos + 1
+            yield value
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' in the job results, found '{separator}'")
+
+    def at_end(self) -> bool:
+        return self.peek() == ""
+
+
+def _iter_array(reader: _StreamReader) -> Iterator[None]:
+    """Consumes a JSON array, yielding when the reader is at an element."""
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.next()
+        return
+    while True:
+        yield
+        separator = reader.next()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' in the job results, found '{separator}'")
+
+
+def _iter_object(reader: _StreamReader) -> Iterator[str]:
+    """Consumes a JSON object, yielding each key when the reader
+    is at the corresponding value."""
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.next()
+        return
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError("Expected a string key in the job results")
+        reader.expect(":")
+        yield key
+        separator = reader.next()
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or '}}' in the job results, found '{separator}'")
+
+
+def iter_results_v2(
+    chunks: Iterable[Union[bytes, str]],
+    fields: Tuple[str, ...] = ("Histogram", "Shots"),
+) -> Iterator[Tuple[str, int, Any]]:
+    """Parses a microsoft.quantum-results.v2 payload incrementally.
+
+    Only one histogram entry or shot is decoded at a time, so the full
+    JSON document is never held in memory.
+
+    Yields `("Histogram", i, entry)` for each histogram entry and
+    `("Shots", i, shot)` for each shot of the i-th result, in the
+    order of the payload, for the requested `fields`. Once a result
+    has been read, yields `("Result", i, keys)` with the set of keys
+    that result had.
+
+    Raises :class:`ValueError` if the payload is not valid JSON,
+    if "DataFormat" is not "microsoft.quantum-results.v2" or
+    if "Results" is missing or empty.
+
+    :param chunks: Payload chunks, see :func:`iter_payload_chunks`
+    :param fields: Fields of each result to yield the items of
+    """
+    reader = _StreamReader(chunks)
+    data_format = None
+    result_count = None
+
+    if reader.peek() != "{":
+        raise ValueError(
+            f"\"DataFormat\" was expected to be \"{RESULTS_V2_FORMAT}\" in the Job results "
+            f"for \"{RESULTS_V2_FORMAT}\" output format."
+        )
+
+    for key in _iter_object(reader):
+        if key == "DataFormat":
+            data_format = reader.value()
+        elif key == "Results" and reader.peek() == "[":
+            result_count = 0
+            for _ in _iter_array(reader):
+                index = result_count
+                result_count += 1
+                if reader.peek() != "{":
+                    reader.value()
+                    yield ("Result", index, set())
+                    continue
+                keys: Set[str] = set()
+                for result_key in _iter_object(reader):
+                    keys.add(result_key)
+                    if result_key in fields:
+                        if reader.peek() != "[":
+                            raise ValueError(
+                                f"\"{result_key}\" was expected to be an array in the Job results."
+                            )
+                        for value in reader.array_values():
+                            yield (result_key, index, value)
+                    else:
+                        reader.value()
+                yield ("Result", index, keys)
+        else:
+            reader.value()
+
+    if not reader.at_end():
+        raise ValueError("Unexpected data after the end of the job results")
+
+    if data_format != RESULTS_V2_FORMAT:
+        raise ValueError(
+            f"\"DataFormat\" was expected to be \"{RESULTS_V2_FORMAT}\" in the Job results "
+            f"for \"{RESULTS_V2_FORMAT}\" output format."
+        )
+    if result_count is None:
+        raise ValueError(
+            f"\"Results\" field was expected to be in the Job results "
+            f"for \"{RESULTS_V2_FORMAT}\" output format."
+        )
+    if result_count < 1:
+        raise ValueError("\"Results\" array was expected to contain at least one item")
+
+
+def collect_results_v2(
+    chunks: Iterable[Union[bytes, str]],
+    field: str,
+    convert=None,
+    new_items=list,
+) -> List[Any]:
+    """Collects the items of one field of every result of a
+    microsoft.quantum-results.v2 payload.
+
+    Raises :class:`ValueError` if a result does not have the field.
+
+    :param chunks: Payload chunks, see :func:`iter_payload_chunks`
+    :param field: "Histogram" or "Shots"
+    :param convert: Optional function applied to each item as it is read
+    :param new_items: Factory of the collection the items of a result
+        are appended to, defaults to list
+    :return: The collection of (converted) items of the field, for each result
+    """
+    return collect_fields_v2(chunks, {field: convert}, new_items=new_items)[field]
+
+
+def collect_fields_v2(
+    chunks: Iterable[Union[bytes, str]],
+    fields: Dict[str, Optional[Callable[[Any], Any]]],
+    new_items=list,
+) -> Dict[str, List[Any]]:
+    """Collects the items of several fields of every result of a
+    microsoft.quantum-results.v2 payload in a single pass, e.g. both
+    the histogram and the shots.
+
+    Raises :class:`ValueError` if a result does not have one of the fields.
+
+    :param chunks: Payload chunks, see :func:`iter_payload_chunks`
+    :param fields: Fields to collect, "Histogram" and/or "Shots", with the
+        optional function applied to each of their items as it is read
+    :param new_items: Factory of the collection the items of a result
+        are appended to, defaults to list
+    :return: For each field, the collection of its (converted) items
+        for each result
+    """
+    results: Dict[str, List[Any]] = {field: [] for field in fields}
+    items = {field: new_items() for field in fields}
+    missing = None
+    for kind, index, value in iter_results_v2(chunks, fields=tuple(fields)):
+        if kind == "Result":
+            for field in fields:
+                if field not in value and missing is None:
+                    missing = (field, index)
+                results[field].append(items[field])
+                items[field] = new_items()
+        else:
+            convert = fields[kind]
+            items[kind].append(convert(value) if convert is not None else value)
+
+    # Reported once the whole payload is validated, like the format errors
+    if missing is not None:
+        field, index = missing
+        raise ValueError(
+            f"\"{field}\" array was expected to be in the Job results for result {index} "
+            f"of \"{RESULTS_V2_FORMAT}\" output format."
+        )
+    return results
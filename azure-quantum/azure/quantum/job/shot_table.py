@@ -0,0 +1,262 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+"""Defines a columnar, NumPy-backed table of per-shot job results"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+__all__ = ["ShotTable"]
+
+# Value of a bit of a qubit that was lost during the shot
+LOST_QUBIT = 2
+
+# Maximum number of bits of a row that fit in a 64-bit base-3 code
+_MAX_ENCODED_WIDTH = 40
+
+
+class ShotTable:
+    """Per-shot results of a job, stored as one `(num_shots, width)` array
+    of `uint8` per classical register, with one byte per measured bit.
+    A bit is 0 or 1, or 2 if the qubit was lost.
+
+    Returned by `Job.get_results_shots(format="array")`.
+
+    :param registers: Bit arrays of each register, with the same number of rows
+    :type registers: Sequence[numpy.ndarray]
+    """
+
+    def __init__(self, registers: Sequence[np.ndarray]):
+        registers = tuple(np.asarray(r, dtype=np.uint8) for r in registers)
+        if not registers:
+            raise ValueError("A shot table needs at least one register.")
+        for register in registers:
+            if register.ndim != 2:
+                raise ValueError("Each register must be a two-dimensional array of bits.")
+            if register.shape[0] != registers[0].shape[0]:
+                raise ValueError("All registers must have the same number of shots.")
+        self._registers = registers
+
+    @classmethod
+    def from_shots(cls, shots: Iterable[Any]) -> "ShotTable":
+        """Creates a shot table from shots as returned by `Job.get_results_shots()`,
+        where each shot is a list of bits or a tuple of lists of bits.
+
+        :param shots: Shot results
+        :type shots: Iterable[Any]
+        :return: Shot table
+        :rtype: ShotTable
+        """
+        builder = _ShotTableBuilder()
+        for shot in shots:
+            builder.append(shot)
+        return builder.build()
+
+    @property
+    def registers(self) -> Tuple[np.ndarray, ...]:
+        """Bit arrays of each register, of shape `(num_shots, width)`"""
+        return self._registers
+
+    @property
+    def num_shots(self) -> int:
+        """Number of shots"""
+        return self._registers[0].shape[0]
+
+    @property
+    def widths(self) -> Tuple[int, ...]:
+        """Number of bits of each register"""
+        return tuple(r.shape[1] for r in self._registers)
+
+    def __len__(self) -> int:
+        return self.num_shots
+
+    def __repr__(self) -> str:
+        return f"ShotTable(num_shots={self.num_shots}, widths={self.widths})"
+
+    def bits(self) -> np.ndarray:
+        """Returns the bits of all registers side by side,
+        as an array of shape `(num_shots, sum(widths))`.
+
+        :return: Bit array
+        :rtype: numpy.ndarray
+        """
+        if len(self._registers) == 1:
+            return self._registers[0]
+        return np.concatenate(self._registers, axis=1)
+
+    def lost_shots(self) -> np.ndarray:
+        """Returns a boolean mask of the shots where a qubit was lost.
+
+        :return: Boolean array of shape `(num_shots,)`
+        :rtype: numpy.ndarray
+        """
+        return (self.bits() == LOST_QUBIT).any(axis=1)
+
+    def counts(self) -> Dict[str, int]:
+        """Counts the occurrences of each outcome. Outcomes are formatted
+        like Qiskit bitstrings: the bits of each register, with registers
+        separated by a space.
+
+        :return: Number of shots of each outcome
+        :rtype: Dict[str, int]
+        """
+        return self._count(self.bits(), self.widths)
+
+    def marginal(self, qubits: Sequence[int]) -> Dict[str, int]:
+        """Counts the occurrences of each outcome of a subset of the bits,
+        indexed across all registers as in :meth:`bits`.
+
+        :param qubits: Indices of the bits to keep, in output order
+        :type qubits: Sequence[int]
+        :return: Number of shots of each outcome of the selected bits
+        :rtype: Dict[str, int]
+        """
+        qubits = list(qubits)
+        return self._count(self.bits()[:, qubits], (len(qubits),))
+
+    def expectation(self, observable: Union[str, Sequence[int]]) -> float:
+        """Computes the expectation value of a product of Pauli Z operators,
+        ignoring the shots where a qubit was lost.
+
+        :param observable: Either a string of "Z" and "I" characters,
+            one per bit as indexed in :meth:`bits`, or the indices of
+            the bits the Z operators act on
+        :type observable: Union[str, Sequence[int]]
+        :return: Expectation value, between -1 and 1
+        :rtype: float
+        """
+        bits = self.bits()
+        if isinstance(observable, str):
+            if len(observable) != bits.shape[1]:
+                raise ValueError(
+                    f"Observable '{observable}' must have one character per bit ({bits.shape[1]})."
+                )
+            if set(observable.upper()) - {"Z", "I"}:
+                raise ValueError("Only 'Z' and 'I' operators are supported.")
+            qubits = [i for i, op in enumerate(observable.upper()) if op == "Z"]
+        else:
+            qubits = list(observable)
+
+        valid = ~(bits == LOST_QUBIT).any(axis=1)
+        if not valid.any():
+            raise ValueError("No shots without lost qubits to compute the expectation value from.")
+        parity = np.bitwise_xor.reduce(bits[valid][:, qubits], axis=1) if qubits else 0
+        return float(np.mean(1 - 2 * np.asarray(parity, dtype=np.int64)))
+
+    def to_qiskit_memory(self) -> List[str]:
+        """Returns the shots as Qiskit `memory` bitstrings.
+
+        :return: One bitstring per shot
+        :rtype: List[str]
+        """
+        outcomes, inverse = self._unique_rows(self.bits(), return_inverse=True)
+        labels = [self._format(outcome, self.widths) for outcome in outcomes]
+        return [labels[i] for i in inverse.reshape(-1)]
+
+    def to_cirq_measurements(self, keys: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Returns the shots as Cirq `measurements`, without copying the bits.
+
+        :param keys: Measurement key of each register.
+            Defaults to "m" for a single register, or "m0", "m1", ... otherwise.
+        :type keys: Sequence[str]
+        :return: `int8` array of shape `(num_shots, width)` for each key
+        :rtype: Dict[str, numpy.ndarray]
+        """
+        if keys is None:
+            keys = ["m"] if len(self._registers) == 1 else [f"m{i}" for i in range(len(self._registers))]
+        if len(keys) != len(self._registers):
+            raise ValueError(f"Expected {len(self._registers)} measurement keys, got {len(keys)}.")
+        return {key: register.view(np.int8) for key, register in zip(keys, self._registers)}
+
+    @classmethod
+    def _count(cls, bits: np.ndarray, widths: Sequence[int]) -> Dict[str, int]:
+        if bits.shape[0] == 0:
+            return {}
+        outcomes, counts = cls._unique_rows(bits, return_counts=True)
+        return {
+            cls._format(outcome, widths): int(count)
+            for outcome, count in zip(outcomes, counts)
+        }
+
+    @staticmethod
+    def _unique_rows(bits: np.ndarray, **kwargs):
+        """Like `numpy.unique(bits, axis=0, ...)`, but faster for registers
+        of up to 40 bits, whose rows are encoded as base-3 integers first."""
+        width = bits.shape[1]
+        if not 0 < width <= _MAX_ENCODED_WIDTH:
+            return np.unique(bits, axis=0, **kwargs)
+        weights = (LOST_QUBIT + 1) ** np.arange(width - 1, -1, -1, dtype=np.uint64)
+        codes = bits.astype(np.uint64) @ weights
+        unique_codes, *rest = np.unique(codes, **kwargs)
+        outcomes = ((unique_codes[:, None] // weights) % (LOST_QUBIT + 1)).astype(np.uint8)
+        return (outcomes, *rest)
+
+    @staticmethod
+    def _format(outcome: np.ndarray, widths: Sequence[int]) -> str:
+        bitstring = "".join(map(str, outcome.tolist()))
+        parts = []
+        start = 0
+        for width in widths:
+            parts.append(bitstring[start : start + width])
+            start += width
+        return " ".join(parts)
+
+
+class _ShotTableBuilder:
+    """Builds a shot table one shot at a time, appending the bits
+    of each register to a byte buffer instead of a list of lists."""
+
+    def __init__(self):
+        self._buffers: Optional[List[bytearray]] = None
+        self._widths: Optional[List[int]] = None
+        self._num_shots = 0
+
+    def append(self, shot: Any) -> None:
+        registers = self._get_registers(shot)
+        if self._buffers is None:
+            self._widths = [len(r) for r in registers]
+            self._buffers = [bytearray() for _ in registers]
+        if [len(r) for r in registers] != self._widths:
+            raise ValueError(
+                f"All shots must have registers of widths {self._widths}, found {shot}."
+            )
+        try:
+            for buffer, register in zip(self._buffers, registers):
+                buffer.extend(register)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Shot {shot} can not be stored in a shot table.") from e
+        self._num_shots += 1
+
+    @staticmethod
+    def _get_registers(shot: Any) -> List[Any]:
+        if isinstance(shot, list):
+            return [shot]
+        if isinstance(shot, tuple):
+            registers = list(shot)
+        elif isinstance(shot, dict) and "Error" not in shot:
+            # Tuple as encoded in the microsoft.quantum-results.v2 format
+            registers = [shot.get(f"Item{i + 1}") for i in range(len(shot))]
+        else:
+            registers = None
+        if not registers or not all(isinstance(r, list) for r in registers):
+            raise ValueError(
+                f"Shot {shot} can not be stored in a shot table, "
+                "only shots of lists of bits are supported."
+            )
+        return registers
+
+    def build(self) -> ShotTable:
+        if self._buffers is None:
+            return ShotTable([np.zeros((0, 0), dtype=np.uint8)])
+        registers = [
+            np.frombuffer(buffer, dtype=np.uint8).reshape(self._num_shots, width)
+            for buffer, width in zip(self._buffers, self._widths)
+        ]
+        if any(r.size and r.max() > LOST_QUBIT for r in registers):
+            raise ValueError(
+                "Shots can only be stored in a shot table if all their bits are 0, 1 or "
+                f"{LOST_QUBIT} for a lost qubit."
+            )
+        return ShotTable(registers)
@@ -2,8 +2,10 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 ##
+import asyncio
 from collections import defaultdict
-from typing import Any, Dict, List, Union
+import concurrent.futures
+from typing import Any, Dict, List, Optional, Union
 import numpy as np
 
 try:
@@ -104,6 +106,22 @@ class AzureQuantumJob(JobV1):
 
         return Result.from_dict(result_dict)
 
+    def as_future(self, sampler_seed=None) -> concurrent.futures.Future:
+        """Return a future of the ``Result`` of the job, resolved once the job
+        has completed. See :meth:`azure.quantum.Job.as_future`."""
+        return self._azure_job.as_future(
+            lambda _: self.result(sampler_seed=sampler_seed)
+        )
+
+    def as_asyncio_future(
+        self,
+        sampler_seed=None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> asyncio.Future:
+        """Return an asyncio future of the ``Result`` of the job, resolved once
+        the job has completed. See :meth:`azure.quantum.Job.as_future`."""
+        return asyncio.wrap_future(self.as_future(sampler_seed=sampler_seed), loop=loop)
+
     def cancel(self):
         """Attempt to cancel the job."""
         self._workspace.cancel_job(self._azure_job)
@@ -377,8 +395,13 @@ class AzureQuantumJob(JobV1):
 
     def _translate_microsoft_v2_results(self):
         """Translate Microsoft's batching job results histograms into a format that can be consumed by qiskit libraries."""
-        az_result_histogram = self._azure_job.get_results_histogram()
-        az_result_shots = self._azure_job.get_results_shots()
+        # Jobs of azure.quantum read both from a single download of the results
+        get_histogram_and_shots = getattr(self._azure_job, "_get_results_histogram_and_shots", None)
+        if get_histogram_and_shots is not None:
+            az_result_histogram, az_result_shots = get_histogram_and_shots()
+        else:
+            az_result_histogram = self._azure_job.get_results_histogram()
+            az_result_shots = self._azure_job.get_results_shots()
 
         # If it is a non-batched result, format to be in batch format so we can have one code path
         if isinstance(az_result_histogram, dict):
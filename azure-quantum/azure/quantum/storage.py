@@ -2,9 +2,21 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 ##
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+import hashlib
+import io
+import json
 import logging
-from typing import Any, Dict
-from azure.core import exceptions
+import mmap
+import os
+import tempfile
+import time
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from azure.core import exceptions, MatchConditions
+from azure.core.pipeline.transport import HttpTransport
 from azure.storage.blob import (
     BlobServiceClient,
     ContainerClient,
@@ -18,18 +30,25 @@ from azure.storage.blob import (
 )
 from datetime import datetime, timedelta
 from enum import Enum
+from azure.quantum._parallel import DEFAULT_MAX_WORKERS, map_concurrently
 
 logger = logging.getLogger(__name__)
 
+# Size of the ranges a blob is downloaded in when downloading concurrently
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
 
 def create_container(
-    connection_string: str, container_name: str
+    connection_string: str,
+    container_name: str,
+    transport: Optional[HttpTransport] = None,
 ) -> ContainerClient:
     """
     Creates and initialize a container; returns the client needed to access it.
+    Requests are sent through `transport` if given.
     """
     blob_service_client = BlobServiceClient.from_connection_string(
-        connection_string
+        connection_string, **_client_kwargs(transport)
     )
     logger.info(
         f'{"Initializing storage client for account:"}'
@@ -53,12 +72,16 @@ def create_container_using_client(container_client: ContainerClient):
         container_client.create_container()
 
 
-def get_container_uri(connection_string: str, container_name: str) -> str:
+def get_container_uri(
+    connection_string: str,
+    container_name: str,
+    transport: Optional[HttpTransport] = None,
+) -> str:
     """
     Creates and initialize a container;
     returns a URI with a SAS read/write token to access it.
     """
-    container = create_container(connection_string, container_name)
+    container = create_container(connection_string, container_name, transport)
     logger.info(
         f'{"Creating SAS token for container"}'
         + f"'{container_name}' on account: '{container.account_name}'"
@@ -92,6 +115,10 @@ def upload_blob(
     If a blob with the given name already exist, it throws an error.
     Container must already exist in a storage.
 
+    Besides bytes, str and streams, data can be the `os.PathLike` path of
+    a file, a `memoryview` or an `mmap.mmap`, which are streamed to the blob
+    without being copied into memory first.
+
     Returns a uri with a SAS token to access the newly created blob.
     """
     logger.info(
@@ -105,8 +132,9 @@ def upload_blob(
     )
    
     blob = container.get_blob_client(blob_name)
-    
-    blob.upload_blob(data, content_settings=content_settings)
+
+    with _open_upload_data(data) as (stream, length):
+        blob.upload_blob(stream, length=length, content_settings=content_settings)
     logger.debug(f"  - blob '{blob_name}' uploaded. generating sas token.")
 
     if return_sas_token:
@@ -118,6 +146,57 @@ def upload_blob(
     return uri
 
 
+class _BufferReader(io.RawIOBase):
+    """Read-only stream over a buffer, such as a memoryview or an mmap,
+    that reads from the buffer in place instead of copying it first."""
+
+    def __init__(self, buffer: Any):
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        data = self._view[self._position : self._position + len(b)]
+        size = len(data)
+        b[:size] = data
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        self._view.release()
+        super().close()
+
+
+@contextmanager
+def _open_upload_data(data: Any) -> Iterator[Tuple[Any, Optional[int]]]:
+    """Opens data to upload as a stream if it is a file path or a buffer,
+    and returns it with its length, if known."""
+    if isinstance(data, os.PathLike):
+        with open(data, "rb") as stream:
+            yield stream, os.fstat(stream.fileno()).st_size
+    elif isinstance(data, (memoryview, mmap.mmap)):
+        with _BufferReader(data) as stream:
+            yield stream, stream.seek(0, io.SEEK_END) - stream.seek(0)
+    else:
+        yield data, None
+
+
 def append_blob(
     container: ContainerClient,
     blob_name: str,
@@ -166,6 +245,177 @@ def append_blob(
     return uri
 
 
+class AppendBlobWriter:
+    """Buffered writer of an append blob, to stream many small records,
+    such as progress logs, into a blob without a request per record.
+
+    Writes are buffered and appended to the blob in blocks of up to
+    `flush_size` bytes, when the buffer reaches `flush_size` bytes or,
+    if `flush_interval_secs` is set, at the latest that long after the first
+    buffered write. The blob is created on the first flush if it does not
+    exist yet, and its client and type are checked once for all appends.
+
+    Errors raised by a flush in the background are raised by the next call
+    to `write()`, `flush()` or `close()`. Use as a context manager, or call
+    `close()` to flush the remaining data.
+
+    :param container: The container client of the blob.
+        Container must already exist in a storage.
+    :param blob_name: The name of the blob
+        (including optional path) within the blob container
+    :param content_type: The HTTP content type to apply to the blob metadata
+    :param content_encoding: The HTTP
+        content encoding to apply to the blob metadata
+    :param metadata: Optional dictionary of metadata to apply
+        to the blob if it is created
+    :param flush_size: Number of buffered bytes that triggers a flush,
+        defaults to 4 MiB, the maximum size of an append block
+    :param flush_interval_secs: Maximum time data stays buffered,
+        defaults to None to only flush on size
+    """
+
+    MAX_BLOCK_SIZE = 4 * 1024 * 1024
+
+    def __init__(
+        self,
+        container: ContainerClient,
+        blob_name: str,
+        content_type: str,
+        content_encoding: str = "",
+        metadata: Dict[str, str] = None,
+        flush_size: int = MAX_BLOCK_SIZE,
+        flush_interval_secs: Optional[float] = None,
+    ):
+        if not 0 < flush_size <= self.MAX_BLOCK_SIZE:
+            raise ValueError(
+                f"flush_size must be between 1 and {self.MAX_BLOCK_SIZE}."
+            )
+        self.container = container
+        self.blob_name = blob_name
+        self.blob = container.get_blob_client(blob_name)
+        self.content_settings = ContentSettings(
+            content_type=content_type, content_encoding=content_encoding
+        )
+        self.metadata = metadata
+        self.flush_size = flush_size
+        self.flush_interval_secs = flush_interval_secs
+        self._buffer = bytearray()
+        self._lock = threading.RLock()
+        self._created = False
+        self._closed = False
+        self._timer: Optional[threading.Timer] = None
+        self._error: Optional[BaseException] = None
+
+    def write(self, data) -> None:
+        """Buffers data to append to the blob.
+
+        :param data: The data to append.
+        :type data: Union[bytes, str]
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        with self._lock:
+            self._raise_error()
+            if self._closed:
+                raise ValueError("AppendBlobWriter is closed")
+            self._buffer += data
+            if len(self._buffer) >= self.flush_size:
+                self._flush()
+            elif self._buffer and self._timer is None and self.flush_interval_secs is not None:
+                self._timer = threading.Timer(self.flush_interval_secs, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Appends the buffered data to the blob."""
+        with self._lock:
+            self._raise_error()
+            self._flush()
+
+    def close(self) -> None:
+        """Appends the buffered data to the blob and closes the writer.
+        If the data cannot be appended, the writer stays open and keeps it,
+        so that closing it again retries the append.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._raise_error()
+            self._flush()
+            self._closed = True
+
+    def __enter__(self) -> "AppendBlobWriter":
+        return self
+
+    def __exit__(self, *exc_details) -> None:
+        self.close()
+
+    def getUri(self, with_sas_token: bool = False):
+        """Gets the full Azure Storage URI for the blob"""
+        if with_sas_token:
+            return get_blob_uri_with_sas_token(self.blob)
+
+        return remove_sas_token(self.blob.url)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        self._create_blob()
+        data, self._buffer = bytes(self._buffer), bytearray()
+        written = 0
+        try:
+            while written < len(data):
+                block = data[written : written + self.MAX_BLOCK_SIZE]
+                self.blob.append_block(block, len(block))
+                written += len(block)
+                logger.debug(f"Appended {len(block)} bytes to blob '{self.blob_name}'")
+        finally:
+            if written < len(data):
+                # Keep the data that was not appended for the next flush
+                self._buffer[:0] = data[written:]
+
+    def _flush_on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            try:
+                self._flush()
+            except Exception as e:
+                logger.warning(f"Failed to append to blob '{self.blob_name}': {e}")
+                self._error = e
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _create_blob(self) -> None:
+        if self._created:
+            return
+        try:
+            props = self.blob.get_blob_properties()
+            if props.blob_type != BlobType.AppendBlob:
+                raise Exception("blob must be an append blob")
+        except exceptions.ResourceNotFoundError:
+            logger.info(
+                f"Creating append blob '{self.blob_name}' in container "
+                + f"'{self.container.container_name}'"
+            )
+            try:
+                self.blob.create_append_blob(
+                    content_settings=self.content_settings,
+                    metadata=self.metadata,
+                    etag="*",
+                    match_condition=MatchConditions.IfMissing,
+                )
+            except exceptions.ResourceExistsError:
+                # Created concurrently
+                pass
+        self._created = True
+
+
 def get_blob_uri_with_sas_token(blob: BlobClient):
     """Returns a URI for the given blob that contains a SAS Token"""
     sas_token = generate_blob_sas(
@@ -180,26 +430,214 @@ def get_blob_uri_with_sas_token(blob: BlobClient):
     return blob.url + "?" + sas_token
 
 
-def download_blob(blob_url: str) -> Any:
+def download_blob(
+    blob_url: str,
+    transport: Optional[HttpTransport] = None,
+    max_concurrency: int = 1,
+    chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+) -> Any:
     """
     Downloads the given blob from the container.
+    With a `max_concurrency` greater than 1, the blob is downloaded as
+    ranges of `chunk_size` bytes, up to `max_concurrency` at a time.
     """
-    blob_client = BlobClient.from_blob_url(blob_url)
+    blob_client = BlobClient.from_blob_url(blob_url, **_client_kwargs(transport))
     logger.info(
         f"Downloading blob '{blob_client.blob_name}'"
         + f"from container '{blob_client.container_name}'"
         + f"on account: '{blob_client.account_name}'"
     )
 
-    response = blob_client.download_blob().readall()
+    if max_concurrency > 1:
+        first_chunk, size, etag = _download_first_range(blob_client, chunk_size)
+        chunks = [first_chunk] + map_concurrently(
+            lambda offset: _download_range(blob_client, offset, chunk_size, size, etag),
+            range(len(first_chunk), size, chunk_size),
+            max_workers=max_concurrency,
+        )
+        # Joining a single chunk returns it without a copy
+        response = b"".join(chunks)
+    else:
+        response = blob_client.download_blob().readall()
     logger.debug(response)
 
     return response
 
 
-def download_blob_properties(blob_url: str) -> BlobProperties:
+def download_blob_into(
+    blob_url: str,
+    buffer: Any = None,
+    transport: Optional[HttpTransport] = None,
+    max_concurrency: Optional[int] = None,
+    chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+) -> memoryview:
+    """
+    Downloads the given blob from the container as ranges of `chunk_size`
+    bytes, up to `max_concurrency` at a time, each written in place into
+    `buffer`, e.g. a `bytearray` or a writable `mmap.mmap`. `buffer` can
+    also be a function that returns a buffer for a given blob size.
+    A buffer of the size of the blob is allocated if none is given.
+
+    Returns a view of the part of the buffer that holds the blob.
+    """
+    blob_client = BlobClient.from_blob_url(blob_url, **_client_kwargs(transport))
+    logger.info(
+        f"Downloading blob '{blob_client.blob_name}'"
+        + f"from container '{blob_client.container_name}'"
+        + f"on account: '{blob_client.account_name}'"
+    )
+
+    first_chunk, size, etag = _download_first_range(blob_client, chunk_size)
+    if buffer is None:
+        buffer = bytearray(size)
+    elif callable(buffer):
+        buffer = buffer(size)
+    view = memoryview(buffer).cast("B")
+    if len(view) < size:
+        raise ValueError(
+            f"Buffer of {len(view)} bytes is too small for blob of {size} bytes."
+        )
+    view[: len(first_chunk)] = first_chunk
+
+    def download_range(offset: int) -> None:
+        data = _download_range(blob_client, offset, chunk_size, size, etag)
+        view[offset : offset + len(data)] = data
+
+    map_concurrently(
+        download_range,
+        range(len(first_chunk), size, chunk_size),
+        max_workers=max_concurrency,
+    )
+    return view[:size]
+
+
+def download_blob_mapped(
+    blob_url: str,
+    transport: Optional[HttpTransport] = None,
+    max_concurrency: Optional[int] = None,
+    chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    directory: Optional[str] = None,
+) -> memoryview:
+    """
+    Downloads the given blob from the container into an anonymous temporary
+    file in `directory`, and returns a read-only view of the memory-mapped file.
+    The payload is paged in from disk as it is read, so it does not count
+    towards the memory of the process, and the file is deleted once the
+    view is released.
+    """
+    def map_temporary_file(size: int):
+        if size == 0:
+            return bytearray()
+        with tempfile.TemporaryFile(dir=directory) as f:
+            f.truncate(size)
+            # The mapping stays valid once the file is closed
+            return mmap.mmap(f.fileno(), size)
+
+    view = download_blob_into(
+        blob_url,
+        map_temporary_file,
+        transport=transport,
+        max_concurrency=max_concurrency,
+        chunk_size=chunk_size,
+    )
+    return view.toreadonly()
+
+
+def download_blob_chunks(
+    blob_url: str,
+    transport: Optional[HttpTransport] = None,
+    max_concurrency: int = 1,
+    chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Downloads the given blob from the container,
+    returning its content as an iterator of chunks.
+    With a `max_concurrency` greater than 1, up to `max_concurrency`
+    ranges of `chunk_size` bytes are downloaded ahead of the consumer,
+    and yielded in order.
+    """
+    blob_client = BlobClient.from_blob_url(blob_url, **_client_kwargs(transport))
+    logger.info(
+        f"Downloading blob '{blob_client.blob_name}'"
+        + f"from container '{blob_client.container_name}'"
+        + f"on account: '{blob_client.account_name}'"
+    )
+
+    if max_concurrency > 1:
+        return _iter_ranges(blob_client, max_concurrency, chunk_size)
+    return blob_client.download_blob().chunks()
+
+
+def _iter_ranges(
+    blob_client: BlobClient,
+    max_concurrency: int,
+    chunk_size: int,
+) -> Iterator[bytes]:
+    first_chunk, size, etag = _download_first_range(blob_client, chunk_size)
+    if first_chunk:
+        yield first_chunk
+    offsets = iter(range(len(first_chunk), size, chunk_size))
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        pending = deque()
+        try:
+            for offset in offsets:
+                pending.append(
+                    executor.submit(_download_range, blob_client, offset, chunk_size, size, etag)
+                )
+                if len(pending) >= max_concurrency:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _download_first_range(blob_client: BlobClient, chunk_size: int) -> Tuple[bytes, int, str]:
+    """Downloads the first range of a blob. Returns its data, the size
+    of the whole blob and its ETag, so that the other ranges are only
+    downloaded if the blob has not changed since."""
+    try:
+        downloader = blob_client.download_blob(offset=0, length=chunk_size)
+    except exceptions.HttpResponseError as e:
+        if e.status_code != 416:
+            raise
+        # A range cannot be requested from an empty blob
+        properties = blob_client.get_blob_properties()
+        return b"", properties.size, properties.etag
+    data = downloader.readall()
+    size = len(data)
+    content_range = downloader.properties.content_range
+    if content_range and "/" in content_range:
+        try:
+            size = int(content_range.rsplit("/", 1)[1])
+        except ValueError:
+            pass
+    return data, size, downloader.properties.etag
+
+
+def _download_range(
+    blob_client: BlobClient, offset: int, chunk_size: int, size: int, etag: str
+) -> bytes:
+    length = min(chunk_size, size - offset)
+    data = blob_client.download_blob(
+        offset=offset,
+        length=length,
+        etag=etag,
+        match_condition=MatchConditions.IfNotModified,
+    ).readall()
+    if len(data) != length:
+        raise exceptions.IncompleteReadError(
+            message=f"Expected {length} bytes at offset {offset}, received {len(data)}."
+        )
+    return data
+
+
+def download_blob_properties(
+    blob_url: str, transport: Optional[HttpTransport] = None
+) -> BlobProperties:
     """Downloads the blob properties from Azure for the given blob URI"""
-    blob_client = BlobClient.from_blob_url(blob_url)
+    blob_client = BlobClient.from_blob_url(blob_url, **_client_kwargs(transport))
     logger.info(
         f"Downloading blob properties '{blob_client.blob_name}'"
         + f"from container '{blob_client.container_name}'"
@@ -212,15 +650,21 @@ def download_blob_properties(blob_url: str) -> BlobProperties:
     return response
 
 
-def download_blob_metadata(blob_url: str) -> Dict[str, str]:
+def download_blob_metadata(
+    blob_url: str, transport: Optional[HttpTransport] = None
+) -> Dict[str, str]:
     """Downloads the blob metadata from the
     blob properties in Azure for the given blob URI"""
-    return download_blob_properties(blob_url).metadata
+    return download_blob_properties(blob_url, transport).metadata
 
 
-def set_blob_metadata(blob_url: str, metadata: Dict[str, str]):
+def set_blob_metadata(
+    blob_url: str,
+    metadata: Dict[str, str],
+    transport: Optional[HttpTransport] = None,
+):
     """Sets the provided dictionary as the metadata on the Azure blob"""
-    blob_client = BlobClient.from_blob_url(blob_url)
+    blob_client = BlobClient.from_blob_url(blob_url, **_client_kwargs(transport))
     logger.info(
         f"Setting blob properties '{blob_client.blob_name}'"
         + f"from container '{blob_client.container_name}' on account:"
@@ -229,6 +673,12 @@ def set_blob_metadata(blob_url: str, metadata: Dict[str, str]):
     return blob_client.set_blob_metadata(metadata=metadata)
 
 
+def _client_kwargs(transport: Optional[HttpTransport]) -> Dict[str, Any]:
+    """Keyword arguments to create a storage client with, to send its
+    requests through the given transport instead of a new connection pool"""
+    return {"transport": transport} if transport is not None else {}
+
+
 def remove_sas_token(sas_uri: str) -> str:
     """Removes the SAS Token from the given URI if it contains one"""
     index = sas_uri.find("?")
@@ -287,31 +737,97 @@ def init_blob_for_streaming_upload(
     return uri
 
 
+class _BlockCheckpoint:
+    """Local record of the blocks of a blob staged so far, so that an
+    interrupted upload can be resumed without staging them again.
+
+    The checkpoint is a JSON lines file: a header identifying the blob and
+    block size, then one line per staged block, appended as blocks are staged.
+    """
+
+    def __init__(self, path: str, blob_name: str, block_size: int):
+        self.path = path
+        self._header = {"blob_name": blob_name, "block_size": block_size}
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the blocks recorded by a previous upload of the same
+        blob, by block id, and starts a new checkpoint if there is none."""
+        blocks = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            if lines and json.loads(lines[0]) == self._header:
+                for line in lines[1:]:
+                    try:
+                        block = json.loads(line)
+                    except ValueError:
+                        # Line cut short by the interruption
+                        break
+                    blocks[block["id"]] = block
+                return blocks
+        except (OSError, ValueError):
+            pass
+        with self._lock, open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self._header) + "\n")
+        return blocks
+
+    def record(self, id: str, offset: int, data) -> None:
+        """Records that a block was staged."""
+        line = json.dumps({
+            "id": id,
+            "offset": offset,
+            "length": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+        })
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    @staticmethod
+    def matches(block: Optional[Dict[str, Any]], offset: int, data) -> bool:
+        """Checks that a recorded block holds the given data."""
+        return (
+            block is not None
+            and block["offset"] == offset
+            and block["length"] == len(data)
+            and block["sha256"] == hashlib.sha256(data).hexdigest()
+        )
+
+    def remove(self) -> None:
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
 class StreamedBlobState(str, Enum):
     not_initialized = 0
     uploading = 1
     committed = 2
 
 
-class StreamedBlob:
-    """Class that provides a state machine for writing
-    blobs using the Azure Block Blob API
+# Status codes of the responses worth retrying, besides the 5xx ones
+_TRANSIENT_STATUS_CODES = (408, 429)
 
-    Internally implements a state machine for uploading blob data.
-    To use, start calling `upload_data()`
-    to add data blocks. Each call to `upload_data()`
-    will synchronously upload an individual block to Azure.
-    Once all blocks have been added, call `commit()`
-    to commit the blocks and make the blob available/readable.
 
-    :param container: The container client that the blob will be uploaded to.
-        Container must already exist in a storage.
-    :param blob_name: The name of the blob
-        (including optional path) within the blob container
-    :param content_type: The HTTP content type to apply to the blob metadata
-    :param content_encoding: The HTTP
-        content encoding to apply to the blob metadata
-    """
+def _is_transient_error(error: Exception) -> bool:
+    """Whether a request that failed with the error may succeed if sent again,
+    e.g. not if it was rejected for its credentials or content."""
+    if isinstance(error, (exceptions.ServiceRequestError, exceptions.ServiceResponseError)):
+        return True
+    if isinstance(error, exceptions.HttpResponseError):
+        status_code = error.status_code or 0
+        return status_code in _TRANSIENT_STATUS_CODES or status_code >= 500
+    return False
+
+
+class _StreamedBlobBase:
+    """State and block planning shared by the synchronous and asynchronous
+    StreamedBlob, which only differ in how blocks are read and staged."""
+
+    DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+
+    # Delay before the first retry of a block, doubled on each retry
+    _RETRY_BACKOFF_SECS = 0.5
 
     def __init__(
         self,
@@ -319,7 +835,15 @@ class StreamedBlob:
         blob_name: str,
         content_type: str,
         content_encoding: str,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        max_workers: Optional[int] = None,
+        max_retries: int = 3,
+        checkpoint_path: Optional[str] = None,
     ):
+        if block_size < 1:
+            raise ValueError("block_size must be greater than 0.")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be greater than 0.")
         self.container = container
         self.blob_name = blob_name
         self.content_settings = ContentSettings(
@@ -328,45 +852,94 @@ class StreamedBlob:
         self.state = StreamedBlobState.not_initialized
         self.blob = container.get_blob_client(blob_name)
         self.blocks = []
+        self.block_size = block_size
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self.max_retries = max_retries
+        # Number of blocks found already staged by a previous upload
+        self.resumed_blocks = 0
+        self._offset = 0
+        self._checkpoint = (
+            _BlockCheckpoint(checkpoint_path, blob_name, block_size)
+            if checkpoint_path is not None
+            else None
+        )
+        self._staged_blocks: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _split_data(self, data) -> Optional[List[memoryview]]:
+        """Splits data held in memory into blocks of up to `block_size` bytes,
+        or returns None if data is a stream."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            return None
+        view = memoryview(data)
+        # An empty block still marks the blob as being uploaded
+        return (
+            [view[i : i + self.block_size] for i in range(0, len(view), self.block_size)]
+            or [view]
+        )
 
-    def upload_data(self, data):
-        """Synchronously uploads a block to the given block blob in Azure
+    def _buffer_blocks(self, buffer: bytearray, chunk) -> Iterator[bytes]:
+        """Adds a chunk of a stream to the buffer and takes the full blocks
+        out of it."""
+        buffer += chunk
+        while len(buffer) >= self.block_size:
+            yield bytes(buffer[: self.block_size])
+            del buffer[: self.block_size]
 
-        :param data: The data to be uploaded as a block.
-        :type data: Union[Iterable[AnyStr], IO[AnyStr]]
-        """
+    def _start_upload(self) -> None:
+        if self.state == StreamedBlobState.committed:
+            raise Exception("StreamedBlob is already committed")
         logger.info(
             f"Streaming blob '{self.blob_name}' to container"
             + f"'{self.container.container_name}'"
             + f"on account: '{self.container.account_name}'"
         )
-
         self.state = StreamedBlobState.uploading
+
+    def _add_block(self, data) -> Tuple[str, int]:
+        """Assigns the next block id and offset to a block of data."""
+        # Ids are assigned in stream order, so that the blocks are committed
+        # in that order whatever order they are staged in
         id = self._get_next_block_id()
-        logger.debug(f"Uploading block '{id}' to {self.blob_name}")
-        self.blob.stage_block(id, data, length=len(data))
         self.blocks.append(id)
+        offset = self._offset
+        self._offset += len(data)
+        return id, offset
+
+    def _resume(self, recorded: Dict[str, Dict[str, Any]], uncommitted: List[Any]) -> None:
+        """Keeps the blocks recorded in the checkpoint that are still staged."""
+        # Uncommitted blocks are discarded by the service after a week
+        sizes = {block.id: block.size for block in uncommitted}
+        self._staged_blocks = {
+            id: block for id, block in recorded.items()
+            if sizes.get(id) == block["length"]
+        }
+        if recorded:
+            logger.info(
+                f"Resuming upload of {self.blob_name} with "
+                f"{len(self._staged_blocks)} blocks already staged"
+            )
+
+    def _get_retry_delay(self, id: str, attempt: int, error: Exception) -> Optional[float]:
+        """Returns how long to wait before staging a block again after it
+        failed, or None if the error is not transient or once the block
+        has been retried `max_retries` times."""
+        if attempt >= self.max_retries or not _is_transient_error(error):
+            return None
+        delay = self._RETRY_BACKOFF_SECS * 2 ** attempt
+        logger.warning(
+            f"Failed to upload block '{id}' to {self.blob_name}, "
+            f"retrying in {delay} seconds: {error}"
+        )
+        return delay
 
-    def commit(self, metadata: Dict[str, str] = None):
-        """Synchronously commits all previously
-        uploaded blobs to the block blob
-
-        :param metadata: Optional dictionary of
-               metadata to be applied to the block blob
-        """
+    def _check_commit(self) -> None:
         if self.state == StreamedBlobState.not_initialized:
             raise Exception("StreamedBlob cannot commit before uploading data")
         elif self.state == StreamedBlobState.committed:
             raise Exception("StreamedBlob is already committed")
-
         logger.debug(f"Committing {len(self.blocks)} blocks {self.blob_name}")
-        self.blob.commit_block_list(
-            self.blocks,
-            content_settings=self.content_settings,
-            metadata=metadata,
-        )
-        self.state = StreamedBlobState.committed
-        logger.debug(f"Committed {self.blob_name}")
 
     def getUri(self, with_sas_token: bool = False):
         """Gets the full Azure Storage URI for the
@@ -380,3 +953,158 @@ class StreamedBlob:
 
     def _get_next_block_id(self):
         return f"{len(self.blocks):10}"
+
+
+class StreamedBlob(_StreamedBlobBase):
+    """Class that provides a state machine for writing
+    blobs using the Azure Block Blob API
+
+    Internally implements a state machine for uploading blob data.
+    To use, start calling `upload_data()` or `upload_stream()`
+    to add data. Data is split into blocks of up to `block_size` bytes,
+    which are staged concurrently by up to `max_workers` threads, and each
+    call returns once all of its blocks have been staged. A block that
+    fails to be staged with a transient error, i.e. a connection error or
+    a 408, 429 or 5xx response, is retried on its own, up to `max_retries`
+    times. Other errors are raised right away.
+    Once all data has been added, call `commit()`
+    to commit the blocks and make the blob available/readable.
+
+    Staging blocks is retried by the StreamedBlob only: the retry policy of
+    the storage client is disabled for these requests, so that the retries
+    of the two layers do not multiply. Committing the blocks is retried by
+    the retry policy of the storage client.
+
+    With a `checkpoint_path`, the staged blocks are recorded in a local file,
+    so that if the upload is interrupted, uploading the same data again with
+    a new `StreamedBlob` for the same blob and checkpoint skips the blocks
+    that are still staged in the storage account. The file is deleted once
+    the blob is committed.
+
+    :param container: The container client that the blob will be uploaded to.
+        Container must already exist in a storage.
+    :param blob_name: The name of the blob
+        (including optional path) within the blob container
+    :param content_type: The HTTP content type to apply to the blob metadata
+    :param content_encoding: The HTTP
+        content encoding to apply to the blob metadata
+    :param block_size: Maximum size of a block in bytes, defaults to 4 MiB
+    :param max_workers: Maximum number of blocks staged concurrently,
+        defaults to 8
+    :param max_retries: Number of times a block is retried
+        after failing to be staged, defaults to 3
+    :param checkpoint_path: Path of the file recording the staged blocks,
+        to resume an interrupted upload, defaults to None
+    """
+
+    def upload_data(self, data):
+        """Synchronously uploads data to the given block blob in Azure,
+        as one or more blocks of up to `block_size` bytes
+
+        :param data: The data to be uploaded.
+        :type data: Union[bytes, str, Iterable[bytes], IO[bytes]]
+        """
+        chunks = self._split_data(data)
+        if chunks is not None:
+            self._upload_blocks(chunks)
+        else:
+            self.upload_stream(data)
+
+    def upload_stream(self, stream):
+        """Synchronously uploads a stream of arbitrary size to the given block
+        blob in Azure, reading it one block at a time. At most twice as many
+        blocks as `max_workers` are held in memory at once.
+
+        :param stream: File-like object opened in binary mode,
+            or iterable of bytes chunks of any size
+        :type stream: Union[IO[bytes], Iterable[bytes]]
+        """
+        self._upload_blocks(self._read_blocks(stream))
+
+    def _read_blocks(self, stream) -> Iterator[bytes]:
+        if hasattr(stream, "read"):
+            while True:
+                block = stream.read(self.block_size)
+                if not block:
+                    return
+                yield block
+        else:
+            buffer = bytearray()
+            for chunk in stream:
+                yield from self._buffer_blocks(buffer, chunk)
+            if buffer:
+                yield bytes(buffer)
+
+    def _upload_blocks(self, chunks) -> None:
+        self._start_upload()
+        max_pending = 2 * self.max_workers
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = set()
+            try:
+                for chunk in chunks:
+                    id, offset = self._add_block(chunk)
+                    if self._is_block_staged(id, offset, chunk):
+                        self.resumed_blocks += 1
+                        continue
+                    pending.add(executor.submit(self._stage_block, id, chunk, offset))
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                for future in pending:
+                    future.result()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+    def _is_block_staged(self, id: str, offset: int, data) -> bool:
+        """Checks if a block with the same data was staged by a previous
+        upload recorded in the checkpoint, and is still staged."""
+        if self._checkpoint is None:
+            return False
+        if self._staged_blocks is None:
+            recorded = self._checkpoint.load()
+            uncommitted = []
+            if recorded:
+                try:
+                    _, uncommitted = self.blob.get_block_list("uncommitted")
+                except exceptions.ResourceNotFoundError:
+                    pass
+            self._resume(recorded, uncommitted)
+        return _BlockCheckpoint.matches(self._staged_blocks.get(id), offset, data)
+
+    def _stage_block(self, id: str, data, offset: int = 0) -> None:
+        attempt = 0
+        while True:
+            try:
+                logger.debug(f"Uploading block '{id}' to {self.blob_name}")
+                # Failed blocks are retried by this loop only
+                self.blob.stage_block(id, data, length=len(data), retry_total=0)
+                if self._checkpoint is not None:
+                    self._checkpoint.record(id, offset, data)
+                return
+            except exceptions.AzureError as e:
+                delay = self._get_retry_delay(id, attempt, e)
+                if delay is None:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+
+    def commit(self, metadata: Dict[str, str] = None):
+        """Synchronously commits all previously
+        uploaded blobs to the block blob
+
+        :param metadata: Optional dictionary of
+               metadata to be applied to the block blob
+        """
+        self._check_commit()
+        self.blob.commit_block_list(
+            self.blocks,
+            content_settings=self.content_settings,
+            metadata=metadata,
+        )
+        self.state = StreamedBlobState.committed
+        if self._checkpoint is not None:
+            self._checkpoint.remove()
+        logger.debug(f"Committed {self.blob_name}")
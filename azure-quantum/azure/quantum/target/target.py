@@ -2,15 +2,19 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 ##
-from typing import TYPE_CHECKING, Any, Dict, Union, Type, Optional, Protocol, runtime_checkable
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple, Union, Type, Optional, Protocol, runtime_checkable
 from dataclasses import dataclass
 import io
 import json
+import mmap
+import os
 import abc
 import warnings
 import copy
 
 from azure.quantum._client.models import TargetStatus
+from azure.quantum._compression import GZIP, compress_payload
+from azure.quantum._parallel import map_concurrently
 from azure.quantum.job.job import Job
 from azure.quantum.job.session import SessionHost
 from azure.quantum.job.base_job import ContentType
@@ -57,6 +61,9 @@ class Target(abc.ABC, SessionHost):
     # If None, target will not pass this input parameter. 
     _SHOTS_PARAM_NAME = "shots"
 
+    # Content encodings of compressed input data that the provider accepts.
+    _SUPPORTED_COMPRESSIONS: Tuple[str, ...] = (GZIP,)
+
     def __init__(
         self,
         workspace: "Workspace",
@@ -70,6 +77,7 @@ class Target(abc.ABC, SessionHost):
         average_queue_time: Union[float, None] = None,
         current_availability: str = "",
         target_profile: Union[str, "TargetProfile"] = "Base",
+        compression: Optional[str] = None,
     ):
         """
         Initializes a new target.
@@ -96,6 +104,9 @@ class Target(abc.ABC, SessionHost):
         :type current_availability: str
         :param target_profile: Target QIR profile.
         :type target_profile: str | TargetProfile
+        :param compression: Compress input data with "gzip" before uploading it,
+            defaults to None
+        :type compression: str
         """
         if not provider_id and "." in name:
             provider_id = name.split(".")[0]
@@ -110,6 +121,7 @@ class Target(abc.ABC, SessionHost):
         self._average_queue_time = average_queue_time
         self._current_availability = current_availability
         self.target_profile = target_profile
+        self.compression = compression
 
     def __repr__(self):
         return f"<Target name=\"{self.name}\", \
@@ -186,13 +198,15 @@ target '{self.name}' of provider '{self.provider_id}' not found."
     def _encode_input_data(data: Any) -> bytes:
         """Encode input data to bytes.
         If the data is already in bytes format, return it.
+        File paths, memoryviews and mmaps are also returned as is,
+        to be uploaded without being copied into memory.
 
         :param data: Input data
         :type data: Any
         :return: Encoded input data
         :rtype: bytes
         """
-        if isinstance(data, bytes):
+        if isinstance(data, (bytes, os.PathLike, memoryview, mmap.mmap)):
             return data
         else:
             stream = io.BytesIO()
@@ -218,7 +232,10 @@ target '{self.name}' of provider '{self.provider_id}' not found."
         """Submit input data and return Job.
 
         Provide input_data_format, output_data_format and content_type
-        keyword arguments to override default values.
+        keyword arguments to override default values. Provide a compression
+        keyword argument ("gzip") to compress the input data before uploading
+        it; the `compression_stats` of the returned job then give its size
+        before and after compression.
 
         :param input_data: Input data
         :type input_data: Any
@@ -313,9 +330,28 @@ target '{self.name}' of provider '{self.provider_id}' not found."
                 input_params[self.__class__._SHOTS_PARAM_NAME] = final_shots
 
         encoding = kwargs.pop("encoding", self.encoding)
+        compression = kwargs.pop("compression", self.compression)
         blob = self._encode_input_data(data=input_data)
+        compression_stats = None
+        if compression:
+            if encoding:
+                raise ValueError(
+                    f"Input data with encoding '{encoding}' can not be compressed again."
+                )
+            if compression not in self._SUPPORTED_COMPRESSIONS:
+                raise ValueError(
+                    f"Target '{self.name}' does not accept input data compressed "
+                    f"with '{compression}', expected one of "
+                    f"{', '.join(self._SUPPORTED_COMPRESSIONS)}."
+                )
+            if isinstance(blob, os.PathLike):
+                with open(blob, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    blob, compression_stats = compress_payload(mapped, compression)
+            else:
+                blob, compression_stats = compress_payload(blob, compression)
+            encoding = compression
         job_cls = type(self)._get_job_class()
-        return job_cls.from_input_data(
+        job = job_cls.from_input_data(
             workspace=self.workspace,
             name=name,
             target=self.name,
@@ -331,6 +367,45 @@ target '{self.name}' of provider '{self.provider_id}' not found."
             tags=tags,
             **kwargs
         )
+        job.compression_stats = compression_stats
+        return job
+
+    def submit_many(
+        self,
+        inputs: Iterable[Any],
+        name: str = "azure-quantum-job",
+        max_workers: Optional[int] = None,
+        return_exceptions: bool = False,
+        **kwargs
+    ) -> List[Union[Job, Exception]]:
+        """Submit several inputs concurrently and return their Jobs.
+
+        Each input goes through the same steps as :meth:`submit`
+        (container URI, input upload and job creation), with up to
+        `max_workers` inputs in flight at a time.
+
+        :param inputs: Input data for each job
+        :type inputs: Iterable[Any]
+        :param name: Job name, used for all jobs
+        :type name: str
+        :param max_workers: Maximum number of concurrent submissions, defaults to 8
+        :type max_workers: int
+        :param return_exceptions: If True, the exception raised while submitting
+            an input is returned in its place instead of being raised
+        :type return_exceptions: bool
+        :param kwargs: Other arguments passed to :meth:`submit` for every input
+        :return: Azure Quantum jobs, in the order of `inputs`
+        :rtype: list[azure.quantum.job.Job]
+        """
+        def _submit(input_data):
+            return self.submit(input_data, name=name, **kwargs)
+
+        return map_concurrently(
+            _submit,
+            inputs,
+            max_workers=max_workers,
+            return_exceptions=return_exceptions,
+        )
 
     def make_params(self):
         """
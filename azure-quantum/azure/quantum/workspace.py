@@ -8,13 +8,16 @@ an Azure Quantum Workspace.
 """
 
 from __future__ import annotations
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
+import threading
+import time
 from urllib.parse import quote
 from typing import (
     Any,
     Dict,
     Iterable,
+    Iterator,
     List,
     Optional,
     TYPE_CHECKING,
@@ -23,35 +26,23 @@ from typing import (
 )
 from typing_extensions import Self
 from azure.core.exceptions import HttpResponseError
-from azure.core.paging import ItemPaged
 from azure.quantum._client import WorkspaceClient
-from azure.quantum._client.models import JobDetails, ItemDetails, SessionDetails
-from azure.quantum._client.operations._operations import (
-    ServicesJobsOperations,
-    ServicesStorageOperations,
-    ServicesQuotasOperations,
-    ServicesSessionsOperations,
-    ServicesTopLevelItemsOperations
-)
 from azure.quantum._client.models import (
     BlobDetails,
     JobStatus,
-    JobUpdateOptions,
     Priority,
+    ProviderStatus,
     TargetStatus,
 )
 from azure.quantum import Job, Session
 from azure.quantum.job.workspace_item_factory import WorkspaceItemFactory
-from azure.quantum._workspace_connection_params import (
-    WorkspaceConnectionParams
-)
-from azure.quantum._constants import (
-    ConnectionConstants,
-)
-from azure.quantum.storage import (
-    get_container_uri,
-)
 from azure.quantum._mgmt_client import WorkspaceMgmtClient
+from azure.quantum._parallel import map_concurrently
+from azure.quantum._target_catalog import DEFAULT_TTL_SECS, TargetCatalog
+from azure.quantum._transport import SharedTransport
+from azure.quantum._workspace_base import WorkspaceBase
+from azure.quantum.job.input_store import InputStore
+from azure.quantum.job.job_watcher import JobWatcher
 if TYPE_CHECKING:
     from azure.quantum.target import Target
 
@@ -61,7 +52,7 @@ __all__ = ["Workspace"]
 
 # pylint: disable=line-too-long
 # pylint: disable=too-many-public-methods
-class Workspace:
+class Workspace(WorkspaceBase):
     """
     Represents an Azure Quantum workspace.
 
@@ -110,17 +101,50 @@ class Workspace:
         Defaults to \"DefaultAzureCredential\", which will attempt multiple
         forms of authentication.
 
+        Pass the same :class:`~azure.quantum.credential_manager.CredentialManager`
+        to several workspaces to share their access tokens.
+
     :param user_agent:
         Add the specified value as a prefix to the HTTP User-Agent header
         when communicating to the Azure Quantum service.
+
+    :param connection_pool_size:
+        Maximum number of connections kept alive per host. The connections
+        are shared by the Azure Quantum service, Azure Resource Manager and
+        storage requests of the workspace, which are sent over HTTP/1.1.
+        Defaults to 32.
+
+    :param storage_sas_lifetime:
+        Lifetime of the SAS tokens signed with the key of the `storage`
+        account. Defaults to 14 days.
+
+    :param target_cache_ttl_secs:
+        How long the targets listed from the service are reused for,
+        in seconds, before they are listed again. Defaults to 60.
+
+    :param target_cache_background_refresh:
+        List stale targets again in a background thread, returning the
+        stale ones in the meantime instead of waiting for the service.
+        Defaults to False.
+
+    :param discovery_cache_path:
+        Path of a JSON file where the subscription, resource group, location
+        and endpoint of the workspace are stored once looked up from Azure
+        Resource Manager, so that other processes connecting to the same
+        workspace do not look it up again. Can be shared by several
+        workspaces and processes. Disabled by default.
+
+    :param discovery_cache_ttl_secs:
+        How long the workspace details in `discovery_cache_path` are
+        reused for, in seconds. Defaults to 24 hours.
     """
     
-    # Internal parameter names
-    _FROM_CONNECTION_STRING_PARAM = '_from_connection_string'
-    _QUANTUM_ENDPOINT_PARAM = '_quantum_endpoint'
-    _WORKSPACE_KIND_PARAM = '_workspace_kind'
-    _MGMT_CLIENT_PARAM = '_mgmt_client'
-    
+    # Maximum number of job ids combined into a single list filter
+    # when refreshing a set of jobs
+    _REFRESH_JOBS_BATCH_SIZE = 50
+
+    _SHARED_TRANSPORT_CLS = SharedTransport
+
     def __init__(
         self,
         subscription_id: Optional[str] = None,
@@ -131,137 +155,86 @@ class Workspace:
         location: Optional[str] = None,
         credential: Optional[object] = None,
         user_agent: Optional[str] = None,
+        connection_pool_size: Optional[int] = None,
+        storage_sas_lifetime: Optional[timedelta] = None,
+        target_cache_ttl_secs: Optional[float] = None,
+        target_cache_background_refresh: bool = False,
+        discovery_cache_path: Optional[str] = None,
+        discovery_cache_ttl_secs: Optional[float] = None,
         **kwargs: Any,
     ) -> None:
-        # Extract internal params before passing kwargs to WorkspaceConnectionParams
-        # Param to track whether the workspace was created from a connection string
-        from_connection_string = kwargs.pop(Workspace._FROM_CONNECTION_STRING_PARAM, False)
-        # In case from connection string, quantum_endpoint must be passed
-        quantum_endpoint = kwargs.pop(Workspace._QUANTUM_ENDPOINT_PARAM, None)
-        workspace_kind = kwargs.pop(Workspace._WORKSPACE_KIND_PARAM, None)
-        # Params to pass a mock in tests
-        self._mgmt_client = kwargs.pop(Workspace._MGMT_CLIENT_PARAM, None)
-        
-        connection_params = WorkspaceConnectionParams(
-            location=location,
+        super().__init__(
             subscription_id=subscription_id,
             resource_group=resource_group,
-            workspace_name=name,
-            credential=credential,
+            name=name,
+            storage=storage,
             resource_id=resource_id,
-            quantum_endpoint=quantum_endpoint,
+            location=location,
+            credential=credential,
             user_agent=user_agent,
-            workspace_kind=workspace_kind,
+            connection_pool_size=connection_pool_size,
+            storage_sas_lifetime=storage_sas_lifetime,
+            discovery_cache_path=discovery_cache_path,
+            discovery_cache_ttl_secs=discovery_cache_ttl_secs,
             **kwargs
-        ).default_from_env_vars()
-
-        logger.info("Using %s environment.", connection_params.environment)
-
-        connection_params.assert_have_enough_for_discovery()
-
-        connection_params.on_new_client_request = self._on_new_client_request
-
-        self._connection_params = connection_params
-        self._storage = storage
-
-        if not self._mgmt_client:
-            credential = connection_params.get_credential_or_default()
-            self._mgmt_client = WorkspaceMgmtClient(
-                credential=credential, 
-                base_url=connection_params.arm_endpoint, 
-                user_agent=connection_params.get_full_user_agent(),
-            )
-        
-        # pylint: disable=protected-access
-        using_connection_string = (
-            from_connection_string
-            or connection_params._used_connection_string
         )
-
-        # Populate workspace details from ARG if not using connection string and 
-        # name is provided but missing subscription and/or resource group
-        if not using_connection_string \
-           and not connection_params.can_build_resource_id():
-            self._mgmt_client.load_workspace_from_arg(connection_params)
-
-        # Populate workspace details from ARM if not using connection string and not loaded from ARG
-        if not using_connection_string and not connection_params.is_complete():
-            self._mgmt_client.load_workspace_from_arm(connection_params)
-        
-        connection_params.assert_complete()
-
-        # Create WorkspaceClient
-        self._client = self._create_client()
-
-    def _on_new_client_request(self) -> None:
-        """
-        An internal callback method used by the WorkspaceConnectionParams
-        to ask the Workspace to recreate the underlying Azure SDK REST API client.
-        This is used when some value (such as the UserAgent) has changed
-        in the WorkspaceConnectionParams and requires the client to be
-        recreated.
-        """
-        self._client = self._create_client()
-
-    @property
-    def location(self) -> str:
-        """
-        Returns the Azure location of the Quantum Workspace.
-
-        :return: Azure location name.
-        :rtype: str
-        """
-        return self._connection_params.location
-
-    @property
-    def subscription_id(self) -> str:
-        """
-        Returns the Azure Subscription ID of the Quantum Workspace.
-
-        :return: Azure Subscription ID.
-        :rtype: str
-        """
-        return self._connection_params.subscription_id
+        # The management client is entered and closed with the workspace,
+        # even if the workspace details did not have to be looked up
+        self._get_mgmt_client()
+
+        self._target_catalog = TargetCatalog(
+            self._list_providers,
+            ttl_secs=DEFAULT_TTL_SECS if target_cache_ttl_secs is None else target_cache_ttl_secs,
+            background_refresh=target_cache_background_refresh,
+        )
+        self._input_store: Optional[InputStore] = None
+        self._job_watcher: Optional[JobWatcher] = None
+        self._job_watcher_lock = threading.Lock()
 
     @property
-    def resource_group(self) -> str:
+    def target_catalog(self) -> TargetCatalog:
         """
-        Returns the Azure Resource Group of the Quantum Workspace.
+        Returns the cache of the targets available in this workspace,
+        shared by `get_targets`, `Target.refresh` and the Qiskit and Cirq
+        integrations. Call `invalidate()` on it to list the targets again
+        on next use, and set its `ttl_secs` and `background_refresh`
+        attributes to change how often and how they are listed.
 
-        :return: Azure Resource Group name.
-        :rtype: str
+        :return: Cache of the workspace targets.
+        :rtype: TargetCatalog
         """
-        return self._connection_params.resource_group
+        return self._target_catalog
 
     @property
-    def name(self) -> str:
+    def input_store(self) -> Optional[InputStore]:
         """
-        Returns the Name of the Quantum Workspace.
+        Returns the content-addressed store job input data is uploaded to.
+        Disabled by default: set it to an `InputStore()` so that payloads
+        submitted several times are uploaded once and shared by the jobs.
+        The store trusts the blobs it has found or uploaded for `ttl_secs`
+        (one day by default) without checking the container again, so jobs
+        submitted after a blob is deleted from the container within that
+        time fail, unless the store is cleared with `clear()`.
 
-        :return: Azure Quantum Workspace name.
-        :rtype: str
+        :return: Store of job input data.
+        :rtype: Optional[InputStore]
         """
-        return self._connection_params.workspace_name
+        return self._input_store
 
-    @property
-    def credential(self) -> Any:
-        """
-        Returns the Credential used to connect to the Quantum Workspace.
-
-        :return: Azure SDK Credential from [Azure.Identity](https://learn.microsoft.com/python/api/overview/azure/identity-readme?view=azure-python#credential-classes).
-        :rtype: typing.Any
-        """
-        return self._connection_params.credential
+    @input_store.setter
+    def input_store(self, value: Optional[InputStore]) -> None:
+        self._input_store = value
 
     @property
-    def storage(self) -> str:
+    def job_watcher(self) -> JobWatcher:
         """
-        Returns the Azure Storage account name associated with the Quantum Workspace.
-
-        :return: Azure Storage account name.
-        :rtype: str
+        Background service that polls the status of the jobs
+        registered with it, created on first use and stopped by :meth:`close`.
         """
-        return self._storage
+        with self._job_watcher_lock:
+            if self._job_watcher is None:
+                self._job_watcher = JobWatcher(self)
+            return self._job_watcher
 
     def _create_client(self) -> WorkspaceClient:
         """"
@@ -271,117 +244,28 @@ class Workspace:
         :rtype: WorkspaceClient
         """
         connection_params = self._connection_params
-        kwargs = {}
-        if connection_params.api_version:
-            kwargs["api_version"] = connection_params.api_version
         client = WorkspaceClient(
             region=connection_params.location,
-            credential=connection_params.get_credential_or_default(),
             subscription_id=connection_params.subscription_id,
             resource_group_name=connection_params.resource_group,
             workspace_name=connection_params.workspace_name,
-            user_agent=connection_params.get_full_user_agent(),
-            credential_scopes = [ConnectionConstants.DATA_PLANE_CREDENTIAL_SCOPE],
-            endpoint=connection_params.quantum_endpoint,
-            authentication_policy=connection_params.get_auth_policy(),
-            **kwargs
+            transport=self._shared_transport.create_transport(),
+            **self._get_client_kwargs()
         )
         return client
 
-    @property
-    def user_agent(self) -> str:
+    def _create_mgmt_client(self) -> WorkspaceMgmtClient:
         """
-        Returns the Workspace's UserAgent string that is sent to
-        the service via the UserAgent header.
-
-        :return: User Agent string.
-        :rtype: str
-        """
-        return self._connection_params.get_full_user_agent()
-
-    def append_user_agent(self, value: str) -> None:
-        """
-        Append a new value to the Workspace's UserAgent.
-        The values are appended using a dash.
-
-        :param value:
-            UserAgent value to add, e.g. "azure-quantum-<plugin>"
-        """
-        self._connection_params.append_user_agent(value=value)
-
-    @classmethod
-    def from_connection_string(cls, connection_string: str, **kwargs) -> Workspace:
+        Creates the Azure Resource Manager client,
+        that shares the connections of the other clients of the workspace.
         """
-        Creates a new Azure Quantum Workspace client from a connection string.
-
-        :param connection_string:
-            A valid connection string, usually obtained from the
-            `Quantum Workspace -> Operations -> Access Keys` blade in the Azure Portal.
-
-        :return: New Azure Quantum Workspace client.
-        :rtype: Workspace
-        """
-        connection_params = WorkspaceConnectionParams(connection_string=connection_string)
-        kwargs[cls._FROM_CONNECTION_STRING_PARAM] = True
-        kwargs[cls._QUANTUM_ENDPOINT_PARAM] = connection_params.quantum_endpoint
-        kwargs[cls._WORKSPACE_KIND_PARAM] = connection_params.workspace_kind.value if connection_params.workspace_kind else None
-        return cls(
-            subscription_id=connection_params.subscription_id,
-            resource_group=connection_params.resource_group,
-            name=connection_params.workspace_name,
-            location=connection_params.location,
+        connection_params = self._connection_params
+        return WorkspaceMgmtClient(
             credential=connection_params.get_credential_or_default(),
-            **kwargs)
-
-    def _get_top_level_items_client(self) -> ServicesTopLevelItemsOperations:
-        """
-        Returns the internal Azure SDK REST API client
-        for the `{workspace}/topLevelItems` API.
-
-        :return: REST API client for the `topLevelItems` API.
-        :rtype: ServicesTopLevelItemsOperations
-        """
-        return self._client.services.top_level_items
-
-    def _get_sessions_client(self) -> ServicesSessionsOperations:
-        """
-        Returns the internal Azure SDK REST API client
-        for the `{workspace}/sessions` API.
-
-        :return: REST API client for the `sessions` API.
-        :rtype: ServicesSessionsOperations
-        """
-        return self._client.services.sessions
-
-    def _get_jobs_client(self) -> ServicesJobsOperations:
-        """
-        Returns the internal Azure SDK REST API client
-        for the `{workspace}/jobs` API.
-
-        :return: REST API client for the `jobs` API.
-        :rtype: ServicesJobsOperations
-        """
-        return self._client.services.jobs
-
-    def _get_workspace_storage_client(self) -> ServicesStorageOperations:
-        """
-        Returns the internal Azure SDK REST API client
-        for the `{workspace}/storage` API.
-
-        :return: REST API client for the `storage` API.
-        :rtype: ServicesStorageOperations
-        """
-        return self._client.services.storage
-
-    def _get_quotas_client(self) -> ServicesQuotasOperations:
-        """
-        Returns the internal Azure SDK REST API client
-        for the `{workspace}/quotas` API.
-
-        :return: REST API client for the `quotas` API.
-        :rtype: ServicesQuotasOperations
-        """
-        return self._client.services.quotas
+            base_url=connection_params.arm_endpoint,
+            user_agent=connection_params.get_full_user_agent(),
+            transport=self._shared_transport.create_transport(),
+        )
 
     def _get_linked_storage_sas_uri(
         self,
@@ -391,6 +275,8 @@ class Workspace:
         """
         Calls the service and returns a container/blob SAS URL
         for the Storage associated with the Quantum Workspace.
+        If the workspace was given a `storage` connection string,
+        the SAS URL is signed locally with its key instead.
 
         :param container_name:
             The name of the storage container.
@@ -401,6 +287,10 @@ class Workspace:
         :return: Storage Account SAS URL to a container or blob.
         :rtype: str
         """
+        sas_uri = self._get_known_sas_uri(container_name, blob_name)
+        if sas_uri is not None:
+            return sas_uri
+
         client = self._get_workspace_storage_client()
         blob_details = BlobDetails(
             container_name=container_name, blob_name=blob_name
@@ -411,8 +301,8 @@ class Workspace:
             self.name, 
             blob_details=blob_details)
 
-        logger.debug("Container URI from service: %s", container_uri)
-        return container_uri.sas_uri
+        return self._cache_sas_uri(container_name, blob_name, container_uri)
+
 
     def submit_job(self, job: Job) -> Job:
         """
@@ -434,6 +324,40 @@ class Workspace:
         )
         return Job(self, details)
 
+    def submit_jobs(
+        self,
+        jobs: Iterable[Job],
+        max_workers: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Union[Job, Exception]]:
+        """
+        Submits the given jobs concurrently, for example jobs created with
+        `Job.from_storage_uri(..., submit_job=False)`.
+
+        :param jobs:
+            Jobs to submit.
+
+        :param max_workers:
+            Maximum number of concurrent submissions. Defaults to 8.
+
+        :param return_exceptions:
+            If `True`, the exception raised while submitting a job is returned
+            in its place instead of being raised. Defaults to `False`.
+
+        :return: The submitted jobs (or exceptions), in the order of `jobs`.
+        :rtype: typing.List[Job]
+        """
+        def _submit(job: Job) -> Job:
+            job.submit()
+            return job
+
+        return map_concurrently(
+            _submit,
+            jobs,
+            max_workers=max_workers,
+            return_exceptions=return_exceptions,
+        )
+
     def cancel_job(self, job: Job) -> Job:
         """
         Requests the Workspace to cancel the
@@ -498,21 +422,10 @@ class Workspace:
         :return: Azure Quantum Job with updated details.
         :rtype: Job
         """
-        if name is None and priority is None and tags is None:
-            raise ValueError(
-                "At least one of 'name', 'priority' or 'tags' must be specified.")
-
+        update_options = self._create_job_update_options(name, priority, tags)
         client = self._get_jobs_client()
         job_id = job.id
 
-        update_options = JobUpdateOptions()
-        if name is not None:
-            update_options.name = name
-        if priority is not None:
-            update_options.priority = priority
-        if tags is not None:
-            update_options.tags = tags
-
         client.update(
             self.subscription_id,
             self.resource_group,
@@ -612,35 +525,136 @@ class Workspace:
 
         return result
 
-    def list_jobs_paginated( 
+    def _refresh_jobs(self, jobs: List[Job]) -> None:
+        """
+        Refreshes the details of the given jobs in place, using one
+        filtered list request per batch of job ids instead of one
+        request per job.
+
+        :param jobs:
+            Jobs to refresh.
+        """
+        # Several instances of a job may be refreshed together
+        jobs_by_id: Dict[str, List[Job]] = {}
+        for job in jobs:
+            jobs_by_id.setdefault(job.id, []).append(job)
+        job_ids = list(jobs_by_id.keys())
+
+        batch_size = self._REFRESH_JOBS_BATCH_SIZE
+        for i in range(0, len(job_ids), batch_size):
+            batch = {job_id: jobs_by_id[job_id] for job_id in job_ids[i : i + batch_size]}
+            try:
+                paginator = self.list_jobs_paginated(
+                    job_ids=list(batch.keys()),
+                    top=len(batch),
+                )
+                for details in paginator:
+                    for job in batch.pop(details.id, []):
+                        job.details = details
+            except HttpResponseError as e:
+                logger.debug(
+                    "Failed to refresh jobs with a filtered list request, "
+                    "falling back to individual requests: %s", e
+                )
+            # Jobs not returned by the list request (for example, because
+            # the service has not indexed them yet) are fetched one by one.
+            for first, *others in batch.values():
+                first.refresh()
+                for job in others:
+                    job.details = first.details
+
+    def as_completed(
         self,
-        *,
-        name_match: Optional[str] = None, 
-        job_type: Optional[str]= None, 
-        provider: Optional[list[str]]= None, 
-        target: Optional[list[str]]= None, 
-        status: Optional[list[JobStatus]] = None, 
-        created_after: Optional[datetime] = None,
-        created_before: Optional[datetime] = None, 
-        skip: Optional[int] = 0,
-        top: Optional[int]=100,
-        orderby_property: Optional[str] = None,
-        is_asc: Optional[bool] = True
-    ) -> ItemPaged[JobDetails]:
-        client = self._get_jobs_client()
+        jobs: Iterable[Job],
+        max_poll_wait_secs: float = 30,
+        timeout_secs: Optional[float] = None,
+    ) -> Iterator[Job]:
+        """
+        Returns an iterator over the given jobs that yields each job
+        as soon as it reaches a finished status.
+
+        All pending jobs are refreshed together on each poll, with
+        a single request per batch of jobs, so waiting on many jobs costs
+        about as much as waiting on one.
+
+        :param jobs:
+            Jobs to wait for.
+
+        :param max_poll_wait_secs:
+            Maximum poll wait time in seconds. Defaults to 30.
+
+        :param timeout_secs:
+            Optional timeout in seconds for the whole set of jobs. Defaults to `None`.
+
+        :raises: :class:`TimeoutError` If the total poll time exceeds timeout.
+
+        :return: Iterator of completed jobs, in order of completion.
+        :rtype: typing.Iterator[Job]
+        """
+        pending = list(jobs)
+        poll_wait = Job._default_poll_wait
+        start_time = time.time()
+        self._refresh_jobs(pending)
+        while True:
+            still_pending = []
+            for job in pending:
+                if job.has_completed():
+                    yield job
+                else:
+                    still_pending.append(job)
+            pending = still_pending
+            if not pending:
+                return
+
+            if timeout_secs is not None and (time.time() - start_time) >= timeout_secs:
+                raise TimeoutError(f"The wait time has exceeded {timeout_secs} seconds.")
+
+            logger.debug(f"Waiting for {len(pending)} jobs to complete")
+            time.sleep(poll_wait)
+            self._refresh_jobs(pending)
+            poll_wait = (
+                max_poll_wait_secs
+                if poll_wait >= max_poll_wait_secs
+                else poll_wait * 1.5
+            )
 
-        job_filter = self._create_filter(
-            job_name=name_match,
-            job_type=job_type,
-            provider_ids=provider,
-            target=target,
-            status=status,
-            created_after=created_after,
-            created_before=created_before
-        )
-        orderby = self._create_orderby(orderby_property, is_asc)
+    def wait_for_jobs(
+        self,
+        jobs: Iterable[Job],
+        max_poll_wait_secs: float = 30,
+        timeout_secs: Optional[float] = None,
+        print_progress: bool = True,
+    ) -> List[Job]:
+        """
+        Keeps refreshing the given jobs until all of them reach a finished
+        status. See :meth:`as_completed`.
+
+        :param jobs:
+            Jobs to wait for.
+
+        :param max_poll_wait_secs:
+            Maximum poll wait time in seconds. Defaults to 30.
+
+        :param timeout_secs:
+            Optional timeout in seconds for the whole set of jobs. Defaults to `None`.
 
-        return client.list(subscription_id=self.subscription_id, resource_group_name=self.resource_group, workspace_name=self.name, filter=job_filter, orderby=orderby, top = top, skip = skip)
+        :param print_progress:
+            Print "." to stdout each time a job completes. Defaults to `True`.
+
+        :raises: :class:`TimeoutError` If the total poll time exceeds timeout.
+
+        :return: The given jobs, in their original order.
+        :rtype: typing.List[Job]
+        """
+        jobs = list(jobs)
+        for _ in self.as_completed(
+            jobs,
+            max_poll_wait_secs=max_poll_wait_secs,
+            timeout_secs=timeout_secs,
+        ):
+            if print_progress:
+                print(".", end="", flush=True)
+        return jobs
 
     def _get_target_status(
             self,
@@ -650,6 +664,7 @@ class Workspace:
         """
         Returns a list of tuples containing the `Provider ID` and `Target Status`,
         with the option of filtering that list by a combination of Provider ID and Target Name.
+        The statuses come from the `target_catalog` of the workspace.
 
         :param name:
             Optional name of the Target to filter for. Defaults to `None`.
@@ -660,16 +675,16 @@ class Workspace:
         :return: List of tuples containing Provider ID and TargetStatus.
         :rtype: typing.List[typing.Tuple[str, TargetStatus]]
         """
-        return [
-            (provider.id, target)
-            for provider in self._client.services.providers.list(
-                self.subscription_id,
-                self.resource_group,
-                self.name)
-            for target in provider.targets
-            if (provider_id is None or provider.id.lower() == provider_id.lower())
-                and (name is None or target.id.lower() == name.lower())
-        ]
+        return self._target_catalog.get(name, provider_id)
+
+    def _list_providers(self) -> List[ProviderStatus]:
+        """
+        Lists the providers of the workspace and the status of their targets.
+        """
+        return list(self._client.services.providers.list(
+            self.subscription_id,
+            self.resource_group,
+            self.name))
 
     def get_targets(
         self,
@@ -765,38 +780,6 @@ class Workspace:
                   for item_details in paginator]
         return result
 
-    def list_top_level_items_paginated( 
-        self,
-        *,
-        name_match: Optional[str] = None, 
-        item_type: Optional[str]= None, 
-        job_type: Optional[str]= None, 
-        provider: Optional[list[str]]= None, 
-        target: Optional[list[str]]= None, 
-        status: Optional[list[JobStatus]] = None, 
-        created_after: Optional[datetime] = None,
-        created_before: Optional[datetime] = None, 
-        skip: Optional[int] = 0,
-        top: Optional[int]=100,
-        orderby_property: Optional[str] = None,
-        is_asc: Optional[bool] = True
-    ) -> ItemPaged[ItemDetails]:
-        client = self._get_top_level_items_client()
-
-        top_level_item_filter = self._create_filter(
-            job_name=name_match,
-            item_type=item_type,
-            job_type=job_type,
-            provider_ids=provider,
-            target=target,
-            status=status,
-            created_after=created_after,
-            created_before=created_before
-        )
-        orderby = self._create_orderby(orderby_property, is_asc)
-
-        return client.listv2(subscription_id=self.subscription_id, resource_group_name=self.resource_group, workspace_name=self.name, filter=top_level_item_filter, orderby=orderby, top = top, skip = skip)
-
     def list_sessions(
         self,
         provider: Optional[list[str]]= None,
@@ -826,38 +809,6 @@ class Workspace:
                   for session_details in paginator]
         return result
     
-    def list_sessions_paginated(
-        self,
-        *,
-        provider: Optional[list[str]]= None, 
-        target: Optional[list[str]]= None, 
-        status: Optional[list[JobStatus]] = None, 
-        created_after: Optional[datetime] = None,
-        created_before: Optional[datetime] = None, 
-        skip: Optional[int] = 0, 
-        top: Optional[int]=100, 
-        orderby_property: Optional[str] = None,
-        is_asc: Optional[bool] = True
-    ) -> ItemPaged[SessionDetails]:
-        """
-        Get the list of sessions in the given workspace.
-
-        :return: List of Workspace Sessions.
-        :rtype: typing.List[Session]
-        """
-        client = self._get_sessions_client()
-        session_filter = self._create_filter(
-            provider_ids=provider,
-            target=target,
-            status=status,
-            created_after=created_after,
-            created_before=created_before
-        )
-
-        orderby = self._create_orderby(orderby_property=orderby_property, is_asc=is_asc)
-
-        return client.listv2(subscription_id=self.subscription_id, resource_group_name=self.resource_group, workspace_name=self.name, filter = session_filter, orderby=orderby, skip=skip, top=top)
-
     def open_session(
         self,
         session: Session,
@@ -973,37 +924,6 @@ class Workspace:
                   for job_details in paginator]
         return result
 
-    def list_session_jobs_paginated(
-        self,
-        *,
-        session_id: str,
-        name_match: Optional[str] = None,
-        status: Optional[list[JobStatus]] = None,
-        skip: Optional[int] = 0,
-        top: Optional[int]=100,
-        orderby_property: Optional[str] = None,
-        is_asc: Optional[bool] = True
-    ) -> ItemPaged[JobDetails]:
-        """
-        Gets all jobs associated with a session.
-
-        :param session_id:
-            The id of session.
-
-        :return: List of all jobs associated with a session.
-        :rtype: typing.List[Job]
-        """
-        client = self._get_sessions_client()
-
-        session_job_filter = self._create_filter(
-            job_name=name_match,
-            status=status
-        )
-
-        orderby = self._create_orderby(orderby_property=orderby_property, is_asc=is_asc)
-
-        return client.jobs_list(subscription_id=self.subscription_id, resource_group_name=self.resource_group, workspace_name=self.name, session_id=session_id, filter = session_job_filter, orderby=orderby, skip=skip, top=top)
-
     def get_container_uri(
         self,
         job_id: Optional[str] = None,
@@ -1026,11 +946,7 @@ class Workspace:
         :return: Container URI.
         :rtype: str
         """
-        if container_name is None:
-            if job_id is not None:
-                container_name = container_name_format.format(job_id=job_id)
-            elif job_id is None:
-                container_name = f"{self.name}-data"
+        container_name = self._get_container_name(job_id, container_name, container_name_format)
         # Create container URI and get container client
         if self.storage is None:
             # Get linked storage account from the service, a new container
@@ -1040,118 +956,18 @@ class Workspace:
             )
         else:
             # Use the storage acount specified to generate container URI,
-            # create a new container if it does not yet exist
-            container_uri = get_container_uri(
-                self.storage, container_name
-            )
+            # create a new container if it is not known to exist yet
+            signer = self._get_storage_signer()
+            signer.ensure_container(container_name, self._get_storage_transport())
+            container_uri = signer.get_sas_uri(container_name)
         return container_uri
 
-    def _create_filter(self,
-            job_name: Optional[str] = None,
-            item_type: Optional[List[str]] = None,
-            job_type: Optional[List[str]] = None,
-            provider_ids: Optional[List[str]] = None,
-            target: Optional[List[str]] = None,
-            status: Optional[List[str]] = None,
-            created_after: Optional[datetime] = None,
-            created_before: Optional[datetime] = None,) -> str:
-        has_filter = False
-        filter_string = ""
-
-        if job_name:
-            filter_string += f"startswith(Name, '{job_name}')"
-            has_filter = True
-
-        if (item_type is not None and len(item_type) != 0):
-            if has_filter:
-                filter_string += " and "
-
-            filter_string += "("
-
-            item_type_filter = " or ".join([f"ItemType eq '{iid}'" for iid in item_type])
-
-            filter_string += f"{item_type_filter})"
-            has_filter = True
-
-        if (job_type is not None and len(job_type) != 0):
-            if has_filter:
-                filter_string += " and "
-
-            filter_string += "("
-
-            job_type_filter = " or ".join([f"JobType eq '{jid}'" for jid in job_type])
-
-            filter_string += f"{job_type_filter})"
-            has_filter = True
-
-        if (provider_ids is not None and len(provider_ids) != 0):
-            if has_filter:
-                filter_string += " and "
-
-            filter_string += "("
-
-            provider_filter = " or ".join([f"ProviderId eq '{pid}'" for pid in provider_ids])
-
-            filter_string += f"{provider_filter})"
-            has_filter = True
-
-        if (target is not None and len(target) != 0):
-            if has_filter:
-                filter_string += " and "
-
-            filter_string += "("
-
-            target_filter = " or ".join([f"Target eq '{tid}'" for tid in target])
-
-            filter_string += f"{target_filter})"
-            has_filter = True
-
-        if (status is not None and len(status) != 0):
-            if has_filter:
-                filter_string += " and "
-
-            filter_string += "("
-
-            status_filter = " or ".join([f"State eq '{sid}'" for sid in status])
-
-            filter_string += f"{status_filter})"
-            has_filter = True
-
-        if created_after is not None:
-            if has_filter:
-                filter_string += " and "
-
-            iso_date_string = created_after.date().isoformat()
-            filter_string += f"CreationTime ge {iso_date_string}"
-
-        if created_before is not None:
-            if has_filter:
-                filter_string += " and "
-
-            iso_date_string = created_before.date().isoformat()
-            filter_string += f"CreationTime le {iso_date_string}"
-
-        if filter_string:
-            return filter_string
-        else:
-            return None
-
-    def _create_orderby(self, orderby_property: str, is_asc: bool) -> str:
-        if orderby_property:
-            var_names = ["Name", "ItemType", "JobType", "ProviderId", "Target", "State", "CreationTime"]
-
-            if orderby_property in var_names:
-                orderby = f"{orderby_property} asc" if is_asc else f"{orderby_property} desc"
-            else:
-                raise ValueError(f"Invalid orderby property: {orderby_property}")
-
-            return orderby
-        else:
-            return None
-    
     def close(self) -> None:
+        if self._job_watcher is not None:
+            self._job_watcher.stop()
         self._mgmt_client.close()
         self._client.close()
+        self._shared_transport.close()
 
     def __enter__(self) -> Self:
         self._client.__enter__()
@@ -1161,3 +977,4 @@ class Workspace:
     def __exit__(self, *exc_details: Any) -> None:
         self._mgmt_client.__exit__(*exc_details)
         self._client.__exit__(*exc_details)
+        self._shared_transport.close()
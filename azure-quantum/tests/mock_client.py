@@ -11,9 +11,11 @@ without making network calls. Returns real SDK models and ItemPaged.
 from typing import List, Optional
 from datetime import datetime, UTC, timedelta
 
+from azure.core.async_paging import AsyncItemPaged, AsyncList
 from azure.core.exceptions import HttpResponseError
 from azure.core.paging import ItemPaged
 from azure.quantum.workspace import Workspace
+from azure.quantum.aio.workspace import Workspace as AsyncWorkspace
 from types import SimpleNamespace
 from azure.quantum._client import WorkspaceClient
 from azure.quantum._client.models import (
@@ -67,7 +69,7 @@ def _apply_filter(items: List, filter_expr: Optional[str]) -> List:
     - startswith(Name, 'prefix')
     - Property eq 'value' (with or groups inside parentheses)
     - CreationTime ge/le YYYY-MM-DD
-    Properties: Name, ItemType, JobType, ProviderId, Target, State, CreationTime
+    Properties: Id, Name, ItemType, JobType, ProviderId, Target, State, CreationTime
     """
     if not filter_expr:
         return items
@@ -102,6 +104,7 @@ def _apply_filter(items: List, filter_expr: Optional[str]) -> List:
                     val = right.strip().strip("'")
                     # Map property names to model attributes
                     mapping = {
+                        "Id": "id",
                         "Name": "name",
                         "ItemType": "item_type",
                         "JobType": "job_type",
@@ -648,6 +651,71 @@ class WorkspaceMock(Workspace):
         return self._get_linked_storage_sas_uri(container_name)
 
 
+def _async_paged(items: List) -> AsyncItemPaged:
+    """Create an AsyncItemPaged returning all items in a single page."""
+
+    async def get_next(token):
+        return {"items": items}
+
+    async def extract_data(response):
+        return None, AsyncList(response["items"])
+
+    return AsyncItemPaged(get_next, extract_data)
+
+
+class AsyncOperations:
+    """Awaitable view over the in-memory operations of MockWorkspaceClient,
+    mirroring the shape of the generated asynchronous operations: list
+    operations return an AsyncItemPaged, all others are coroutines."""
+
+    _LIST_OPERATIONS = ("list", "listv2", "jobs_list")
+
+    def __init__(self, operations: object) -> None:
+        self._operations = operations
+
+    def __getattr__(self, name: str):
+        operation = getattr(self._operations, name)
+        if name in self._LIST_OPERATIONS:
+            return lambda *args, **kwargs: _async_paged(list(operation(*args, **kwargs)))
+
+        async def call(*args, **kwargs):
+            return operation(*args, **kwargs)
+
+        return call
+
+
+class AsyncMockWorkspaceClient:
+    def __init__(self, authentication_policy: Optional[object] = None) -> None:
+        self._sync_client = MockWorkspaceClient(authentication_policy)
+        self.services = SimpleNamespace(
+            **{
+                name: AsyncOperations(operations)
+                for name, operations in vars(self._sync_client.services).items()
+            }
+        )
+        self._config = self._sync_client._config
+
+    async def __aenter__(self) -> "AsyncMockWorkspaceClient":
+        return self
+
+    async def __aexit__(self, *exc_details) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class AsyncWorkspaceMock(AsyncWorkspace):
+    def __init__(self, **kwargs) -> None:
+        if "_mgmt_client" not in kwargs:
+            kwargs["_mgmt_client"] = MockWorkspaceMgmtClient()
+        super().__init__(**kwargs)
+
+    def _create_client(self) -> AsyncMockWorkspaceClient:  # type: ignore[override]
+        auth_policy = self._connection_params.get_auth_policy()
+        return AsyncMockWorkspaceClient(authentication_policy=auth_policy)
+
+
 def seed_jobs(ws: WorkspaceMock) -> None:
     base = datetime.now(UTC) - timedelta(days=10)
     samples = [
@@ -0,0 +1,307 @@
+##
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+##
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from azure.quantum.aio import Job, Session
+from azure.quantum.job import Job as SyncJob
+from azure.quantum._client.models import JobDetails
+
+from mock_client import AsyncWorkspaceMock
+from common import (
+    SUBSCRIPTION_ID,
+    RESOURCE_GROUP,
+    WORKSPACE,
+)
+
+
+def _create_async_workspace() -> AsyncWorkspaceMock:
+    return AsyncWorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+    )
+
+
+def _seed_job(ws: AsyncWorkspaceMock, job_id: str, status: str, **kwargs) -> JobDetails:
+    details = JobDetails(
+        id=job_id,
+        name=f"job-{job_id}",
+        provider_id="ionq",
+        target="ionq.simulator",
+        status=status,
+        **kwargs
+    )
+    ws._client._sync_client.services.jobs.create_or_replace(
+        ws.subscription_id, ws.resource_group, ws.name, job_id=job_id, job_details=details
+    )
+    return details
+
+
+def test_async_workspace_submit_and_get_job():
+    async def run():
+        ws = _create_async_workspace()
+        job = await Job.from_storage_uri(
+            workspace=ws,
+            name="async-job",
+            target="ionq.simulator",
+            input_data_uri="https://example.com/input",
+            provider_id="ionq",
+            input_data_format="ionq.circuit.v1",
+            output_data_format="ionq.quantum-results.v1",
+        )
+        assert isinstance(job, Job)
+        assert job.details.status == "Submitted"
+        assert job.details.container_uri.startswith("https://example.com/")
+
+        fetched = await ws.get_job(job.id)
+        assert isinstance(fetched, Job)
+        assert fetched.details.name == "async-job"
+
+        jobs = await ws.list_jobs(name_match="async")
+        assert [j.id for j in jobs] == [job.id]
+
+    asyncio.run(run())
+
+
+def test_async_workspace_cancel_and_delete_job():
+    async def run():
+        ws = _create_async_workspace()
+        _seed_job(ws, "j-1", "Executing")
+
+        cancelled = await ws.cancel_job(await ws.get_job("j-1"))
+        assert cancelled.details.status == "Cancelled"
+
+        await cancelled.delete()
+        assert await ws.list_jobs() == []
+
+    asyncio.run(run())
+
+
+def test_async_job_wait_until_completed_and_get_results():
+    async def run():
+        ws = _create_async_workspace()
+        details = _seed_job(
+            ws,
+            "j-2",
+            "Executing",
+            output_data_format="microsoft.quantum-results.v2",
+            output_data_uri="https://example.com/job-j-2/rawOutputData?se=2099-01-01T00%3A00%3A00Z",
+        )
+        job = await ws.get_job("j-2")
+
+        async def complete_later():
+            await asyncio.sleep(0.3)
+            details.status = "Succeeded"
+
+        payload = {
+            "DataFormat": "microsoft.quantum-results.v2",
+            "Results": [{
+                "Histogram": [
+                    {"Outcome": [0], "Display": "[0]", "Count": 1},
+                    {"Outcome": [1], "Display": "[1]", "Count": 1},
+                ],
+                "Shots": [[0], [1]],
+            }],
+        }
+        job.download_data = AsyncMock(return_value=json.dumps(payload).encode())
+        job.download_data_chunks = lambda blob_uri: _iter_chunks(json.dumps(payload).encode())
+
+        await asyncio.gather(
+            job.wait_until_completed(print_progress=False),
+            complete_later(),
+        )
+        assert job.has_succeeded()
+        assert await job.get_results() == {"[0]": 0.5, "[1]": 0.5}
+        assert await job.get_results_shots() == [[0], [1]]
+
+    asyncio.run(run())
+
+
+async def _iter_chunks(payload: bytes, chunk_size: int = 16):
+    for i in range(0, len(payload), chunk_size):
+        await asyncio.sleep(0)
+        yield payload[i : i + chunk_size]
+
+
+def test_async_job_parses_v2_results_while_downloading():
+    async def run():
+        ws = _create_async_workspace()
+        _seed_job(
+            ws,
+            "j-6",
+            "Succeeded",
+            output_data_format="microsoft.quantum-results.v2",
+            output_data_uri="https://example.com/job-j-6/rawOutputData?se=2099-01-01T00%3A00%3A00Z",
+        )
+        job = await ws.get_job("j-6")
+        payload = json.dumps({
+            "DataFormat": "microsoft.quantum-results.v2",
+            "Results": [{
+                "Histogram": [
+                    {"Outcome": [0], "Display": "[0]", "Count": 2},
+                    {"Outcome": [1], "Display": "[1]", "Count": 1},
+                ],
+                "Shots": [[0], [1], [0]],
+            }],
+        }).encode()
+        downloads = []
+
+        def download_data_chunks(blob_uri):
+            downloads.append(blob_uri)
+            return _iter_chunks(payload)
+
+        job.download_data = AsyncMock(side_effect=AssertionError("whole payload downloaded"))
+        job.download_data_chunks = download_data_chunks
+
+        assert await job.get_results_shots() == [[0], [1], [0]]
+        assert await job.get_results_histogram() == {
+            "[0]": {"outcome": [0], "count": 2},
+            "[1]": {"outcome": [1], "count": 1},
+        }
+        assert len(downloads) == 2
+
+    asyncio.run(run())
+
+
+def test_async_job_get_results_for_failed_job_raises():
+    async def run():
+        ws = _create_async_workspace()
+        _seed_job(ws, "j-3", "Failed")
+        job = await ws.get_job("j-3")
+        with pytest.raises(RuntimeError, match="Cannot retrieve results as job execution failed"):
+            await job.get_results()
+
+    asyncio.run(run())
+
+
+def test_async_workspace_list_sessions_and_quotas():
+    async def run():
+        async with _create_async_workspace() as ws:
+            assert await ws.list_sessions() == []
+            assert await ws.get_quotas() == []
+
+    asyncio.run(run())
+
+
+def test_async_workspace_sessions():
+    async def run():
+        async with _create_async_workspace() as ws:
+            session = Session(ws, target="ionq.simulator", name="async-session")
+            async with session:
+                assert await session.open() is session
+                _seed_job(ws, "j-6", "Succeeded", session_id=session.id)
+
+                sessions = await ws.list_sessions()
+                assert [type(s) for s in sessions] == [Session]
+                fetched = await ws.get_session(session.id)
+                assert isinstance(fetched, Session)
+                assert fetched.details.name == "async-session"
+                assert await fetched.refresh() is fetched
+                assert [job.id for job in await fetched.list_jobs()] == ["j-6"]
+
+                items = await ws.list_top_level_items(item_type=["Session"])
+                assert [type(item) for item in items] == [Session]
+            assert (await ws.get_session(session.id)).details.status.lower() == "succeeded"
+
+            with pytest.raises(TypeError):
+                with session:
+                    pass
+
+    asyncio.run(run())
+
+
+class _FakeAsyncContainerClient:
+    """Stores blobs in memory, like the asynchronous `ContainerClient`."""
+
+    def __init__(self, blobs=None):
+        self.blobs = dict(blobs or {})
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_details):
+        pass
+
+    def get_blob_client(self, name):
+        blob_client = MagicMock()
+        downloader = MagicMock()
+        downloader.readall = AsyncMock(side_effect=lambda: self.blobs[name])
+
+        async def chunks():
+            yield self.blobs[name]
+
+        downloader.chunks = chunks
+        blob_client.download_blob = AsyncMock(return_value=downloader)
+        return blob_client
+
+    def list_blobs(self):
+        return _iterate_blobs(self)
+
+
+async def _upload_blob(container, name, content_type, encoding, data, return_sas_token=True):
+    container.blobs[name] = data
+    return f"https://example.com/job-j-4/{name}"
+
+
+def test_async_job_attachments(tmp_path):
+    async def run():
+        ws = _create_async_workspace()
+        _seed_job(ws, "j-4", "Succeeded", container_uri="https://example.com/job-j-4")
+        job = await ws.get_job("j-4")
+        container = _FakeAsyncContainerClient()
+        with patch("azure.quantum.aio.job.ContainerClient") as container_client, \
+                patch("azure.quantum.aio.job.upload_blob", side_effect=_upload_blob):
+            container_client.from_container_url.return_value = container
+
+            assert await job.upload_attachment("a", b"1") == "https://example.com/job-j-4/a"
+            uris = await job.upload_attachments({"b": b"2", "dir/c": b"3"}, max_workers=1)
+            assert uris == {"b": "https://example.com/job-j-4/b", "dir/c": "https://example.com/job-j-4/dir/c"}
+
+            assert await job.download_attachment("a") == b"1"
+            assert await job.download_attachments(["b", "dir/c"]) == {"b": b"2", "dir/c": b"3"}
+            assert [blob.name for blob in await job.list_attachments()] == ["a", "b", "dir/c"]
+
+            paths = await job.download_all_attachments(str(tmp_path))
+            assert (tmp_path / "dir" / "c").read_bytes() == b"3"
+            assert set(paths) == {"a", "b", "dir/c"}
+
+        assert container_client.from_container_url.call_args.args == ("https://example.com/job-j-4",)
+        await ws.close()
+
+    asyncio.run(run())
+
+
+async def _iterate_blobs(container):
+    for name in container.blobs:
+        blob = MagicMock()
+        blob.name = name
+        yield blob
+
+
+def test_async_job_as_asyncio_future():
+    async def run():
+        ws = _create_async_workspace()
+        details = _seed_job(ws, "j-5", "Executing")
+        job = await ws.get_job("j-5")
+        job.get_results = AsyncMock(return_value={"[0]": 1.0})
+
+        future = job.as_asyncio_future()
+        await asyncio.sleep(0.1)
+        assert not future.done()
+        details.status = "Succeeded"
+        assert await future == {"[0]": 1.0}
+
+        results = await job.as_asyncio_future(lambda completed: completed.id)
+        assert results == "j-5"
+
+        # Only the awaitable methods of a job are exposed
+        assert not hasattr(job, "as_future")
+        assert not isinstance(job, SyncJob)
+
+    asyncio.run(run())
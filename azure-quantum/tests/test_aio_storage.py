@@ -0,0 +1,389 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+import asyncio
+import inspect
+import io
+import threading
+from unittest import mock
+
+import pytest
+from azure.core.exceptions import HttpResponseError, ResourceModifiedError, ServiceRequestError
+
+from azure.quantum.aio import Job
+from azure.quantum.storage import _BlockCheckpoint
+from azure.quantum.aio._transport import SharedAsyncTransport
+from azure.quantum.aio.storage import (
+    StreamedBlob,
+    StreamedBlobState,
+    download_blob,
+    download_blob_chunks,
+    upload_blob,
+)
+
+from mock_client import AsyncWorkspaceMock
+from common import SUBSCRIPTION_ID, RESOURCE_GROUP, WORKSPACE
+
+
+def _create_streamed_blob(**kwargs):
+    container = mock.MagicMock()
+    blob = container.get_blob_client.return_value
+    staged = {}
+
+    async def stage_block(block_id, data, length, **kwargs):
+        assert len(data) == length
+        # Let the other blocks be staged in the meantime
+        await asyncio.sleep(0)
+        staged[block_id] = bytes(data)
+
+    blob.stage_block = mock.AsyncMock(side_effect=stage_block)
+    blob.commit_block_list = mock.AsyncMock()
+    streamed_blob = StreamedBlob(container, "inputData", "application/json", "", **kwargs)
+    return streamed_blob, blob, staged
+
+
+def _committed_data(blob, staged) -> bytes:
+    block_ids = blob.commit_block_list.call_args.args[0]
+    return b"".join(staged[block_id] for block_id in block_ids)
+
+
+def test_async_streamed_blob_splits_data_into_blocks():
+    streamed_blob, blob, staged = _create_streamed_blob(block_size=10, max_workers=4)
+    data = bytes(range(256)) * 4
+
+    async def run():
+        await streamed_blob.upload_data(data)
+        await streamed_blob.upload_data(b"tail")
+        await streamed_blob.commit()
+
+    asyncio.run(run())
+    assert blob.stage_block.await_count == 104
+    assert _committed_data(blob, staged) == data + b"tail"
+    assert streamed_blob.state == StreamedBlobState.committed
+
+
+def test_async_streamed_blob_upload_stream():
+    streamed_blob, blob, staged = _create_streamed_blob(block_size=7, max_workers=2)
+    data = b"0123456789" * 10
+
+    async def chunks():
+        yield data[:3]
+        yield data[3:50]
+        yield data[50:]
+
+    async def run():
+        await streamed_blob.upload_stream(io.BytesIO(data))
+        await streamed_blob.upload_stream(chunks())
+        await streamed_blob.upload_stream([data])
+        await streamed_blob.commit()
+
+    asyncio.run(run())
+    assert _committed_data(blob, staged) == data * 3
+    assert all(len(block) <= 7 for block in staged.values())
+
+
+def test_async_streamed_blob_retries_failed_block():
+    streamed_blob, blob, staged = _create_streamed_blob(block_size=4, max_retries=1)
+    stage_block = blob.stage_block.side_effect
+    failures = []
+
+    async def flaky_stage_block(block_id, data, length, **kwargs):
+        if bytes(data) == b"5678" and not failures:
+            failures.append(block_id)
+            raise ServiceRequestError("Connection reset")
+        await stage_block(block_id, data, length, **kwargs)
+
+    blob.stage_block.side_effect = flaky_stage_block
+
+    async def run():
+        await streamed_blob.upload_data(b"123456789")
+        await streamed_blob.commit()
+
+    with mock.patch.object(StreamedBlob, "_RETRY_BACKOFF_SECS", 0):
+        asyncio.run(run())
+        assert len(failures) == 1
+        assert blob.stage_block.await_count == 4
+        assert all(call.kwargs["retry_total"] == 0 for call in blob.stage_block.await_args_list)
+        assert _committed_data(blob, staged) == b"123456789"
+
+        streamed_blob, blob, _ = _create_streamed_blob(max_retries=1)
+        blob.stage_block.side_effect = ServiceRequestError("Connection reset")
+        with pytest.raises(ServiceRequestError):
+            asyncio.run(streamed_blob.upload_data(b"data"))
+        assert blob.stage_block.await_count == 2
+
+        # Errors that are not transient are not retried
+        streamed_blob, blob, _ = _create_streamed_blob(max_retries=1)
+        error = HttpResponseError("Forbidden")
+        error.status_code = 403
+        blob.stage_block.side_effect = error
+        with pytest.raises(HttpResponseError):
+            asyncio.run(streamed_blob.upload_data(b"data"))
+        assert blob.stage_block.await_count == 1
+
+
+class _FakeAsyncRangedBlobClient:
+    """Serves ranged downloads of a blob, like the asynchronous `BlobClient.download_blob`."""
+
+    def __init__(self, data: bytes, etag: str = '"0x1"'):
+        self.data = data
+        self.etag = etag
+        self.blob_name = "rawOutputData"
+        self.container_name = "job-1"
+        self.account_name = "account"
+        self.ranges = []
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_details):
+        self.closed = True
+
+    async def download_blob(self, offset=None, length=None, etag=None, match_condition=None):
+        if etag is not None and etag != self.etag:
+            raise ResourceModifiedError("The condition specified using HTTP conditional header(s) is not met.")
+        if offset is not None and offset >= len(self.data):
+            error = HttpResponseError("The range specified is invalid for the current size of the resource.")
+            error.status_code = 416
+            raise error
+        self.ranges.append((offset, length))
+        end = len(self.data) if length is None else offset + length
+        downloader = mock.MagicMock()
+        downloader.readall = mock.AsyncMock(return_value=self.data[offset:end])
+        downloader.properties.etag = self.etag
+        downloader.properties.content_range = f"bytes {offset}-{end - 1}/{len(self.data)}"
+        return downloader
+
+    async def get_blob_properties(self):
+        return mock.Mock(size=len(self.data), etag=self.etag)
+
+
+@pytest.fixture
+def ranged_blob():
+    blob_client = _FakeAsyncRangedBlobClient(bytes(range(256)) * 41)
+    with mock.patch("azure.quantum.aio.storage.BlobClient.from_blob_url", return_value=blob_client):
+        yield blob_client
+
+
+def test_async_download_blob_ranges(ranged_blob):
+    data = asyncio.run(download_blob("https://blob", max_concurrency=4, chunk_size=1000))
+
+    assert data == ranged_blob.data
+    assert sorted(ranged_blob.ranges) == [(i, min(1000, 10496 - i)) for i in range(0, 10496, 1000)]
+    assert ranged_blob.closed
+
+
+def test_async_download_empty_blob(ranged_blob):
+    ranged_blob.data = b""
+
+    async def run():
+        chunks = [
+            chunk
+            async for chunk in download_blob_chunks("https://blob", max_concurrency=3, chunk_size=1000)
+        ]
+        return await download_blob("https://blob", max_concurrency=4, chunk_size=1000), chunks
+
+    assert asyncio.run(run()) == (b"", [])
+
+
+def test_async_download_blob_chunks_in_order(ranged_blob):
+    async def run():
+        return [
+            chunk
+            async for chunk in download_blob_chunks("https://blob", max_concurrency=3, chunk_size=1000)
+        ]
+
+    chunks = asyncio.run(run())
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert b"".join(chunks) == ranged_blob.data
+
+
+def test_async_download_blob_ranges_fails_if_blob_changes(ranged_blob):
+    original = ranged_blob.download_blob
+
+    async def download_blob_and_modify(offset=None, length=None, **kwargs):
+        downloader = await original(offset=offset, length=length, **kwargs)
+        ranged_blob.etag = '"0x2"'
+        return downloader
+
+    ranged_blob.download_blob = download_blob_and_modify
+    with pytest.raises(ResourceModifiedError):
+        asyncio.run(download_blob("https://blob", max_concurrency=2, chunk_size=1000))
+
+
+def test_async_upload_blob_returns_uri_without_sas_token():
+    container = mock.MagicMock()
+    blob = container.get_blob_client.return_value
+    blob.upload_blob = mock.AsyncMock()
+    blob.url = "https://account.blob.core.windows.net/job-1/inputData?sv=token"
+
+    uri = asyncio.run(
+        upload_blob(container, "inputData", "application/json", "", b"data", return_sas_token=False)
+    )
+
+    assert uri == "https://account.blob.core.windows.net/job-1/inputData"
+    assert blob.upload_blob.await_args.args[0] == b"data"
+
+
+def test_async_upload_blob_reads_files_without_blocking(tmp_path):
+    path = tmp_path / "inputData"
+    path.write_bytes(b"data" * 100)
+    container = mock.MagicMock()
+    blob = container.get_blob_client.return_value
+    blob.url = "https://account.blob.core.windows.net/job-1/inputData?sv=token"
+    uploaded = []
+
+    async def upload(stream, length, content_settings):
+        # The storage client awaits the reads of streams that are not seekable
+        assert not hasattr(stream, "seek")
+        read = stream.read(length)
+        assert inspect.isawaitable(read)
+        uploaded.append((await read, length))
+
+    blob.upload_blob = mock.AsyncMock(side_effect=upload)
+    asyncio.run(upload_blob(
+        container, "inputData", "application/json", "", path, return_sas_token=False
+    ))
+
+    assert uploaded == [(b"data" * 100, 400)]
+
+
+def test_async_streamed_blob_reads_streams_without_blocking():
+    streamed_blob, blob, staged = _create_streamed_blob(block_size=4)
+    threads = set()
+
+    class _Stream(io.BytesIO):
+        def read(self, size=-1):
+            threads.add(threading.get_ident())
+            return super().read(size)
+
+    async def run():
+        await streamed_blob.upload_stream(_Stream(b"123456789"))
+        await streamed_blob.commit()
+
+    asyncio.run(run())
+    assert threads and threading.get_ident() not in threads
+    assert _committed_data(blob, staged) == b"123456789"
+
+
+def test_shared_async_transport_reuses_session():
+    shared_transport = SharedAsyncTransport(pool_size=4)
+
+    async def run():
+        first = shared_transport.create_transport()
+        second = shared_transport.create_transport()
+        assert first.session is second.session
+        assert first.session.connector.limit_per_host == 4
+        session = first.session
+        await shared_transport.close()
+        assert session.closed
+        return session
+
+    session = asyncio.run(run())
+
+    # A session is bound to its event loop, so a new loop gets a new one
+    async def run_again():
+        transport = shared_transport.create_transport()
+        assert transport.session is not session
+        await shared_transport.close()
+
+    asyncio.run(run_again())
+
+
+def test_async_job_from_input_data_uploads_with_shared_transport():
+    ws = AsyncWorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+    )
+
+    async def run():
+        with mock.patch(
+            "azure.quantum.aio.job.upload_blob",
+            mock.AsyncMock(return_value="https://example.com/job-1/inputData"),
+        ) as upload:
+            job = await Job.from_input_data(
+                ws, name="async-job", target="ionq.simulator", input_data=b"circuit"
+            )
+        container_client = upload.await_args.args[0]
+        assert container_client._pipeline._transport.session is \
+            ws._shared_transport._get_session()
+        await ws.close()
+        return job
+
+    job = asyncio.run(run())
+    assert job.details.input_data_uri == "https://example.com/job-1/inputData"
+    assert ws._shared_transport._session is None
+
+
+def test_async_workspace_signs_sas_uris_locally():
+    ws = AsyncWorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+        storage=(
+            "DefaultEndpointsProtocol=https;AccountName=account;"
+            "AccountKey=a2V5;EndpointSuffix=core.windows.net"
+        ),
+    )
+
+    async def run():
+        container = mock.MagicMock()
+        container.close = mock.AsyncMock()
+        with mock.patch(
+            "azure.quantum.aio.workspace.create_container", mock.AsyncMock(return_value=container)
+        ) as create:
+            first = await ws.get_container_uri(container_name="shared")
+            second = await ws.get_container_uri(container_name="shared")
+            blob_uri = await ws._get_linked_storage_sas_uri("shared", "inputData")
+        await ws.close()
+        return first, second, blob_uri, create
+
+    first, second, blob_uri, create = asyncio.run(run())
+    assert first == second
+    assert first.startswith("https://account.blob.core.windows.net/shared?")
+    assert blob_uri.startswith("https://account.blob.core.windows.net/shared/inputData?")
+    assert create.await_count == 1
+
+
+def test_async_streamed_blob_resumes_from_checkpoint(tmp_path):
+    checkpoint_path = str(tmp_path / "inputData.checkpoint")
+    streamed_blob, blob, staged = _create_streamed_blob(block_size=4, checkpoint_path=checkpoint_path)
+    asyncio.run(streamed_blob.upload_data(b"123456789"))
+
+    blob.get_block_list = mock.AsyncMock(return_value=(
+        [], [mock.Mock(id=id, size=len(data)) for id, data in staged.items()]
+    ))
+    blob.stage_block.reset_mock()
+    resumed_blob = StreamedBlob(
+        streamed_blob.container, "inputData", "application/json", "",
+        block_size=4, checkpoint_path=checkpoint_path,
+    )
+
+    async def run():
+        await resumed_blob.upload_data(b"123456789abc")
+        await resumed_blob.commit()
+
+    asyncio.run(run())
+    assert resumed_blob.resumed_blocks == 2
+    assert blob.stage_block.await_count == 1
+    assert _committed_data(blob, staged) == b"123456789abc"
+    assert not (tmp_path / "inputData.checkpoint").exists()
+
+
+def test_async_streamed_blob_writes_checkpoint_without_blocking(tmp_path):
+    checkpoint_path = str(tmp_path / "inputData.checkpoint")
+    streamed_blob, _, _ = _create_streamed_blob(block_size=4, checkpoint_path=checkpoint_path)
+    record = _BlockCheckpoint.record
+    threads = set()
+
+    def record_in_thread(self, *args):
+        threads.add(threading.get_ident())
+        record(self, *args)
+
+    with mock.patch.object(_BlockCheckpoint, "record", record_in_thread):
+        asyncio.run(streamed_blob.upload_data(b"123456789"))
+
+    assert threads and threading.get_ident() not in threads
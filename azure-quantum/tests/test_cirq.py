@@ -10,19 +10,6 @@ from unittest.mock import Mock
 import pytest
 
 
-def _freeze_workspace_client_recreation(ws) -> None:
-    """Prevent WorkspaceMock from recreating (and wiping) its mock client.
-
-    Cirq service/targets append user-agent strings which can trigger
-    `Workspace._on_new_client_request()`.
-    """
-
-    if hasattr(ws, "_connection_params") and hasattr(
-        ws._connection_params, "on_new_client_request"
-    ):
-        ws._connection_params.on_new_client_request = None
-
-
 class _FakeQirProgram:
     _name = "Fake.EntryPoint"
 
@@ -325,7 +312,6 @@ def test_cirq_service_targets_excludes_non_qir_target():
     from mock_client import create_default_workspace
 
     ws = create_default_workspace()
-    _freeze_workspace_client_recreation(ws)
     service = AzureQuantumService(workspace=ws)
 
     targets = service.targets()
@@ -357,7 +343,6 @@ def test_cirq_service_targets_discovers_provider_specific_and_generic_wrappers(
     from mock_client import create_default_workspace
 
     ws = create_default_workspace()
-    _freeze_workspace_client_recreation(ws)
     service = AzureQuantumService(workspace=ws)
 
     targets = service.targets()
@@ -387,7 +372,6 @@ def test_cirq_service_submit_to_generic_wrapped_target_creates_job(
     from mock_client import create_default_workspace
 
     ws = create_default_workspace()
-    _freeze_workspace_client_recreation(ws)
     service = AzureQuantumService(workspace=ws)
 
     q0, q1 = cirq.LineQubit.range(2)
@@ -427,7 +411,6 @@ def test_cirq_service_get_job_returns_cirq_job_wrapper_for_generic_target(
     from mock_client import create_default_workspace
 
     ws = create_default_workspace()
-    _freeze_workspace_client_recreation(ws)
     service = AzureQuantumService(workspace=ws)
 
     q0 = cirq.LineQubit(0)
@@ -460,7 +443,6 @@ def test_cirq_job_results_converts_generic_target_shots(
     from mock_client import create_default_workspace
 
     ws = create_default_workspace()
-    _freeze_workspace_client_recreation(ws)
     service = AzureQuantumService(workspace=ws)
 
     q0, q1 = cirq.LineQubit.range(2)
@@ -0,0 +1,157 @@
+##
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+##
+import threading
+import time
+from unittest import mock
+
+import pytest
+from azure.core.credentials import AccessToken
+from azure.core.exceptions import ClientAuthenticationError
+
+from azure.quantum._constants import ConnectionConstants
+from azure.quantum.credential_manager import CredentialManager
+
+from mock_client import WorkspaceMock
+from common import SUBSCRIPTION_ID, RESOURCE_GROUP, WORKSPACE, LOCATION, ENDPOINT_URI
+
+
+class _FakeCredential:
+    """Returns a new token on each request, valid for `lifetime_secs`."""
+
+    def __init__(self, lifetime_secs: float = 3600):
+        self.lifetime_secs = lifetime_secs
+        self.requests = []
+        self.error = None
+
+    def get_token(self, *scopes, **kwargs):
+        self.requests.append((scopes, kwargs))
+        if self.error is not None:
+            raise self.error
+        return AccessToken(f"token-{len(self.requests)}", int(time.time() + self.lifetime_secs))
+
+
+def test_credential_manager_caches_tokens_per_scope():
+    credential = _FakeCredential()
+    manager = CredentialManager(credential)
+
+    first = manager.get_token(ConnectionConstants.DATA_PLANE_CREDENTIAL_SCOPE)
+    assert manager.get_token(ConnectionConstants.DATA_PLANE_CREDENTIAL_SCOPE) is first
+    arm_token = manager.get_token(ConnectionConstants.ARM_CREDENTIAL_SCOPE)
+    assert arm_token.token != first.token
+    assert len(credential.requests) == 2
+
+    # A claims challenge always requests a new token
+    manager.get_token(ConnectionConstants.DATA_PLANE_CREDENTIAL_SCOPE, claims="claims")
+    assert credential.requests[-1][1] == {"claims": "claims"}
+
+    manager.clear()
+    manager.get_token(ConnectionConstants.ARM_CREDENTIAL_SCOPE)
+    assert len(credential.requests) == 4
+
+
+def test_credential_manager_refreshes_tokens_before_expiry():
+    credential = _FakeCredential(lifetime_secs=60)
+    manager = CredentialManager(credential, refresh_window_secs=120)
+
+    first = manager.get_token("scope")
+    second = manager.get_token("scope")
+    assert second.token != first.token
+
+    # A still valid token is used if it cannot be refreshed
+    credential.error = ClientAuthenticationError("Unavailable")
+    assert manager.get_token("scope") is second
+
+    # An expired token is not
+    credential.lifetime_secs = 0
+    credential.error = None
+    manager.get_token("scope")
+    credential.error = ClientAuthenticationError("Unavailable")
+    with pytest.raises(ClientAuthenticationError):
+        manager.get_token("scope")
+
+
+def test_credential_manager_acquires_a_token_once_for_concurrent_callers():
+    credential = _FakeCredential()
+    get_token = credential.get_token
+    release = threading.Event()
+
+    def slow_get_token(*scopes, **kwargs):
+        assert release.wait(5)
+        return get_token(*scopes, **kwargs)
+
+    credential.get_token = slow_get_token
+    manager = CredentialManager(credential)
+    threads = manager.prefetch("scope")
+    tokens = []
+    callers = [
+        threading.Thread(target=lambda: tokens.append(manager.get_token("scope")))
+        for _ in range(4)
+    ]
+    for caller in callers:
+        caller.start()
+    release.set()
+    for thread in threads + callers:
+        thread.join(5)
+
+    assert len(credential.requests) == 1
+    assert len({token.token for token in tokens}) == 1
+
+
+def test_credential_manager_persists_tokens_of_default_credential():
+    with mock.patch("azure.identity.DefaultAzureCredential") as default_credential:
+        manager = CredentialManager(persist_tokens=True, cache_name="workers")
+        assert manager.credential is default_credential.return_value
+        assert manager.credential is default_credential.return_value
+        manager.close()
+
+    assert default_credential.call_count == 1
+    options = default_credential.call_args.kwargs["cache_persistence_options"]
+    assert options.name == "workers"
+    assert not options.allow_unencrypted_storage
+    default_credential.return_value.close.assert_called_once()
+
+
+def test_workspaces_share_credential_manager():
+    manager = CredentialManager(_FakeCredential())
+
+    with mock.patch.object(CredentialManager, "prefetch") as prefetch:
+        first = WorkspaceMock(
+            subscription_id=SUBSCRIPTION_ID,
+            resource_group=RESOURCE_GROUP,
+            name=WORKSPACE,
+            credential=manager,
+        )
+        second = WorkspaceMock(name=WORKSPACE, credential=manager)
+
+    assert first.credential is second.credential is manager
+    # The management scope is only needed to look the workspaces up
+    assert prefetch.call_args_list == 2 * [
+        mock.call(
+            ConnectionConstants.DATA_PLANE_CREDENTIAL_SCOPE,
+            ConnectionConstants.ARM_CREDENTIAL_SCOPE,
+        ),
+    ]
+    with mock.patch.object(CredentialManager, "prefetch") as prefetch:
+        WorkspaceMock(
+            subscription_id=SUBSCRIPTION_ID,
+            resource_group=RESOURCE_GROUP,
+            name=WORKSPACE,
+            location=LOCATION,
+            credential=manager,
+            _quantum_endpoint=ENDPOINT_URI,
+        )
+    prefetch.assert_called_once_with(ConnectionConstants.DATA_PLANE_CREDENTIAL_SCOPE)
+
+
+def test_workspace_creates_default_credential_once():
+    with mock.patch("azure.identity.DefaultAzureCredential") as default_credential:
+        ws = WorkspaceMock(
+            subscription_id=SUBSCRIPTION_ID,
+            resource_group=RESOURCE_GROUP,
+            name=WORKSPACE,
+        )
+        # pylint: disable=protected-access
+        assert ws._connection_params.get_credential_or_default() is default_credential.return_value
+    assert default_credential.call_count == 1
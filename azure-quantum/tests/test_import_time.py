@@ -0,0 +1,66 @@
+##
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+##
+import json
+import os
+import subprocess
+import sys
+from typing import List
+
+import pytest
+
+import azure.quantum
+
+# Modules that are slow to import and only needed by some of the API
+HEAVY_MODULES = ["azure.quantum._client", "azure.storage.blob", "azure.identity", "numpy"]
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_in_new_process(statement: str) -> List[str]:
+    """Runs the import statement in a new interpreter and returns the heavy
+    modules it loaded."""
+    script = (
+        f"{statement}\n"
+        "import json, sys\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=PACKAGE_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_import_package_is_light():
+    loaded = _import_in_new_process("import azure.quantum")
+    assert loaded == []
+
+
+def test_import_workspace_defers_identity_and_numpy():
+    loaded = _import_in_new_process(
+        "from azure.quantum import Workspace, JobStatus\n"
+        "from azure.quantum.job import Job"
+    )
+    assert "azure.identity" not in loaded
+    assert "numpy" not in loaded
+
+
+def test_lazy_attributes():
+    from azure.quantum.job.job import Job
+    from azure.quantum.workspace import Workspace
+
+    assert azure.quantum.Job is Job
+    assert azure.quantum.Workspace is Workspace
+    assert azure.quantum.job.Job is Job
+    assert {"Workspace", "Job", "JobStatus", "job"} <= set(dir(azure.quantum))
+    with pytest.raises(AttributeError):
+        azure.quantum.NotAnAttribute
+
+    namespace = {}
+    exec("from azure.quantum.job import *", namespace)
+    assert set(azure.quantum.job.__all__) <= set(namespace)
@@ -0,0 +1,155 @@
+##
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+##
+import json
+from unittest import mock
+
+from azure.core.exceptions import ResourceExistsError
+
+from azure.quantum.job import Job, InputStore
+
+from mock_client import WorkspaceMock
+from common import SUBSCRIPTION_ID, RESOURCE_GROUP, WORKSPACE
+
+
+def _create_workspace() -> WorkspaceMock:
+    return WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+    )
+
+
+class _FakeContainer:
+    """Container of blobs, in place of `ContainerClient.from_container_url`."""
+
+    def __init__(self):
+        self.blobs = {}
+
+    def from_container_url(self, container_url, **kwargs):
+        container_client = mock.MagicMock()
+
+        def get_blob_client(blob_name):
+            blob_client = mock.MagicMock()
+            blob_client.exists.side_effect = lambda: blob_name in self.blobs
+            return blob_client
+
+        container_client.get_blob_client.side_effect = get_blob_client
+        return container_client
+
+    def upload_blob(self, container_client, blob_name, content_type, encoding, data, return_sas_token):
+        assert not return_sas_token
+        self.blobs[blob_name] = data
+
+
+def _patch_container(container: _FakeContainer):
+    return mock.patch.multiple(
+        "azure.quantum.job.input_store",
+        ContainerClient=container,
+        upload_blob=mock.Mock(side_effect=container.upload_blob),
+    )
+
+
+def test_input_store_uploads_payload_once():
+    ws = _create_workspace()
+    ws.input_store = InputStore()
+    container = _FakeContainer()
+
+    with _patch_container(container), mock.patch(
+        "azure.quantum.job.base_job.BaseJob.upload_input_data"
+    ) as upload_input_data:
+        jobs = [
+            Job.from_input_data(ws, name=f"job-{i}", target="fake.target", input_data=b"circuit")
+            for i in range(3)
+        ]
+        other = Job.from_input_data(ws, name="other", target="fake.target", input_data=b"other")
+
+    upload_input_data.assert_not_called()
+    assert len(container.blobs) == 2
+    input_uris = {job.details.input_data_uri for job in jobs}
+    assert len(input_uris) == 1
+    uri = input_uris.pop()
+    assert "/job-inputs/sha256/" in uri
+    assert "?" not in uri
+    assert other.details.input_data_uri != uri
+    # Each job still gets its own container for its output
+    assert len({job.details.container_uri for job in jobs}) == 3
+
+
+def test_input_store_hash_includes_content_settings(tmp_path):
+    path = tmp_path / "input.json"
+    path.write_bytes(b"circuit")
+
+    digest = InputStore.get_content_hash(b"circuit", "application/json")
+    assert InputStore.get_content_hash(path, "application/json") == digest
+    assert InputStore.get_content_hash(memoryview(b"circuit"), "application/json") == digest
+    assert InputStore.get_content_hash(b"circuit", "application/json", "gzip") != digest
+    assert InputStore.get_content_hash(b"circuit", "text/plain") != digest
+
+
+def test_input_store_reuses_existing_blob():
+    ws = _create_workspace()
+    store = InputStore()
+    container = _FakeContainer()
+    blob_name = store.BLOB_PREFIX + store.get_content_hash(b"circuit", "application/json")
+    container.blobs[blob_name] = b"circuit"
+
+    with _patch_container(container):
+        uri = store.get_input_data_uri(ws, b"circuit", "application/json")
+
+    assert uri.endswith(blob_name)
+    assert container.blobs == {blob_name: b"circuit"}
+
+
+def test_input_store_concurrent_upload():
+    ws = _create_workspace()
+    store = InputStore()
+    container = _FakeContainer()
+
+    with _patch_container(container), mock.patch(
+        "azure.quantum.job.input_store.upload_blob",
+        side_effect=ResourceExistsError("The specified blob already exists."),
+    ):
+        uri = store.get_input_data_uri(ws, b"circuit", "application/json")
+
+    assert "/sha256/" in uri
+
+
+def test_input_store_persists_index(tmp_path):
+    ws = _create_workspace()
+    index_path = str(tmp_path / "index.json")
+    container = _FakeContainer()
+
+    with _patch_container(container):
+        uri = InputStore(index_path=index_path).get_input_data_uri(ws, b"circuit", "application/json")
+    assert list(json.loads((tmp_path / "index.json").read_text())) == [uri]
+
+    # A new store trusts the index and does not check the container
+    with mock.patch("azure.quantum.job.input_store.ContainerClient") as container_client:
+        store = InputStore(index_path=index_path)
+        assert store.get_input_data_uri(ws, b"circuit", "application/json") == uri
+    container_client.from_container_url.assert_not_called()
+
+    store.clear()
+    assert not (tmp_path / "index.json").exists()
+
+
+def test_input_store_checks_container_after_ttl():
+    ws = _create_workspace()
+    store = InputStore(ttl_secs=60)
+    container = _FakeContainer()
+
+    with _patch_container(container), mock.patch(
+        "azure.quantum.job.input_store.time.time", return_value=1000.0
+    ) as now:
+        uri = store.get_input_data_uri(ws, b"circuit", "application/json")
+        # The blob is deleted from the container, e.g. by a lifecycle policy
+        container.blobs.clear()
+        now.return_value = 1059.0
+        assert store.get_input_data_uri(ws, b"circuit", "application/json") == uri
+        assert container.blobs == {}
+
+        now.return_value = 1060.0
+        assert store.get_input_data_uri(ws, b"circuit", "application/json") == uri
+        assert list(container.blobs.values()) == [b"circuit"]
@@ -3,6 +3,7 @@
 # Licensed under the MIT License.
 ##
 
+import pytest
 from unittest.mock import Mock, patch
 from azure.quantum import Job, JobDetails
 
@@ -52,3 +53,75 @@ def test_list_attachments_uses_workspace_container_when_unset(mock_container_cli
     workspace.get_container_uri.assert_called_once_with(job_id="job-id")
     mock_container_client.from_container_url.assert_called_once_with(CONTAINER_URI)
     assert result == []
+
+
+@patch("azure.quantum.job.base_job.upload_blob")
+@patch("azure.quantum.job.base_job.ContainerClient")
+def test_upload_attachments_shares_container_client(mock_container_client, mock_upload_blob):
+    job = _job_with_container()
+    mock_upload_blob.side_effect = lambda container, name, *_, **__: f"https://blob/{name}"
+
+    result = job.upload_attachments({f"file-{i}": b"data" for i in range(5)}, max_workers=3)
+
+    mock_container_client.from_container_url.assert_called_once_with(CONTAINER_URI)
+    container = mock_container_client.from_container_url.return_value
+    assert all(call.args[0] is container for call in mock_upload_blob.call_args_list)
+    assert result == {f"file-{i}": f"https://blob/file-{i}" for i in range(5)}
+
+
+@patch("azure.quantum.job.base_job.ContainerClient")
+def test_download_attachments(mock_container_client):
+    job = _job_with_container()
+    container = mock_container_client.from_container_url.return_value
+
+    def get_blob_client(name):
+        blob_client = Mock()
+        blob_client.download_blob.return_value.readall.return_value = name.encode()
+        return blob_client
+
+    container.get_blob_client.side_effect = get_blob_client
+
+    result = job.download_attachments(["a", "b", "c"])
+
+    mock_container_client.from_container_url.assert_called_once_with(CONTAINER_URI)
+    assert result == {"a": b"a", "b": b"b", "c": b"c"}
+
+
+@patch("azure.quantum.job.base_job.ContainerClient")
+def test_download_all_attachments(mock_container_client, tmp_path):
+    job = _job_with_container()
+    container = mock_container_client.from_container_url.return_value
+    blobs = []
+    for name in ["rawOutputData", "calibration/qubits.json"]:
+        blob = Mock()
+        blob.name = name
+        blobs.append(blob)
+    container.list_blobs.return_value = blobs
+
+    def get_blob_client(name):
+        blob_client = Mock()
+        blob_client.download_blob.return_value.readinto.side_effect = lambda f: f.write(name.encode())
+        return blob_client
+
+    container.get_blob_client.side_effect = get_blob_client
+
+    result = job.download_all_attachments(str(tmp_path))
+
+    assert result == {
+        "rawOutputData": str(tmp_path / "rawOutputData"),
+        "calibration/qubits.json": str(tmp_path / "calibration" / "qubits.json"),
+    }
+    for name, path in result.items():
+        with open(path, "rb") as f:
+            assert f.read() == name.encode()
+
+
+@patch("azure.quantum.job.base_job.ContainerClient")
+def test_download_all_attachments_rejects_paths_outside_dest_dir(mock_container_client, tmp_path):
+    job = _job_with_container()
+    blob = Mock()
+    blob.name = "../outside"
+    mock_container_client.from_container_url.return_value.list_blobs.return_value = [blob]
+
+    with pytest.raises(ValueError, match="outside"):
+        job.download_all_attachments(str(tmp_path / "attachments"))
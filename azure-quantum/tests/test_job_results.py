@@ -3,9 +3,13 @@
 # Licensed under the MIT License.
 ##
 
+import json
+import numpy as np
 import pytest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from azure.quantum import Job, JobDetails
+from azure.quantum.job import ResultsCache, ShotTable
+from mock_client import create_default_workspace
 
 
 def _mock_job(output_data_format: str, results_as_json_str: str, status: str = "Succeeded") -> Job:
@@ -33,6 +37,7 @@ def _mock_job(output_data_format: str, results_as_json_str: str, status: str = "
     download_data = DowloadDataMock()
     download_data.decode = Mock(return_value=results_as_json_str)
     job.download_data = Mock(return_value=download_data)
+    job.download_data_chunks = Mock(return_value=iter([results_as_json_str.encode()]))
 
     return job
 
@@ -564,3 +569,210 @@ def test_job_for_microsoft_quantum_results_shots_v2_wrong_type_raises_exception(
         assert False
     except Exception:
         assert True
+
+
+def _mock_workspace_job(ws, job_id: str, payload: bytes, etag: str = '"0x1"') -> Job:
+    job_details = JobDetails(
+        id=job_id,
+        name="",
+        provider_id="",
+        target="",
+        container_uri="",
+        input_data_format="",
+        output_data_format="microsoft.quantum-results.v2",
+        output_data_uri=f"https://example.com/job-{job_id}/rawOutputData?sig=1",
+        status="Succeeded",
+    )
+    job = Job(workspace=ws, job_details=job_details)
+    job.download_data = Mock(return_value=payload)
+    job.download_data_chunks = Mock(side_effect=lambda uri: iter([payload[:10], payload[10:]]))
+    job.download_blob_properties = Mock(return_value=Mock(etag=etag, size=len(payload)))
+    return job
+
+
+_V2_PAYLOAD = json.dumps({
+    "DataFormat": "microsoft.quantum-results.v2",
+    "Results": [{
+        "Histogram": [
+            {"Outcome": [0], "Display": "[0]", "Count": 1},
+            {"Outcome": [1], "Display": "[1]", "Count": 1},
+        ],
+        "Shots": [[0], [1]],
+    }],
+}).encode()
+
+
+def test_job_results_are_parsed_once():
+    ws = create_default_workspace()
+    ws.results_cache = ResultsCache()
+    job = _mock_workspace_job(ws, "cached-job", _V2_PAYLOAD)
+
+    histogram = job.get_results_histogram()
+    shots = job.get_results_shots()
+    assert job.get_results() == {"[0]": 0.5, "[1]": 0.5}
+    # The v2 results are parsed while they are downloaded
+    assert job.download_data_chunks.call_count == 2
+    assert job.download_data.call_count == 1
+
+    # Callers get their own copy of the cached results
+    shots.append([2])
+    histogram.clear()
+    assert job.get_results_shots() == [[0], [1]]
+    assert job.get_results_histogram() == {
+        "[0]": {"outcome": [0], "count": 1},
+        "[1]": {"outcome": [1], "count": 1},
+    }
+    assert job.download_data_chunks.call_count == 2
+
+    # A new job object for the same job uses the same cache
+    other = _mock_workspace_job(ws, "cached-job", b"")
+    assert other.get_results_shots() == [[0], [1]]
+    assert other.download_data_chunks.call_count == 0
+
+    # Results of an output blob that was written again are downloaded again
+    rewritten = _mock_workspace_job(ws, "cached-job", _V2_PAYLOAD, etag='"0x2"')
+    assert rewritten.get_results_shots() == [[0], [1]]
+    assert rewritten.download_data_chunks.call_count == 1
+
+
+def test_job_results_cache_persists_payloads(tmp_path):
+    ws = create_default_workspace()
+    ws.results_cache = ResultsCache(directory=str(tmp_path))
+    job = _mock_workspace_job(ws, "persisted-job", _V2_PAYLOAD)
+    assert job.get_results_shots() == [[0], [1]]
+    assert job.get_results() == {"[0]": 0.5, "[1]": 0.5}
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # Simulate a new process
+    ws = create_default_workspace()
+    ws.results_cache = ResultsCache(directory=str(tmp_path))
+    job = _mock_workspace_job(ws, "persisted-job", b"")
+    assert job.get_results_shots() == [[0], [1]]
+    assert job.get_results_histogram()["[1]"]["count"] == 1
+    assert job.download_data.call_count == 0
+    assert job.download_data_chunks.call_count == 0
+
+    ws.results_cache.clear()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_job_results_cache_does_not_persist_partial_payloads(tmp_path):
+    cache = ResultsCache(directory=str(tmp_path))
+    chunks = cache.persist_chunks("job", "https://example.com/job/out", '"0x1"', [b"a", b"b"])
+    assert next(chunks) == b"a"
+    chunks.close()
+    assert list(tmp_path.iterdir()) == []
+    assert cache.get_payload("job", "https://example.com/job/out", '"0x1"') is None
+
+
+def test_default_workspace_streams_v2_results():
+    ws = create_default_workspace()
+    assert ws.results_cache is None
+    job = _mock_workspace_job(ws, "streamed-job", _V2_PAYLOAD)
+    del job.download_data_chunks
+    job._get_blob_uri_with_sas_token = Mock(side_effect=lambda uri: uri)
+    chunks = [_V2_PAYLOAD[i:i + 16] for i in range(0, len(_V2_PAYLOAD), 16)]
+
+    with patch("azure.quantum.job.base_job.download_blob_chunks", return_value=iter(chunks)) as download_blob_chunks, \
+            patch("azure.quantum.job.base_job.download_blob") as download_blob:
+        assert job.get_results_shots() == [[0], [1]]
+
+    download_blob_chunks.assert_called_once()
+    assert download_blob_chunks.call_args.args[0] == job.details.output_data_uri
+    download_blob.assert_not_called()
+    job.download_data.assert_not_called()
+    job.download_blob_properties.assert_not_called()
+
+
+def test_default_workspace_downloads_histogram_and_shots_once():
+    ws = create_default_workspace()
+    job = _mock_workspace_job(ws, "histogram-and-shots-job", _V2_PAYLOAD)
+
+    histogram, shots = job._get_results_histogram_and_shots()
+    assert job.download_data_chunks.call_count == 1
+    job.download_data.assert_not_called()
+    assert histogram == job.get_results_histogram()
+    assert shots == job.get_results_shots() == [[0], [1]]
+
+
+def test_job_results_v2_parsed_from_chunks():
+    payload = json.dumps({
+        "Results": [
+            {
+                "Shots": [[0, {"Item1": 1, "Item2": 2.5}], [1, {"Item1": 0, "Item2": -1}]],
+                "Histogram": [{"Outcome": [0], "Display": "[0]", "Count": 1}],
+            },
+            {"Shots": [[1]], "Histogram": [], "Extra": {"Nested": [1, 2]}},
+        ],
+        "DataFormat": "microsoft.quantum-results.v2",
+    }).encode()
+    job = _mock_job("microsoft.quantum-results.v2", "")
+
+    for chunk_size in (1, 3, 64):
+        chunks = [payload[i:i + chunk_size] for i in range(0, len(payload), chunk_size)]
+        assert job._parse_results_shots(iter(chunks)) == [
+            [[0, (1, 2.5)], [1, (0, -1)]],
+            [[1]],
+        ]
+        histograms = job._parse_results_histogram(iter(chunks))
+        assert histograms[0]["[0]"] == {"outcome": [0], "count": 1}
+        assert histograms[1] == {}
+
+
+def test_job_results_v2_truncated_payload_raises():
+    job = _mock_job("microsoft.quantum-results.v2", "")
+    with pytest.raises(ValueError):
+        job._parse_results_shots(_V2_PAYLOAD[:-5])
+
+
+_V2_REGISTERS_PAYLOAD = json.dumps({
+    "DataFormat": "microsoft.quantum-results.v2",
+    "Results": [{
+        "Histogram": [],
+        "Shots": [
+            {"Item1": [0, 1], "Item2": [1]},
+            {"Item1": [0, 1], "Item2": [0]},
+            {"Item1": [1, 1], "Item2": [1]},
+            {"Item1": [0, 2], "Item2": [1]},
+        ],
+    }],
+})
+
+
+def test_job_results_shots_as_shot_table():
+    job = _mock_job("microsoft.quantum-results.v2", _V2_REGISTERS_PAYLOAD)
+    table = job.get_results_shots(format="array")
+
+    assert isinstance(table, ShotTable)
+    assert table.num_shots == 4
+    assert table.widths == (2, 1)
+    assert table.registers[0].dtype == np.uint8
+    assert table.counts() == {"01 1": 1, "01 0": 1, "11 1": 1, "02 1": 1}
+    assert table.marginal([0]) == {"0": 3, "1": 1}
+    assert table.lost_shots().tolist() == [False, False, False, True]
+    # Shot with a lost qubit is ignored: parities of bits 0 and 2 are 1, 0, 0
+    assert table.expectation("ZIZ") == pytest.approx(1 / 3)
+    assert table.expectation([1]) == -1.0
+
+    list_shots = _mock_job("microsoft.quantum-results.v2", _V2_REGISTERS_PAYLOAD).get_results_shots()
+    assert table.to_qiskit_memory() == [
+        " ".join("".join(str(bit) for bit in register) for register in shot)
+        for shot in list_shots
+    ]
+
+    measurements = table.to_cirq_measurements(keys=["a", "b"])
+    assert measurements["a"].dtype == np.int8
+    assert np.shares_memory(measurements["a"], table.registers[0])
+    assert measurements["b"][:, 0].tolist() == [1, 0, 1, 1]
+
+
+def test_job_results_shot_table_rejects_unsupported_shots():
+    job = _mock_job(
+        "microsoft.quantum-results.v2",
+        '{"DataFormat": "microsoft.quantum-results.v2", "Results": [{"Histogram": [], "Shots": [[0, 1], {"Error": {"Code": "0x20", "Name": "TestError"}}]}]}',
+    )
+    with pytest.raises(ValueError, match="can not be stored in a shot table"):
+        job.get_results_shots(format="array")
+
+    with pytest.raises(ValueError, match="Unsupported shots format"):
+        job.get_results_shots(format="dataframe")
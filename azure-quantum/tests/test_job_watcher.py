@@ -0,0 +1,241 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+import asyncio
+import concurrent.futures
+import threading
+from unittest import mock
+
+import pytest
+
+from azure.quantum.job import Job, JobWatcher
+from azure.quantum._client.models import JobDetails
+
+from mock_client import WorkspaceMock, seed_providers
+from common import SUBSCRIPTION_ID, RESOURCE_GROUP, WORKSPACE
+
+
+def _create_workspace() -> WorkspaceMock:
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+    )
+    seed_providers(ws)
+    return ws
+
+
+def _seed_job(ws: WorkspaceMock, job_id: str, status: str = "Waiting") -> Job:
+    details = JobDetails(
+        id=job_id,
+        name=job_id,
+        provider_id="ionq",
+        target="ionq.simulator",
+        status=status,
+    )
+    ws._client.services.jobs._store.append(details)
+    return Job(ws, JobDetails(id=job_id, target="ionq.simulator", status=status))
+
+
+def _create_watcher(ws: WorkspaceMock) -> JobWatcher:
+    return JobWatcher(ws, min_poll_wait_secs=0.01, max_poll_wait_secs=0.02)
+
+
+def test_job_watcher_resolves_future_and_calls_callback():
+    ws = _create_workspace()
+    job = _seed_job(ws, "job-1")
+    details = ws._client.services.jobs._store[-1]
+    statuses = []
+    executing = threading.Event()
+
+    def on_status_change(j: Job):
+        statuses.append(j.details.status)
+        if j.details.status == "Executing":
+            executing.set()
+
+    watcher = _create_watcher(ws)
+    future = watcher.watch(job, callback=on_status_change)
+    details.status = "Executing"
+    assert executing.wait(5)
+    details.status = "Succeeded"
+
+    assert future.result(timeout=5) is job
+    assert job.has_succeeded()
+    assert statuses == ["Executing", "Succeeded"]
+    assert watcher.watched_job_ids == []
+    watcher.stop()
+
+
+def test_job_watcher_refreshes_jobs_in_batches():
+    ws = _create_workspace()
+    jobs = [_seed_job(ws, f"job-{i}") for i in range(5)]
+    store = ws._client.services.jobs._store
+    jobs_client = ws._client.services.jobs
+    original_list = jobs_client.list
+    list_calls = []
+
+    def list_and_complete(*args, **kwargs):
+        list_calls.append(kwargs["filter"])
+        result = original_list(*args, **kwargs)
+        for details in store:
+            details.status = "Succeeded"
+        return result
+
+    watcher = _create_watcher(ws)
+    with mock.patch.object(jobs_client, "list", side_effect=list_and_complete), \
+            mock.patch.object(jobs_client, "get", wraps=jobs_client.get) as get_mock:
+        with watcher._condition:
+            futures = [watcher.watch(job) for job in jobs]
+        for future in futures:
+            future.result(timeout=5)
+
+    assert get_mock.call_count == 0
+    assert len(list_calls) == 1
+    assert list_calls[0].count("Id eq") == len(jobs)
+    watcher.stop()
+
+
+def test_job_watcher_completed_job():
+    ws = _create_workspace()
+    job = _seed_job(ws, "job-1", status="Failed")
+
+    watcher = _create_watcher(ws)
+    future = watcher.watch(job)
+
+    assert future.done()
+    assert future.result() is job
+    assert not watcher.is_running
+
+
+def test_job_watcher_stop_cancels_futures():
+    ws = _create_workspace()
+    job = _seed_job(ws, "job-1")
+
+    watcher = _create_watcher(ws)
+    future = watcher.watch(job)
+    watcher.stop(timeout_secs=5)
+
+    assert future.cancelled()
+    assert not watcher.is_running
+    with pytest.raises(RuntimeError):
+        watcher.watch(job)
+
+
+def test_job_watcher_cancelled_future_unwatches_job():
+    ws = _create_workspace()
+    job = _seed_job(ws, "job-1")
+
+    watcher = _create_watcher(ws)
+    future = watcher.watch(job)
+    assert watcher.watched_job_ids == ["job-1"]
+    assert future.cancel()
+
+    assert watcher.watched_job_ids == []
+    watcher.stop()
+
+
+def test_job_watcher_poll_wait_follows_queue_time():
+    ws = _create_workspace()
+    ionq = ws._client.services.providers._store[1]
+    ionq.targets[0].average_queue_time = 50
+    job = _seed_job(ws, "job-1")
+
+    watcher = JobWatcher(ws, min_poll_wait_secs=1, max_poll_wait_secs=30)
+    queue_times = watcher._get_queue_times()
+
+    assert queue_times["ionq.simulator"] == 50
+    assert watcher._get_max_poll_wait(job, queue_times) == 5
+    job.details.status = "Executing"
+    assert watcher._get_max_poll_wait(job, queue_times) == 30
+
+
+def test_workspace_job_watcher():
+    ws = _create_workspace()
+    job = _seed_job(ws, "job-1")
+
+    watcher = ws.job_watcher
+    assert ws.job_watcher is watcher
+    future = watcher.watch(job)
+    ws.close()
+
+    assert future.cancelled()
+
+
+def test_job_as_future():
+    ws = _create_workspace()
+    ws.job_watcher._min_poll_wait = 0.01
+    jobs = [_seed_job(ws, f"job-{i}") for i in range(3)]
+    for details in ws._client.services.jobs._store:
+        details.status = "Succeeded"
+
+    with mock.patch.object(Job, "get_results", autospec=True, side_effect=lambda job: job.id):
+        futures = [job.as_future() for job in jobs]
+        done, not_done = concurrent.futures.wait(futures, timeout=5)
+
+    assert not not_done
+    assert [f.result() for f in futures] == [job.id for job in jobs]
+    ws.close()
+
+
+def test_job_as_future_with_several_instances_of_a_job():
+    ws = _create_workspace()
+    ws.job_watcher._min_poll_wait = 0.01
+    first = _seed_job(ws, "job-1")
+    second = Job(ws, JobDetails(id="job-1", target="ionq.simulator", status="Waiting"))
+    ws._client.services.jobs._store[-1].status = "Succeeded"
+    polled_instances = []
+
+    def get_results(job):
+        polled_instances.append(job)
+        assert job.has_completed()
+        return job.id
+
+    with mock.patch.object(Job, "wait_until_completed", side_effect=AssertionError("polled again")):
+        futures = [first.as_future(get_results), second.as_future(get_results)]
+        done, not_done = concurrent.futures.wait(futures, timeout=5)
+
+    assert not not_done
+    assert [f.result() for f in futures] == ["job-1", "job-1"]
+    assert polled_instances == [first, second] or polled_instances == [second, first]
+    assert second.has_succeeded()
+    ws.close()
+
+
+def test_job_as_future_raises_results_error():
+    ws = _create_workspace()
+    job = _seed_job(ws, "job-1", status="Failed")
+
+    with mock.patch.object(Job, "get_results", side_effect=RuntimeError("failed")):
+        future = job.as_future()
+        with pytest.raises(RuntimeError, match="failed"):
+            future.result(timeout=5)
+    ws.close()
+
+
+def test_job_as_future_cancel_unwatches_job():
+    ws = _create_workspace()
+    job = _seed_job(ws, "job-1")
+
+    future = job.as_future()
+    assert ws.job_watcher.watched_job_ids == ["job-1"]
+    assert future.cancel()
+
+    assert ws.job_watcher.watched_job_ids == []
+    ws.close()
+
+
+def test_job_as_asyncio_future():
+    ws = _create_workspace()
+    ws.job_watcher._min_poll_wait = 0.01
+    jobs = [_seed_job(ws, f"job-{i}") for i in range(2)]
+    for details in ws._client.services.jobs._store:
+        details.status = "Succeeded"
+
+    async def gather():
+        return await asyncio.gather(
+            *(job.as_asyncio_future(get_results=lambda j: j.id) for job in jobs)
+        )
+
+    assert asyncio.run(gather()) == [job.id for job in jobs]
+    ws.close()
@@ -657,3 +657,16 @@ def test_load_workspace_from_arm_constructs_correct_url():
         assert f"/subscriptions/{SUBSCRIPTION_ID}" in request.url
         assert f"/resourceGroups/{RESOURCE_GROUP}" in request.url
         assert f"/providers/Microsoft.Quantum/workspaces/{WORKSPACE}" in request.url
+
+
+def test_init_with_transport():
+    mock_credential = MagicMock()
+    transport = MagicMock()
+
+    client = WorkspaceMgmtClient(
+        credential=mock_credential,
+        base_url=ConnectionConstants.ARM_PRODUCTION_ENDPOINT,
+        transport=transport,
+    )
+
+    assert client._client._pipeline._transport is transport
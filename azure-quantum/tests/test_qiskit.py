@@ -13,7 +13,9 @@ They are intended to be executed under tox across Qiskit major versions.
 
 from __future__ import annotations
 
+import json
 from typing import Iterable, Set
+from unittest.mock import Mock
 
 import pytest
 
@@ -32,6 +34,7 @@ from azure.quantum.qiskit.backends.ionq import (
 )
 from azure.quantum.qiskit.provider import AzureQuantumProvider
 from azure.quantum.job.base_job import BaseJob
+from azure.quantum.job import Job, JobDetails
 from azure.quantum.qiskit.backends.quantinuum import (
     QuantinuumEmulatorBackend,
     QuantinuumEmulatorQirBackend,
@@ -58,14 +61,6 @@ def _seed_workspace_target(
     which iterates `ws._client.services.providers.list()`.
     """
 
-    # `AzureQuantumProvider.__init__` appends a user agent to the Workspace, which
-    # recreates the underlying client (and would wipe our patched providers.list).
-    # For this offline-only test, keep the existing mock client.
-    if hasattr(ws, "_connection_params") and hasattr(
-        ws._connection_params, "on_new_client_request"
-    ):
-        ws._connection_params.on_new_client_request = None
-
     target_status = TargetStatus(
         {
             "id": target_id,
@@ -264,6 +259,51 @@ def test_microsoft_v2_results_raw_and_filtered_fields_handle_qubit_loss():
     assert formatted["raw_memory"].count("0100") == 20
 
 
+def test_microsoft_v2_results_are_downloaded_once():
+    ws = create_default_workspace()
+    provider = AzureQuantumProvider(workspace=ws)
+    backend = SimpleNamespace(
+        name="dummy",
+        version="0.0",
+        provider=provider,
+        options=SimpleNamespace(shots=2),
+        configuration=lambda: SimpleNamespace(simulator=False),
+    )
+    payload = json.dumps({
+        "DataFormat": "microsoft.quantum-results.v2",
+        "Results": [{
+            "Histogram": [
+                {"Outcome": [0, 1], "Display": "[0, 1]", "Count": 1},
+                {"Outcome": [1, 1], "Display": "[1, 1]", "Count": 1},
+            ],
+            "Shots": [[0, 1], [1, 1]],
+        }],
+    }).encode()
+    azure_job = Job(ws, JobDetails(
+        id="job-v2",
+        name="",
+        provider_id="microsoft",
+        target="dummy",
+        container_uri="",
+        input_data_format="",
+        output_data_format="microsoft.quantum-results.v2",
+        output_data_uri="https://example.com/job-v2/rawOutputData?sig=1",
+        status="Succeeded",
+    ))
+    azure_job.download_data_chunks = Mock(side_effect=lambda uri: iter([payload]))
+    azure_job.download_data = Mock(return_value=payload)
+
+    job = AzureQuantumJob(backend, azure_job=azure_job)
+    results = job._translate_microsoft_v2_results()
+
+    assert ws.results_cache is None
+    assert azure_job.download_data_chunks.call_count == 1
+    azure_job.download_data.assert_not_called()
+    total_count, formatted = results[0]
+    assert total_count == 2
+    assert formatted["counts"] == {"01": 1, "11": 1}
+
+
 def test_ionq_qir_transpile_decomposes_non_qir_gates():
     backend = IonQSimulatorQirBackend(name="ionq.simulator", provider=None)
     circuit, non_qir_ops = _build_non_qir_test_circuit()
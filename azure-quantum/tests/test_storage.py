@@ -0,0 +1,420 @@
+##
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+##
+import io
+import json
+import mmap
+import tempfile
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from azure.core.exceptions import HttpResponseError, ResourceModifiedError, ResourceNotFoundError, ServiceRequestError
+
+from azure.quantum.storage import (
+    AppendBlobWriter,
+    StreamedBlob,
+    StreamedBlobState,
+    download_blob,
+    download_blob_chunks,
+    download_blob_into,
+    download_blob_mapped,
+    upload_blob,
+)
+from azure.quantum.job.results_v2_parser import collect_results_v2, iter_payload_chunks
+
+
+def _create_streamed_blob(**kwargs):
+    container = mock.MagicMock()
+    blob = container.get_blob_client.return_value
+    staged = {}
+    lock = threading.Lock()
+
+    def stage_block(block_id, data, length, **kwargs):
+        assert len(data) == length
+        with lock:
+            staged[block_id] = bytes(data)
+
+    blob.stage_block.side_effect = stage_block
+    streamed_blob = StreamedBlob(container, "inputData", "application/json", "", **kwargs)
+    return streamed_blob, blob, staged
+
+
+def _committed_data(blob, staged) -> bytes:
+    block_ids = blob.commit_block_list.call_args.args[0]
+    return b"".join(staged[block_id] for block_id in block_ids)
+
+
+def test_streamed_blob_splits_data_into_blocks():
+    streamed_blob, blob, staged = _create_streamed_blob(block_size=10, max_workers=4)
+    data = bytes(range(256)) * 4
+
+    streamed_blob.upload_data(data)
+    streamed_blob.upload_data(b"tail")
+    streamed_blob.commit()
+
+    assert blob.stage_block.call_count == 104
+    assert blob.commit_block_list.call_count == 1
+    assert _committed_data(blob, staged) == data + b"tail"
+    assert streamed_blob.state == StreamedBlobState.committed
+
+
+def test_streamed_blob_upload_stream():
+    streamed_blob, blob, staged = _create_streamed_blob(block_size=7, max_workers=2)
+    data = b"0123456789" * 10
+
+    streamed_blob.upload_stream(io.BytesIO(data))
+    streamed_blob.upload_stream([data[:3], data[3:50], b"", data[50:]])
+    streamed_blob.commit()
+
+    assert _committed_data(blob, staged) == data + data
+    assert all(len(block) <= 7 for block in staged.values())
+
+
+def test_streamed_blob_retries_failed_block():
+    streamed_blob, blob, staged = _create_streamed_blob(block_size=4)
+    stage_block = blob.stage_block.side_effect
+    failures = []
+
+    def flaky_stage_block(block_id, data, length, **kwargs):
+        if bytes(data) == b"5678" and not failures:
+            failures.append(block_id)
+            raise ServiceRequestError("Connection reset")
+        stage_block(block_id, data, length, **kwargs)
+
+    blob.stage_block.side_effect = flaky_stage_block
+    with mock.patch("azure.quantum.storage.time.sleep") as sleep:
+        streamed_blob.upload_data(b"123456789")
+    streamed_blob.commit()
+
+    assert len(failures) == 1
+    assert sleep.call_count == 1
+    assert blob.stage_block.call_count == 4
+    # The retry policy of the storage client does not retry blocks as well
+    assert all(call.kwargs["retry_total"] == 0 for call in blob.stage_block.call_args_list)
+    assert _committed_data(blob, staged) == b"123456789"
+
+
+def test_streamed_blob_raises_after_max_retries():
+    streamed_blob, blob, _ = _create_streamed_blob(max_retries=2)
+    blob.stage_block.side_effect = ServiceRequestError("Connection reset")
+
+    with mock.patch("azure.quantum.storage.time.sleep"):
+        with pytest.raises(ServiceRequestError):
+            streamed_blob.upload_data(b"data")
+    assert blob.stage_block.call_count == 3
+
+
+def test_streamed_blob_raises_non_transient_errors_right_away():
+    for status_code, expected_calls in [(403, 1), (404, 1), (413, 1), (429, 3), (503, 3)]:
+        streamed_blob, blob, _ = _create_streamed_blob(max_retries=2)
+        error = HttpResponseError("Request failed")
+        error.status_code = status_code
+        blob.stage_block.side_effect = error
+
+        with mock.patch("azure.quantum.storage.time.sleep"):
+            with pytest.raises(HttpResponseError):
+                streamed_blob.upload_data(b"data")
+        assert blob.stage_block.call_count == expected_calls, status_code
+
+
+def test_streamed_blob_commit_requires_data():
+    streamed_blob, _, _ = _create_streamed_blob()
+
+    with pytest.raises(Exception, match="before uploading data"):
+        streamed_blob.commit()
+
+
+class _FakeRangedBlobClient:
+    """Serves ranged downloads of a blob, like `BlobClient.download_blob`."""
+
+    def __init__(self, data: bytes, etag: str = '"0x1"'):
+        self.data = data
+        self.etag = etag
+        self.blob_name = "rawOutputData"
+        self.container_name = "job-1"
+        self.account_name = "account"
+        self.ranges = []
+        self._lock = threading.Lock()
+
+    def download_blob(self, offset=None, length=None, etag=None, match_condition=None):
+        if etag is not None and etag != self.etag:
+            raise ResourceModifiedError("The condition specified using HTTP conditional header(s) is not met.")
+        if offset is not None and offset >= len(self.data):
+            error = HttpResponseError("The range specified is invalid for the current size of the resource.")
+            error.status_code = 416
+            raise error
+        with self._lock:
+            self.ranges.append((offset, length))
+        downloader = mock.MagicMock()
+        end = len(self.data) if length is None else offset + length
+        downloader.readall.return_value = self.data[offset:end]
+        downloader.properties.etag = self.etag
+        downloader.properties.content_range = f"bytes {offset}-{end - 1}/{len(self.data)}"
+        return downloader
+
+    def get_blob_properties(self):
+        return SimpleNamespace(size=len(self.data), etag=self.etag)
+
+
+@pytest.fixture
+def ranged_blob():
+    blob_client = _FakeRangedBlobClient(bytes(range(256)) * 41)
+    with mock.patch("azure.quantum.storage.BlobClient.from_blob_url", return_value=blob_client):
+        yield blob_client
+
+
+def test_download_blob_ranges(ranged_blob):
+    data = download_blob("https://blob", max_concurrency=4, chunk_size=1000)
+
+    assert data == ranged_blob.data
+    assert sorted(ranged_blob.ranges) == [(i, min(1000, 10496 - i)) for i in range(0, 10496, 1000)]
+
+
+def test_download_blob_single_range(ranged_blob):
+    data = download_blob("https://blob", max_concurrency=4, chunk_size=20000)
+
+    assert data == ranged_blob.data
+    assert ranged_blob.ranges == [(0, 20000)]
+
+
+def test_download_empty_blob(ranged_blob):
+    ranged_blob.data = b""
+
+    assert download_blob("https://blob", max_concurrency=4, chunk_size=1000) == b""
+    assert bytes(download_blob_into("https://blob", chunk_size=1000)) == b""
+    assert list(download_blob_chunks("https://blob", max_concurrency=3, chunk_size=1000)) == []
+
+
+def test_download_blob_into_buffer(ranged_blob):
+    buffer = bytearray(20000)
+
+    view = download_blob_into("https://blob", buffer, max_concurrency=3, chunk_size=999)
+
+    assert len(view) == len(ranged_blob.data)
+    assert view.obj is buffer
+    assert bytes(view) == ranged_blob.data
+    with pytest.raises(ValueError, match="too small"):
+        download_blob_into("https://blob", bytearray(10), chunk_size=999)
+
+
+def test_download_blob_into_mmap(ranged_blob):
+    with tempfile.TemporaryFile() as f:
+        f.truncate(len(ranged_blob.data))
+        with mmap.mmap(f.fileno(), len(ranged_blob.data)) as mapped:
+            view = download_blob_into("https://blob", mapped, chunk_size=4096)
+            assert bytes(view) == ranged_blob.data
+            view.release()
+
+
+def test_download_blob_chunks_in_order(ranged_blob):
+    chunks = list(download_blob_chunks("https://blob", max_concurrency=3, chunk_size=1000))
+
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert b"".join(chunks) == ranged_blob.data
+
+
+def test_download_blob_ranges_fails_if_blob_changes(ranged_blob):
+    original = ranged_blob.download_blob
+
+    def download_blob(offset=None, length=None, **kwargs):
+        downloader = original(offset=offset, length=length, **kwargs)
+        ranged_blob.etag = '"0x2"'
+        return downloader
+
+    ranged_blob.download_blob = download_blob
+    with pytest.raises(ResourceModifiedError):
+        download_blob_into("https://blob", chunk_size=1000)
+
+
+def test_download_blob_mapped(ranged_blob, tmp_path):
+    view = download_blob_mapped("https://blob", chunk_size=1000, directory=str(tmp_path))
+
+    assert isinstance(view.obj, mmap.mmap)
+    assert view.readonly
+    assert view == ranged_blob.data
+    # The temporary file is only kept alive by the mapping
+    assert list(tmp_path.iterdir()) == []
+    view.release()
+
+
+def test_parse_results_from_mapped_download(ranged_blob, tmp_path):
+    histogram = [
+        {"Outcome": [i % 2], "Display": f"[{i % 2}]", "Count": i} for i in range(500)
+    ]
+    ranged_blob.data = json.dumps({
+        "DataFormat": "microsoft.quantum-results.v2",
+        "Results": [{"Histogram": histogram}],
+    }).encode()
+    view = download_blob_mapped("https://blob", chunk_size=1000, directory=str(tmp_path))
+
+    with mock.patch("azure.quantum.job.results_v2_parser._PAYLOAD_CHUNK_SIZE", 1000):
+        chunks = list(iter_payload_chunks(view))
+    assert all(type(chunk) is bytes for chunk in chunks)
+    assert len(chunks) == -(-len(ranged_blob.data) // 1000)
+    results = collect_results_v2(chunks, "Histogram")
+    assert results == collect_results_v2(iter_payload_chunks(ranged_blob.data), "Histogram")
+    assert len(results[0]) == 500
+    view.release()
+
+
+def _upload(data) -> bytes:
+    container = mock.MagicMock()
+    uploads = []
+
+    def fake_upload_blob(stream, length=None, **_):
+        content = stream.read() if hasattr(stream, "read") else stream
+        if length is not None:
+            assert len(content) == length
+        uploads.append(content)
+
+    container.get_blob_client.return_value.upload_blob.side_effect = fake_upload_blob
+    upload_blob(container, "inputData", "application/json", "", data, return_sas_token=False)
+    return uploads[0]
+
+
+def test_upload_blob_from_file_and_buffers(tmp_path):
+    data = b"0123456789" * 1000
+    path = tmp_path / "input.json"
+    path.write_bytes(data)
+
+    assert _upload(data) == data
+    assert _upload(path) == data
+    assert _upload(memoryview(data)[10:]) == data[10:]
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert _upload(mapped) == data
+
+
+def _get_block_list(staged):
+    def get_block_list(block_list_type="committed"):
+        assert block_list_type == "uncommitted"
+        return [], [SimpleNamespace(id=id, size=len(data)) for id, data in staged.items()]
+    return get_block_list
+
+
+def test_streamed_blob_resumes_from_checkpoint(tmp_path):
+    checkpoint_path = str(tmp_path / "inputData.checkpoint")
+    data = bytes(range(256)) * 4
+    streamed_blob, blob, staged = _create_streamed_blob(
+        block_size=100, max_retries=0, checkpoint_path=checkpoint_path
+    )
+    stage_block = blob.stage_block.side_effect
+
+    def failing_stage_block(block_id, data, length, **kwargs):
+        if int(block_id) >= 6:
+            raise ServiceRequestError("Connection reset")
+        stage_block(block_id, data, length, **kwargs)
+
+    blob.stage_block.side_effect = failing_stage_block
+    with pytest.raises(ServiceRequestError):
+        streamed_blob.upload_data(data)
+    staged_before = dict(staged)
+    assert 0 < len(staged_before) <= 6
+
+    # A block staged with other data is staged again
+    modified = bytearray(data)
+    modified[0] ^= 0xFF
+    blob.stage_block.side_effect = stage_block
+    blob.get_block_list.side_effect = _get_block_list(staged)
+    resumed_blob = StreamedBlob(
+        streamed_blob.container, "inputData", "application/json", "",
+        block_size=100, checkpoint_path=checkpoint_path,
+    )
+    blob.stage_block.reset_mock()
+    resumed_blob.upload_data(bytes(modified))
+    resumed_blob.commit()
+
+    assert resumed_blob.resumed_blocks == len(staged_before) - 1
+    assert blob.stage_block.call_count == 11 - resumed_blob.resumed_blocks
+    assert _committed_data(blob, staged) == bytes(modified)
+    assert not (tmp_path / "inputData.checkpoint").exists()
+
+
+def test_streamed_blob_ignores_checkpoint_of_expired_blocks(tmp_path):
+    checkpoint_path = str(tmp_path / "inputData.checkpoint")
+    streamed_blob, blob, staged = _create_streamed_blob(block_size=4, checkpoint_path=checkpoint_path)
+    streamed_blob.upload_data(b"123456789")
+
+    # The uncommitted blocks were discarded by the service
+    blob.get_block_list.side_effect = _get_block_list({})
+    blob.stage_block.reset_mock()
+    resumed_blob = StreamedBlob(
+        streamed_blob.container, "inputData", "application/json", "",
+        block_size=4, checkpoint_path=checkpoint_path,
+    )
+    resumed_blob.upload_data(b"123456789")
+    resumed_blob.commit()
+
+    assert resumed_blob.resumed_blocks == 0
+    assert blob.stage_block.call_count == 3
+    assert _committed_data(blob, staged) == b"123456789"
+
+
+def _create_append_blob_writer(**kwargs):
+    container = mock.MagicMock()
+    blob = container.get_blob_client.return_value
+    blob.get_blob_properties.side_effect = ResourceNotFoundError("The specified blob does not exist.")
+    appended = []
+    blob.append_block.side_effect = lambda data, length: appended.append(bytes(data))
+    writer = AppendBlobWriter(container, "progress", "application/x-ndjson", **kwargs)
+    return writer, blob, appended
+
+
+def test_append_blob_writer_buffers_writes():
+    writer, blob, appended = _create_append_blob_writer(flush_size=100)
+
+    with writer:
+        for i in range(30):
+            writer.write(f"{i:9}\n")
+        assert appended[0] == "".join(f"{i:9}\n" for i in range(10)).encode()
+        assert len(appended) == 3
+
+    assert b"".join(appended) == "".join(f"{i:9}\n" for i in range(30)).encode()
+    assert all(len(block) == 100 for block in appended)
+    blob.get_blob_properties.assert_called_once()
+    blob.create_append_blob.assert_called_once()
+    with pytest.raises(ValueError):
+        writer.write("closed")
+
+
+def test_append_blob_writer_flushes_on_interval():
+    writer, blob, appended = _create_append_blob_writer(flush_interval_secs=0.01)
+    flushed = threading.Event()
+    blob.append_block.side_effect = lambda data, length: (appended.append(bytes(data)), flushed.set())
+
+    writer.write(b"record\n")
+    assert flushed.wait(5)
+    writer.close()
+
+    assert appended == [b"record\n"]
+
+
+def test_append_blob_writer_keeps_data_on_error():
+    writer, blob, appended = _create_append_blob_writer()
+    blob.append_block.side_effect = ServiceRequestError("Connection reset")
+
+    writer.write(b"first\n")
+    with pytest.raises(ServiceRequestError):
+        writer.flush()
+    blob.append_block.side_effect = lambda data, length: appended.append(bytes(data))
+    writer.write(b"second\n")
+    writer.close()
+
+    assert appended == [b"first\nsecond\n"]
+
+
+def test_append_blob_writer_stays_open_if_final_append_fails():
+    writer, blob, appended = _create_append_blob_writer()
+    blob.append_block.side_effect = ServiceRequestError("Connection reset")
+
+    writer.write(b"last\n")
+    with pytest.raises(ServiceRequestError):
+        writer.close()
+    blob.append_block.side_effect = lambda data, length: appended.append(bytes(data))
+    writer.close()
+
+    assert appended == [b"last\n"]
+    with pytest.raises(ValueError):
+        writer.write("closed")
@@ -4,8 +4,11 @@
 ##
 
 import copy
+import gzip
+import pytest
 from unittest import mock
 from azure.quantum.target.target import Target
+from azure.quantum._compression import compress_payload
 
 from mock_client import WorkspaceMock
 from common import (
@@ -51,3 +54,138 @@ def test_target_submit_does_not_mutate_input_params():
     assert "shots" not in input_params
     assert input_params["nested"]["innerOption"] == "innerValue"
     assert input_params["nested"]["list"] == [1, 2, 3]
+
+
+def _create_fake_target() -> Target:
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+    )
+    return Target(
+        workspace=ws,
+        name="fake.target",
+        provider_id="fake-provider",
+        input_data_format="fake-input-format",
+        output_data_format="fake-output-format",
+    )
+
+
+def test_target_submit_many_returns_jobs_in_order():
+    target = _create_fake_target()
+    inputs = [f"input-{i}".encode() for i in range(10)]
+
+    with mock.patch(
+        "azure.quantum.job.base_job.BaseJob.upload_input_data",
+        side_effect=lambda input_data, **_: f"https://example.com/{input_data.decode()}",
+    ):
+        jobs = target.submit_many(inputs, name="sweep", shots=10, max_workers=4)
+
+    assert [j.details.input_data_uri for j in jobs] == [
+        f"https://example.com/input-{i}" for i in range(10)
+    ]
+    assert len({j.id for j in jobs}) == 10
+    assert all(j.details.name == "sweep" for j in jobs)
+    assert all(j.details.input_params["shots"] == 10 for j in jobs)
+
+
+def test_target_submit_many_captures_errors():
+    target = _create_fake_target()
+
+    def upload(input_data, **_):
+        if input_data == b"bad":
+            raise ValueError("upload failed")
+        return "https://example.com/blob"
+
+    with mock.patch(
+        "azure.quantum.job.base_job.BaseJob.upload_input_data",
+        side_effect=upload,
+    ):
+        results = target.submit_many([b"good", b"bad", b"good"], return_exceptions=True)
+        assert isinstance(results[1], ValueError)
+        assert results[0].details.status == "Submitted"
+        assert results[2].details.status == "Submitted"
+
+        with pytest.raises(ValueError, match="upload failed"):
+            target.submit_many([b"good", b"bad"])
+
+
+def test_target_submit_compresses_input_data():
+    target = _create_fake_target()
+    input_data = b'{"qubits": 2, "circuit": []}' * 1000
+    uploads = []
+
+    def upload_input_data(input_data, encoding, **_):
+        uploads.append((input_data, encoding))
+        return "https://example.com/inputData"
+
+    with mock.patch(
+        "azure.quantum.job.base_job.BaseJob.upload_input_data",
+        side_effect=upload_input_data,
+    ):
+        job = target.submit(input_data, compression="gzip")
+        target.compression = "gzip"
+        target.submit(input_data)
+
+    assert len(uploads) == 2
+    for uploaded, encoding in uploads:
+        assert encoding == "gzip"
+        assert len(uploaded) < len(input_data)
+        assert gzip.decompress(uploaded) == input_data
+    assert job.compression_stats.encoding == "gzip"
+    assert job.compression_stats.original_size == len(input_data)
+    assert job.compression_stats.compressed_size == len(uploads[0][0])
+
+
+def test_target_submit_rejects_unsupported_compression():
+    target = _create_fake_target()
+
+    with mock.patch("azure.quantum.job.base_job.BaseJob.upload_input_data") as upload_input_data:
+        with pytest.raises(ValueError, match="does not accept input data compressed with 'brotli'"):
+            target.submit(b"data", compression="brotli")
+    upload_input_data.assert_not_called()
+
+
+def test_target_submit_rejects_compression_of_encoded_data():
+    target = _create_fake_target()
+
+    with pytest.raises(ValueError, match="can not be compressed"):
+        target.submit(b"data", compression="gzip", encoding="gzip")
+
+
+def test_compress_payload():
+    data = bytes(range(256)) * 10000
+
+    compressed, stats = compress_payload(data, "gzip")
+
+    assert gzip.decompress(compressed) == data
+    assert stats.encoding == "gzip"
+    assert stats.original_size == len(data)
+    assert stats.compressed_size == len(compressed)
+    assert stats.ratio > 1
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        compress_payload(data, "brotli")
+
+
+def test_target_submit_from_file(tmp_path):
+    target = _create_fake_target()
+    input_data = b'{"qubits": 2, "circuit": []}' * 1000
+    path = tmp_path / "circuit.json"
+    path.write_bytes(input_data)
+    uploads = []
+
+    def upload_input_data(input_data, encoding, **_):
+        uploads.append((input_data, encoding))
+        return "https://example.com/inputData"
+
+    with mock.patch(
+        "azure.quantum.job.base_job.BaseJob.upload_input_data",
+        side_effect=upload_input_data,
+    ):
+        target.submit(path)
+        target.submit(path, compression="gzip")
+
+    # The file is uploaded from its path, without reading it first
+    assert uploads[0] == (path, "")
+    assert gzip.decompress(uploads[1][0]) == input_data
+    assert uploads[1][1] == "gzip"
@@ -5,16 +5,23 @@
 
 import pytest
 import os
+import threading
+from datetime import datetime, timedelta, timezone
 from unittest import mock
 from azure.quantum.job.job import Job
-from azure.quantum._client.models import JobDetails
-from azure.quantum import Priority
+from azure.quantum._client.models import JobDetails, ProviderStatus, SasUriResponse
+from azure.quantum import Priority, Workspace
 from azure.quantum._constants import EnvironmentVariables, ConnectionConstants
+from azure.quantum._sas_uri_cache import get_sas_expiry
+from azure.quantum._target_catalog import TargetCatalog
 from azure.core.credentials import AzureKeyCredential
+from azure.core.pipeline import PipelineContext, PipelineRequest
 from azure.core.pipeline.policies import AzureKeyCredentialPolicy
+from azure.core.rest import HttpRequest
 from azure.identity import EnvironmentCredential
+from azure.storage.blob import BlobClient
 
-from mock_client import WorkspaceMock, MockWorkspaceMgmtClient
+from mock_client import WorkspaceMock, MockWorkspaceMgmtClient, seed_providers
 from common import (
     SUBSCRIPTION_ID,
     RESOURCE_GROUP,
@@ -648,6 +655,33 @@ def test_workspace_user_agent_appid():
         ws.append_user_agent(None)
         assert ws.user_agent == app_id
 
+
+def test_workspace_user_agent_applies_without_recreating_client():
+    with mock.patch.dict(os.environ):
+        os.environ.pop(EnvironmentVariables.USER_AGENT_APPID, None)
+        ws = WorkspaceMock(
+            subscription_id=SUBSCRIPTION_ID,
+            resource_group=RESOURCE_GROUP,
+            name=WORKSPACE,
+            user_agent="MyUserAgent",
+        )
+        mock_client = ws._client
+        # pylint: disable=protected-access
+        client = Workspace._create_client(ws)
+        policy = client._config.user_agent_policy
+
+        ws.append_user_agent("featurex")
+        assert ws._client is mock_client
+        request = PipelineRequest(HttpRequest("GET", ENDPOINT_URI), PipelineContext(None))
+        policy.on_request(request)
+        assert request.http_request.headers["User-Agent"].startswith(
+            "MyUserAgent-featurex azsdk-python-quantum/"
+        )
+
+        ws.append_user_agent(None)
+        assert ws._client is mock_client
+        assert policy.user_agent.startswith("azsdk-python-quantum/")
+
 def test_workspace_context_manager():
     """Test that Workspace can be used as a context manager"""
     with WorkspaceMock(
@@ -714,3 +748,409 @@ def test_get_container_uri_uses_linked_storage_sas_when_storage_none():
             assert isinstance(uri, str)
             assert "https://example.com/" in uri
             assert "sas-token" in uri
+
+
+def _seed_pending_jobs(ws: WorkspaceMock, count: int) -> list[Job]:
+    jobs = []
+    for i in range(count):
+        details = JobDetails(
+            id=f"pending-{i}",
+            name=f"job-pending-{i}",
+            provider_id="ionq",
+            target="ionq.simulator",
+            status="Waiting",
+        )
+        ws._client.services.jobs._store.append(details)
+        jobs.append(Job(ws, JobDetails(id=details.id, status="Waiting")))
+    return jobs
+
+
+def test_workspace_as_completed_refreshes_jobs_in_batches():
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+    )
+    jobs = _seed_pending_jobs(ws, 120)
+    store = ws._client.services.jobs._store
+    jobs_client = ws._client.services.jobs
+    original_list = jobs_client.list
+    list_calls = []
+
+    def list_and_progress(*args, **kwargs):
+        list_calls.append(kwargs["filter"])
+        result = original_list(*args, **kwargs)
+        # Complete the jobs in reverse order, 50 per batch request
+        pending = [d for d in store if d.status == "Waiting"]
+        for details in pending[-50:]:
+            details.status = "Succeeded"
+        return result
+
+    with mock.patch.object(jobs_client, "list", side_effect=list_and_progress), \
+            mock.patch.object(jobs_client, "get", wraps=jobs_client.get) as get_mock, \
+            mock.patch("azure.quantum.workspace.time.sleep"):
+        completed = list(ws.as_completed(jobs))
+
+    assert sorted(j.id for j in completed) == sorted(j.id for j in jobs)
+    assert all(j.has_succeeded() for j in jobs)
+    assert get_mock.call_count == 0
+    # Every list request filters on at most one batch of job ids
+    assert all(f.count("Id eq") <= ws._REFRESH_JOBS_BATCH_SIZE for f in list_calls)
+    assert len(list_calls) == 3
+
+
+def test_workspace_wait_for_jobs_timeout():
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+    )
+    jobs = _seed_pending_jobs(ws, 3)
+    ws._client.services.jobs._store[0].status = "Failed"
+
+    with pytest.raises(TimeoutError):
+        ws.wait_for_jobs(jobs, timeout_secs=0, print_progress=False)
+    assert jobs[0].details.status == "Failed"
+    assert jobs[1].details.status == "Waiting"
+
+
+def test_workspace_refresh_jobs_falls_back_to_get():
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+    )
+    jobs = _seed_pending_jobs(ws, 2)
+    for details in ws._client.services.jobs._store:
+        details.status = "Succeeded"
+
+    with mock.patch.object(ws._client.services.jobs, "list", return_value=[]):
+        assert ws.wait_for_jobs(jobs, print_progress=False) == jobs
+    assert all(j.has_succeeded() for j in jobs)
+
+
+def test_workspace_refresh_jobs_with_duplicate_ids():
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+    )
+    jobs = _seed_pending_jobs(ws, 2)
+    duplicates = [Job(ws, JobDetails(id=job.id, status="Waiting")) for job in jobs]
+    for details in ws._client.services.jobs._store:
+        details.status = "Succeeded"
+
+    ws._refresh_jobs(jobs + duplicates)
+    assert all(j.has_succeeded() for j in jobs + duplicates)
+
+    for details in ws._client.services.jobs._store:
+        details.status = "Failed"
+    jobs_client = ws._client.services.jobs
+    with mock.patch.object(jobs_client, "list", return_value=[]), \
+            mock.patch.object(jobs_client, "get", wraps=jobs_client.get) as get_mock:
+        ws._refresh_jobs(jobs + duplicates)
+    assert all(j.details.status == "Failed" for j in jobs + duplicates)
+    # A single request per job id
+    assert get_mock.call_count == 2
+
+
+def test_workspace_submit_jobs():
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+    )
+    jobs = [
+        Job.from_storage_uri(
+            workspace=ws,
+            name=f"job-{i}",
+            target="ionq.simulator",
+            input_data_uri="https://example.com/input",
+            provider_id="ionq",
+            input_data_format="ionq.circuit.v1",
+            output_data_format="ionq.quantum-results.v1",
+            submit_job=False,
+        )
+        for i in range(5)
+    ]
+
+    submitted = ws.submit_jobs(jobs, max_workers=2)
+
+    assert submitted == jobs
+    assert all(j.details.status == "Submitted" for j in jobs)
+    assert sorted(j.id for j in ws.list_jobs()) == sorted(j.id for j in jobs)
+
+
+def _mock_sas_uri_with_expiry(expiry):
+    se = expiry.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def get_sas_uri(subscription_id, resource_group_name, workspace_name, *, blob_details):
+        path = blob_details.container_name
+        if blob_details.blob_name:
+            path += f"/{blob_details.blob_name}"
+        return SasUriResponse({"sasUri": f"https://example.com/{path}?se={se}&sig=x"})
+
+    return get_sas_uri
+
+
+def test_workspace_reuses_valid_sas_uris():
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+    )
+    storage = ws._client.services.storage
+    expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+
+    with mock.patch.object(
+        storage, "get_sas_uri", side_effect=_mock_sas_uri_with_expiry(expiry)
+    ) as get_sas_uri:
+        first = ws.get_container_uri(container_name="shared")
+        assert ws.get_container_uri(container_name="shared") == first
+        ws._get_linked_storage_sas_uri("shared", "blob")
+        ws._get_linked_storage_sas_uri("shared", "blob")
+        assert get_sas_uri.call_count == 2
+
+        # SAS URIs about to expire are requested again
+        ws._sas_uri_cache.clear()
+        with mock.patch.object(
+            storage,
+            "get_sas_uri",
+            side_effect=_mock_sas_uri_with_expiry(datetime.now(timezone.utc) + timedelta(minutes=1)),
+        ) as get_expiring_sas_uri:
+            ws.get_container_uri(container_name="other")
+            ws.get_container_uri(container_name="other")
+            assert get_expiring_sas_uri.call_count == 2
+
+
+def test_job_from_input_data_in_shared_container():
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+    )
+    expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+
+    with mock.patch.object(
+        ws._client.services.storage,
+        "get_sas_uri",
+        side_effect=_mock_sas_uri_with_expiry(expiry),
+    ) as get_sas_uri, mock.patch(
+        "azure.quantum.job.base_job.BaseJob.upload_input_data",
+        side_effect=lambda container_uri, blob_name, **_: f"{container_uri} {blob_name}",
+    ):
+        jobs = [
+            Job.from_input_data(
+                workspace=ws,
+                name="shared-job",
+                target="ionq.simulator",
+                input_data=b"{}",
+                provider_id="ionq",
+                input_data_format="ionq.circuit.v1",
+                output_data_format="ionq.quantum-results.v1",
+                shared_container_name="sweep",
+            )
+            for _ in range(3)
+        ]
+
+    assert get_sas_uri.call_count == 1
+    for job in jobs:
+        assert job.container_name == "sweep"
+        assert job.details.input_data_uri.endswith(f" {job.id}/inputData")
+        assert job.details.output_data_uri.startswith(
+            f"https://example.com/sweep/{job.id}/rawOutputData?se="
+        )
+
+
+def test_workspace_clients_share_connections():
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+        connection_pool_size=4,
+    )
+    session = ws._shared_transport._get_session()
+    assert session.get_adapter("https://example.com")._pool_maxsize == 4
+
+    # Bypass the mock client to check the one the workspace would create
+    client = Workspace._create_client(ws)
+    assert client._client._pipeline._transport.session is session
+    assert ws._get_storage_transport().session is session
+
+    blob_client = BlobClient.from_blob_url(
+        "https://account.blob.core.windows.net/container/blob",
+        transport=ws._get_storage_transport(),
+    )
+    assert blob_client._pipeline._transport.session is session
+
+    # Closing a client leaves the shared connections open
+    client.close()
+    assert ws._shared_transport._session is session
+    ws.close()
+    assert ws._shared_transport._session is None
+
+
+STORAGE_CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=https;AccountName=account;"
+    "AccountKey=a2V5;EndpointSuffix=core.windows.net"
+)
+
+
+def test_storage_connection_string_signs_sas_uris_locally():
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+        storage=STORAGE_CONNECTION_STRING,
+        storage_sas_lifetime=timedelta(hours=2),
+    )
+
+    with mock.patch.object(ws._client.services.storage, "get_sas_uri") as get_sas_uri, \
+            mock.patch("azure.quantum._storage_signer.create_container_using_client") as create:
+        # Bypass the mock get_container_uri to check the one of the workspace
+        container_uri = Workspace.get_container_uri(ws, job_id="job-1")
+        assert Workspace.get_container_uri(ws, job_id="job-1") == container_uri
+        Workspace.get_container_uri(ws, job_id="job-2")
+        blob_uri = ws._get_linked_storage_sas_uri("job-1", "output data")
+
+    get_sas_uri.assert_not_called()
+    assert create.call_count == 2
+    assert container_uri.startswith("https://account.blob.core.windows.net/job-job-1?")
+    assert "sp=racw" in container_uri
+    assert blob_uri.startswith("https://account.blob.core.windows.net/job-1/output%20data?")
+    assert "sp=r&" in blob_uri
+    expiry = get_sas_expiry(blob_uri)
+    assert timedelta(hours=1) < expiry - datetime.now(timezone.utc) <= timedelta(hours=2)
+
+
+def test_target_catalog_caches_targets():
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+    )
+    seed_providers(ws)
+    providers = ws._client.services.providers
+
+    with mock.patch.object(providers, "list", wraps=providers.list) as list_providers:
+        targets = ws.get_targets()
+        assert ws.get_targets(name="IonQ.Simulator").name == "ionq.simulator"
+        assert {pid for pid, _ in ws._get_target_status(provider_id="IONQ")} == {"ionq"}
+        assert ws.target_catalog.get_target_status("ionq", "ionq.simulator").id == "ionq.simulator"
+        assert ws.target_catalog.get_target_status("ionq", "missing") is None
+        targets[0].refresh()
+        assert list_providers.call_count == 1
+
+        ws.target_catalog.invalidate()
+        ws.get_targets()
+        assert list_providers.call_count == 2
+
+
+def test_target_catalog_ttl():
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+        target_cache_ttl_secs=0,
+    )
+    seed_providers(ws)
+    providers = ws._client.services.providers
+
+    with mock.patch.object(providers, "list", wraps=providers.list) as list_providers:
+        ws._get_target_status()
+        ws._get_target_status()
+    assert list_providers.call_count == 2
+
+
+def test_target_catalog_background_refresh():
+    listed = threading.Event()
+    release = threading.Event()
+    results = [[ProviderStatus({"id": "ionq", "targets": [{"id": "ionq.qpu"}]})]]
+
+    def list_providers():
+        if len(results) > 1:
+            listed.set()
+            assert release.wait(5)
+        return results[-1]
+
+    catalog = TargetCatalog(list_providers, ttl_secs=0, background_refresh=True)
+    assert [status.id for _, status in catalog.get()] == ["ionq.qpu"]
+
+    # Stale targets are returned while they are listed again
+    results.append([ProviderStatus({"id": "ionq", "targets": [{"id": "ionq.simulator"}]})])
+    assert [status.id for _, status in catalog.get()] == ["ionq.qpu"]
+    assert listed.wait(5)
+    release.set()
+    catalog._refresh_thread.join(5)
+    catalog.ttl_secs = 60
+    assert [status.id for _, status in catalog.get()] == ["ionq.simulator"]
+
+
+def test_workspace_target_catalog_options():
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+        target_cache_ttl_secs=5,
+        target_cache_background_refresh=True,
+    )
+    assert ws.target_catalog.ttl_secs == 5
+    assert ws.target_catalog.background_refresh
+
+    ws = WorkspaceMock(
+        subscription_id=SUBSCRIPTION_ID,
+        resource_group=RESOURCE_GROUP,
+        name=WORKSPACE,
+    )
+    assert not ws.target_catalog.background_refresh
+
+
+def test_workspace_discovery_cache(tmp_path):
+    cache_path = str(tmp_path / "workspaces.json")
+    mgmt_client = MockWorkspaceMgmtClient()
+
+    with mock.patch.object(mgmt_client, "load_workspace_from_arg",
+                           wraps=mgmt_client.load_workspace_from_arg) as load_from_arg:
+        first = WorkspaceMock(name=WORKSPACE, discovery_cache_path=cache_path, _mgmt_client=mgmt_client)
+        # Another process connecting to the same workspace
+        second = WorkspaceMock(name=WORKSPACE, discovery_cache_path=cache_path, _mgmt_client=mgmt_client)
+    assert load_from_arg.call_count == 1
+    assert second.subscription_id == SUBSCRIPTION_ID
+    assert second.resource_group == RESOURCE_GROUP
+    assert second.location == first.location == LOCATION
+    assert second._connection_params.quantum_endpoint == ENDPOINT_URI
+    assert first._discovery_cache_key is None
+    assert second._discovery_cache_key is not None
+
+    # A workspace with other connection parameters is looked up again
+    with mock.patch.object(mgmt_client, "load_workspace_from_arg",
+                           wraps=mgmt_client.load_workspace_from_arg) as load_from_arg:
+        WorkspaceMock(name=WORKSPACE, location="westus", discovery_cache_path=cache_path, _mgmt_client=mgmt_client)
+        WorkspaceMock(name=WORKSPACE, discovery_cache_path=cache_path, discovery_cache_ttl_secs=0, _mgmt_client=mgmt_client)
+    assert load_from_arg.call_count == 2
+
+
+def test_workspace_discovery_cache_invalidated_on_not_found(tmp_path):
+    cache_path = str(tmp_path / "workspaces.json")
+    WorkspaceMock(name=WORKSPACE, discovery_cache_path=cache_path)
+    ws = WorkspaceMock(name=WORKSPACE, discovery_cache_path=cache_path)
+
+    # pylint: disable=protected-access
+    client = Workspace._create_client(ws)
+    on_response = client._config.custom_hook_policy._response_callback
+    response = mock.Mock()
+    response.http_response.status_code = 200
+    on_response(response)
+    assert ws._discovery_cache.load(ws._discovery_cache_key, ws._connection_params)
+
+    response.http_response.status_code = 404
+    on_response(response)
+    assert not ws._discovery_cache.load(ws._discovery_cache_key, ws._connection_params)
+
+
+def test_workspace_discovery_cache_ignores_unreadable_file(tmp_path):
+    cache_path = tmp_path / "workspaces.json"
+    cache_path.write_text("{not json")
+    ws = WorkspaceMock(name=WORKSPACE, discovery_cache_path=str(cache_path))
+    assert ws.subscription_id == SUBSCRIPTION_ID
+    assert WORKSPACE.lower() in cache_path.read_text()